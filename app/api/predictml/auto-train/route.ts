@@ -1,6 +1,111 @@
 import { NextResponse } from 'next/server';
+import { spawn } from 'child_process';
 import { join } from 'path';
-import { writeFileSync, readFileSync, existsSync } from 'fs';
+import { writeFileSync, readFileSync, existsSync, mkdirSync, renameSync, unlinkSync } from 'fs';
+
+// With PREDICTML_TRAINING_QUEUE=1 jobs are run by the local training scheduler
+// (scripts/training_scheduler.py), which limits concurrent trainers and reserves cores and memory per job
+const TRAINING_QUEUE_ENABLED = process.env.PREDICTML_TRAINING_QUEUE === '1';
+const TRAINING_QUEUE_DIR = process.env.PREDICTML_TRAINING_QUEUE_DIR || join(process.cwd(), 'uploads', 'training-queue');
+const QUEUE_STATES = ['queued', 'running', 'done', 'failed'];
+const QUEUE_POLL_INTERVAL_MS = 2000;
+// A job that has not finished this long after submission (waiting included) is failed and withdrawn
+const QUEUE_TIMEOUT_MS = Number(process.env.PREDICTML_TRAINING_QUEUE_TIMEOUT_MINUTES || 12 * 60) * 60 * 1000;
+// A job file missing from every queue state for this long has been lost
+const QUEUE_LOST_JOB_MS = 60 * 1000;
+
+// Same job file layout as scripts/job_queue.py
+function enqueueTraining(trainingJob: any, modelsDir: string) {
+  for (const state of QUEUE_STATES) {
+    mkdirSync(join(TRAINING_QUEUE_DIR, state), { recursive: true });
+  }
+
+  const job = {
+    id: trainingJob.id,
+    status: 'queued',
+    submitted_at: new Date().toISOString(),
+    attempts: 0,
+    type: 'training',
+    data_path: trainingJob.filePath,
+    target_column: trainingJob.targetColumn || 'target',
+    problem_type: 'auto',
+    output_dir: modelsDir,
+    options: trainingJob.trainingOptions || {}
+  };
+
+  // Write under a temporary name and rename so the scheduler never reads a partial file
+  const tempPath = join(TRAINING_QUEUE_DIR, `.${trainingJob.id}.json.${process.pid}.tmp`);
+  writeFileSync(tempPath, JSON.stringify(job));
+  renameSync(tempPath, join(TRAINING_QUEUE_DIR, 'queued', `${trainingJob.id}.json`));
+}
+
+// Start the scheduler unless it is already running.
+// A second scheduler exits immediately, so a race here is harmless.
+function ensureTrainingScheduler() {
+  const lockPath = join(TRAINING_QUEUE_DIR, 'scheduler.lock');
+  if (existsSync(lockPath)) {
+    const pid = Number(readFileSync(lockPath, 'utf-8').trim());
+    if (pid) {
+      try {
+        process.kill(pid, 0);
+        return;
+      } catch {
+        // Not running; start it below
+      }
+    }
+  }
+
+  const pythonPath = process.env.PYTHON_PATH || 'python3';
+  const schedulerPath = join(process.cwd(), 'scripts', 'training_scheduler.py');
+  const scheduler = spawn(pythonPath, [schedulerPath, 'serve', '--queue-dir', TRAINING_QUEUE_DIR], {
+    detached: true,
+    stdio: 'ignore'
+  });
+  scheduler.on('error', (error: Error) => {
+    console.error('Failed to start training scheduler:', error);
+  });
+  scheduler.unref();
+}
+
+// Withdraw a job that timed out: drop it from the queue, or stop its trainer
+// (the scheduler then records it as failed)
+function cancelQueuedTraining(job: any) {
+  try {
+    if (job.status === 'queued') {
+      unlinkSync(join(TRAINING_QUEUE_DIR, 'queued', `${job.id}.json`));
+    } else if (job.status === 'running' && job.trainer_pid) {
+      process.kill(job.trainer_pid, 'SIGTERM');
+    }
+  } catch {
+    // Already claimed or finished in the meantime
+  }
+}
+
+function readQueueJob(jobId: string): any {
+  for (const state of QUEUE_STATES) {
+    const jobPath = join(TRAINING_QUEUE_DIR, state, `${jobId}.json`);
+    if (existsSync(jobPath)) {
+      try {
+        return JSON.parse(readFileSync(jobPath, 'utf-8'));
+      } catch {
+        // Moved to another state while reading; picked up on the next poll
+        return null;
+      }
+    }
+  }
+  return null;
+}
+
+// Admission order published by the scheduler (smallest jobs first)
+function queuePosition(jobId: string): number | null {
+  try {
+    const schedule = JSON.parse(readFileSync(join(TRAINING_QUEUE_DIR, 'schedule.json'), 'utf-8'));
+    const entry = schedule.queued.find((item: any) => item.id === jobId);
+    return entry ? entry.position : null;
+  } catch {
+    return null;
+  }
+}
 
 // This endpoint is called automatically after file upload
 export async function POST(request: Request) {
@@ -14,7 +119,7 @@ export async function POST(request: Request) {
     }
 
     const body = await request.json();
-    const { datasetId, filePath, clientEmail, filename, targetColumn } = body;
+    const { datasetId, filePath, clientEmail, filename, targetColumn, trainingOptions } = body;
 
     if (!datasetId || !filePath) {
       return NextResponse.json(
@@ -31,7 +136,24 @@ export async function POST(request: Request) {
       clientEmail,
       filename,
       targetColumn: targetColumn || 'target',
-      status: 'training',
+      // Model search limits, see DEFAULT_TRAINING_OPTIONS in scripts/automl_trainer.py
+      trainingOptions: {
+        time_budget_minutes: trainingOptions?.timeBudgetMinutes ?? null,
+        include: trainingOptions?.include ?? null,
+        exclude: trainingOptions?.exclude ?? null,
+        folds: trainingOptions?.folds ?? null,
+        n_jobs: trainingOptions?.nJobs ?? null,
+        // full | successive_halving (screen candidates on growing stratified samples)
+        search_mode: trainingOptions?.searchMode ?? null,
+        halving_min_rows: trainingOptions?.halvingMinRows ?? null,
+        halving_factor: trainingOptions?.halvingFactor ?? null,
+        halving_folds: trainingOptions?.halvingFolds ?? null,
+        // full | warm_start (retrain the dataset's previous model unless the data drifted)
+        retrain_mode: trainingOptions?.retrainMode ?? null,
+        // Fit preprocessing on a stratified sample of this many rows, then refit on all rows
+        setup_sample_rows: trainingOptions?.setupSampleRows ?? null
+      },
+      status: TRAINING_QUEUE_ENABLED ? 'queued' : 'training',
       startTime: new Date().toISOString(),
       progress: 0,
       logs: []
@@ -54,9 +176,9 @@ export async function POST(request: Request) {
 
     return NextResponse.json({
       success: true,
-      message: 'Training started automatically',
+      message: TRAINING_QUEUE_ENABLED ? 'Training queued' : 'Training started automatically',
       trainingJobId: trainingJob.id,
-      status: 'training'
+      status: trainingJob.status
     });
 
   } catch (error) {
@@ -70,11 +192,15 @@ export async function POST(request: Request) {
 // Async training process (runs in background)
 async function startTrainingProcess(trainingJob: any) {
   try {
-    // Update status to training
-    updateTrainingJobStatus(trainingJob.id, 'training', 10, 'Initializing training environment...');
+    if (TRAINING_QUEUE_ENABLED) {
+      await runQueuedTraining(trainingJob);
+    } else {
+      // Update status to training
+      updateTrainingJobStatus(trainingJob.id, 'training', 10, 'Initializing training environment...');
 
-    // Run real AutoML training
-    await runAutoMLTraining(trainingJob);
+      // Run real AutoML training
+      await runAutoMLTraining(trainingJob);
+    }
 
     // After training completes, update status to pending_review
     updateTrainingJobStatus(
@@ -121,7 +247,8 @@ async function runAutoMLTraining(trainingJob: any): Promise<void> {
       trainingJob.filePath,
       targetColumn,
       'auto',  // auto-detect problem type
-      modelsDir
+      modelsDir,
+      JSON.stringify(trainingJob.trainingOptions || {})
     ]);
     
     let stdout = '';
@@ -161,16 +288,7 @@ async function runAutoMLTraining(trainingJob: any): Promise<void> {
           const result = JSON.parse(stdout);
           
           if (result.success) {
-            // Save model metadata
-            trainingJob.modelPath = result.model_path;
-            trainingJob.modelName = result.model_name;
-            trainingJob.problemType = result.problem_type;
-            trainingJob.metrics = result.metrics;
-            trainingJob.featureCount = result.feature_count;
-            trainingJob.trainingSamples = result.training_samples;
-            
-            updateTrainingJobMetadata(trainingJob);
-            
+            saveTrainingResult(trainingJob, result);
             resolve();
           } else {
             reject(new Error(result.error || 'Training failed'));
@@ -189,6 +307,84 @@ async function runAutoMLTraining(trainingJob: any): Promise<void> {
   });
 }
 
+// Hand the job to the training scheduler and follow it through the queue
+async function runQueuedTraining(trainingJob: any): Promise<void> {
+  enqueueTraining(trainingJob, join(process.cwd(), 'models'));
+  ensureTrainingScheduler();
+
+  return new Promise((resolve, reject) => {
+    const deadline = Date.now() + QUEUE_TIMEOUT_MS;
+    let lastSeen = Date.now();
+    let lastMessage = '';
+
+    const report = (status: string, progress: number, message: string) => {
+      // Log only changes, not every poll
+      if (message !== lastMessage) {
+        lastMessage = message;
+        updateTrainingJobStatus(trainingJob.id, status, progress, message);
+      }
+    };
+
+    const poll = setInterval(() => {
+      const job = readQueueJob(trainingJob.id);
+      if (!job) {
+        // Between states (renamed while reading) or lost
+        if (Date.now() - lastSeen > QUEUE_LOST_JOB_MS) {
+          clearInterval(poll);
+          reject(new Error('Training job disappeared from the queue'));
+        }
+        return;
+      }
+      lastSeen = Date.now();
+
+      if ((job.status === 'queued' || job.status === 'running') && Date.now() > deadline) {
+        clearInterval(poll);
+        cancelQueuedTraining(job);
+        reject(new Error(`Training did not finish within ${Math.round(QUEUE_TIMEOUT_MS / 60000)} minutes (status: ${job.status})`));
+        return;
+      }
+
+      if (job.status === 'queued' || job.status === 'running') {
+        // Restart the scheduler if it died; it requeues the jobs it was running
+        ensureTrainingScheduler();
+      }
+
+      if (job.status === 'queued') {
+        const position = queuePosition(trainingJob.id);
+        report('queued', 5, position ? `Waiting for training resources (queue position ${position})` : 'Waiting for training resources');
+      } else if (job.status === 'running') {
+        const cores = job.reservation ? ` on ${job.reservation.cores} core(s)` : '';
+        report('training', job.progress ?? 15, job.message || `Training started${cores}`);
+      } else {
+        clearInterval(poll);
+        if (job.status === 'done' && job.result?.success) {
+          saveTrainingResult(trainingJob, job.result);
+          resolve();
+        } else {
+          reject(new Error(job.error || 'Training failed'));
+        }
+      }
+    }, QUEUE_POLL_INTERVAL_MS);
+  });
+}
+
+function saveTrainingResult(trainingJob: any, result: any) {
+  // Save model metadata
+  trainingJob.modelPath = result.model_path;
+  trainingJob.manifestPath = result.manifest_path;
+  trainingJob.modelName = result.model_name;
+  trainingJob.problemType = result.problem_type;
+  trainingJob.metrics = result.metrics;
+  trainingJob.featureCount = result.feature_count;
+  trainingJob.trainingSamples = result.training_samples;
+  trainingJob.searchTimeSeconds = result.search_time_s;
+  trainingJob.retrain = result.retrain;
+  trainingJob.timings = result.timings_s;
+  trainingJob.peakMemoryMb = result.peak_memory_mb;
+
+  updateTrainingJobMetadata(trainingJob);
+}
+
 function updateTrainingJobStatus(jobId: string, status: string, progress: number, message: string) {
   try {
     const trainingJobsPath = join(process.cwd(), 'uploads', 'training-jobs.json');
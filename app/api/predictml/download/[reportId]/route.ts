@@ -1,7 +1,33 @@
 import { NextResponse } from 'next/server';
 import { readFile } from 'fs/promises';
 import { join } from 'path';
-import { existsSync } from 'fs';
+import { existsSync, readFileSync } from 'fs';
+
+// Content types of the report output formats (see OUTPUT_FORMATS in scripts/generic_ml_report_generator.py)
+const REPORT_CONTENT_TYPES: Record<string, string> = {
+  docx: 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+  html: 'text/html; charset=utf-8',
+  json: 'application/json'
+};
+const REPORT_FORMATS = Object.keys(REPORT_CONTENT_TYPES);
+
+// Format of the report generated last for this ID, recorded by scripts/generate_report.py.
+// Earlier formats of the same report stay on disk, so they must not be picked by extension order;
+// only reports generated before the status file existed fall back to the first file found.
+function currentReportFormat(reportsDir: string, reportId: string): string | undefined {
+  const statusPath = join(reportsDir, `${reportId}_status.json`);
+  if (existsSync(statusPath)) {
+    try {
+      const format = JSON.parse(readFileSync(statusPath, 'utf-8')).output_format;
+      return REPORT_FORMATS.includes(format) && existsSync(join(reportsDir, `${reportId}_report.${format}`))
+        ? format
+        : undefined;
+    } catch {
+      // Replaced while reading; fall back below
+    }
+  }
+  return REPORT_FORMATS.find((ext) => existsSync(join(reportsDir, `${reportId}_report.${ext}`)));
+}
 
 export async function GET(
   request: Request,
@@ -21,9 +47,9 @@ export async function GET(
 
     // Find the report file
     const reportsDir = join(process.cwd(), 'uploads', 'reports');
-    const reportPath = join(reportsDir, `${reportId}_report.docx`);
+    const format = currentReportFormat(reportsDir, reportId);
 
-    if (!existsSync(reportPath)) {
+    if (!format) {
       return NextResponse.json(
         { success: false, message: 'Report not found' },
         { status: 404 }
@@ -31,13 +57,14 @@ export async function GET(
     }
 
     // Read the file
-    const fileBuffer = await readFile(reportPath);
+    const fileName = `${reportId}_report.${format}`;
+    const fileBuffer = await readFile(join(reportsDir, fileName));
 
     // Return the file
     return new NextResponse(new Uint8Array(fileBuffer), {
       headers: {
-        'Content-Type': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-        'Content-Disposition': `attachment; filename="${reportId}_report.docx"`,
+        'Content-Type': REPORT_CONTENT_TYPES[format] as string,
+        'Content-Disposition': `attachment; filename="${fileName}"`,
       },
     });
   } catch (error) {
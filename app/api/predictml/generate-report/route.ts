@@ -1,6 +1,68 @@
 import { NextResponse } from 'next/server';
 import { spawn } from 'child_process';
 import { join } from 'path';
+import { existsSync, mkdirSync, readFileSync, renameSync, unlinkSync, writeFileSync } from 'fs';
+
+// With PREDICTML_REPORT_QUEUE=1 reports are generated by the resident worker pool
+// (scripts/report_worker.py) from a file-backed queue instead of one Python process per request
+const REPORT_QUEUE_ENABLED = process.env.PREDICTML_REPORT_QUEUE === '1';
+const REPORT_QUEUE_DIR = process.env.PREDICTML_REPORT_QUEUE_DIR || join(process.cwd(), 'uploads', 'report-queue');
+const QUEUE_STATES = ['queued', 'running', 'done', 'failed'];
+
+// Same job file layout as scripts/job_queue.py
+function enqueueReport(reportId: string, filePath: string, options: Record<string, unknown>) {
+  for (const state of QUEUE_STATES) {
+    mkdirSync(join(REPORT_QUEUE_DIR, state), { recursive: true });
+  }
+
+  const job = {
+    id: reportId,
+    status: 'queued',
+    submitted_at: new Date().toISOString(),
+    attempts: 0,
+    type: 'report',
+    file_path: filePath,
+    options
+  };
+
+  // Write under a temporary name and rename so workers never read a partial file
+  const tempPath = join(REPORT_QUEUE_DIR, `.${reportId}.json.${process.pid}.tmp`);
+  writeFileSync(tempPath, JSON.stringify(job));
+  renameSync(tempPath, join(REPORT_QUEUE_DIR, 'queued', `${reportId}.json`));
+
+  // A resubmitted report replaces the outcome of its previous run
+  for (const state of ['done', 'failed']) {
+    const previous = join(REPORT_QUEUE_DIR, state, `${reportId}.json`);
+    if (existsSync(previous)) {
+      unlinkSync(previous);
+    }
+  }
+}
+
+// Start the worker pool unless its supervisor is already running.
+// A second supervisor exits immediately, so a race here is harmless.
+function ensureReportWorkers() {
+  const lockPath = join(REPORT_QUEUE_DIR, 'worker.lock');
+  if (existsSync(lockPath)) {
+    const pid = Number(readFileSync(lockPath, 'utf-8').trim());
+    if (pid) {
+      try {
+        process.kill(pid, 0);
+        return;
+      } catch {
+        // Not running; start it below
+      }
+    }
+  }
+
+  const pythonPath = join(process.cwd(), '.venv', 'bin', 'python');
+  const workerPath = join(process.cwd(), 'scripts', 'report_worker.py');
+  const supervisor = spawn(pythonPath, [workerPath, 'serve', '--queue-dir', REPORT_QUEUE_DIR], {
+    detached: true,
+    stdio: 'ignore'
+  });
+  supervisor.unref();
+}
 
 export async function POST(request: Request) {
   try {
@@ -27,9 +89,36 @@ export async function POST(request: Request) {
     const scriptOptions = {
       target_column: options?.targetColumn || 'target',
       model_name: options?.modelName || 'ML Prediction Model',
-      positive_class: options?.positiveClass || null
+      positive_class: options?.positiveClass || null,
+      // draft | standard | print
+      render_profile: options?.renderProfile || 'standard',
+      // Per-record risk score appendix, streamed into the DOCX for large datasets
+      include_record_listing: options?.includeRecordListing || false,
+      // docx | html (inline SVG charts) | json (chart data for the dashboard)
+      output_format: options?.outputFormat || 'docx'
     };
 
+    if (REPORT_QUEUE_ENABLED) {
+      if (!/^[\w-]+$/.test(reportId)) {
+        return NextResponse.json(
+          { success: false, message: 'Invalid reportId' },
+          { status: 400 }
+        );
+      }
+
+      enqueueReport(reportId, filePath, scriptOptions);
+      ensureReportWorkers();
+
+      return NextResponse.json({
+        success: true,
+        status: 'queued',
+        message: 'Report queued for generation',
+        reportId,
+        statusUrl: `/api/predictml/status/${reportId}`,
+        downloadUrl: `/api/predictml/download/${reportId}`
+      }, { status: 202 });
+    }
+
     // Path to Python script
     const scriptPath = join(process.cwd(), 'scripts', 'generate_report.py');
 
@@ -1,5 +1,5 @@
 import { NextResponse } from 'next/server';
-import { spawn } from 'child_process';
+import { spawn, type ChildProcessWithoutNullStreams } from 'child_process';
 import { join } from 'path';
 import { readFileSync, existsSync } from 'fs';
 
@@ -74,47 +74,129 @@ export async function POST(request: Request) {
   }
 }
 
-async function makePrediction(modelPath: string, inputData: any): Promise<any> {
-  return new Promise((resolve, reject) => {
-    const scriptPath = join(process.cwd(), 'scripts', 'model_inference.py');
-    const pythonPath = process.env.PYTHON_PATH || 'python3';
-    
-    const python = spawn(pythonPath, [
-      scriptPath,
-      modelPath,
-      JSON.stringify(inputData)
-    ]);
-    
-    let stdout = '';
-    let stderr = '';
-    
-    python.stdout.on('data', (data: Buffer) => {
-      stdout += data.toString();
-    });
-    
-    python.stderr.on('data', (data: Buffer) => {
-      stderr += data.toString();
-    });
-    
-    python.on('close', (code: number) => {
-      if (code === 0) {
-        try {
-          const result = JSON.parse(stdout);
-          if (result.success) {
-            resolve(result);
-          } else {
-            reject(new Error(result.error || 'Prediction failed'));
-          }
-        } catch (parseError) {
-          reject(new Error(`Failed to parse prediction results: ${parseError}`));
-        }
+// Resident inference worker shared by all requests handled by this server process.
+// The worker keeps loaded models cached, so only the first prediction against a
+// model pays the PyCaret import and load_model() cold start.
+const PREDICTION_TIMEOUT_MS = Number(process.env.PREDICTML_PREDICT_TIMEOUT_MS || 60000);
+
+type PendingPrediction = {
+  resolve: (value: any) => void;
+  reject: (reason: Error) => void;
+  timer: NodeJS.Timeout;
+};
+
+// Requests are tracked per worker, so a replaced worker's late close/error events
+// only fail the requests that were sent to it
+type InferenceWorker = {
+  process: ChildProcessWithoutNullStreams;
+  pending: Map<string, PendingPrediction>;
+};
+
+let inferenceWorker: InferenceWorker | null = null;
+let nextRequestId = 0;
+
+// Stop using a worker: fail its outstanding requests and kill it.
+// Requests sent later go to a freshly spawned worker.
+function retireWorker(worker: InferenceWorker, error: Error) {
+  if (inferenceWorker === worker) {
+    inferenceWorker = null;
+  }
+  worker.pending.forEach((pending) => {
+    clearTimeout(pending.timer);
+    pending.reject(error);
+  });
+  worker.pending.clear();
+  if (worker.process.exitCode === null) {
+    worker.process.kill();
+  }
+}
+
+function getInferenceWorker(): InferenceWorker {
+  // A worker that exited or closed its input is replaced; its close handler fails its requests
+  if (inferenceWorker && inferenceWorker.process.exitCode === null && inferenceWorker.process.stdin.writable) {
+    return inferenceWorker;
+  }
+
+  const scriptPath = join(process.cwd(), 'scripts', 'model_inference.py');
+  const pythonPath = process.env.PYTHON_PATH || 'python3';
+
+  const worker: InferenceWorker = {
+    process: spawn(pythonPath, [scriptPath, '--serve']),
+    pending: new Map<string, PendingPrediction>()
+  };
+  const child = worker.process;
+  let buffered = '';
+  let stderr = '';
+
+  child.stdout.on('data', (data: Buffer) => {
+    buffered += data.toString();
+    let newlineIndex = buffered.indexOf('\n');
+    while (newlineIndex !== -1) {
+      const line = buffered.slice(0, newlineIndex).trim();
+      buffered = buffered.slice(newlineIndex + 1);
+      newlineIndex = buffered.indexOf('\n');
+      if (!line) {
+        continue;
+      }
+
+      let result: any;
+      try {
+        result = JSON.parse(line);
+      } catch (parseError) {
+        console.error('Failed to parse prediction worker output:', parseError);
+        continue;
+      }
+
+      const pending = worker.pending.get(result.id);
+      if (!pending) {
+        continue;
+      }
+      worker.pending.delete(result.id);
+      clearTimeout(pending.timer);
+
+      if (result.success) {
+        pending.resolve(result);
       } else {
-        reject(new Error(`Python script exited with code ${code}: ${stderr}`));
+        pending.reject(new Error(result.error || 'Prediction failed'));
       }
-    });
-    
-    python.on('error', (error: Error) => {
-      reject(new Error(`Failed to start Python process: ${error.message}`));
-    });
+    }
+  });
+
+  child.stderr.on('data', (data: Buffer) => {
+    // Keep only the tail so a long-lived worker does not grow this unbounded
+    stderr = (stderr + data.toString()).slice(-4000);
+  });
+
+  child.on('close', (code: number) => {
+    retireWorker(worker, new Error(`Python script exited with code ${code}: ${stderr}`));
+  });
+
+  child.on('error', (error: Error) => {
+    retireWorker(worker, new Error(`Failed to start Python process: ${error.message}`));
+  });
+
+  // Writing to a worker that has exited raises EPIPE here; unhandled it would crash the server
+  child.stdin.on('error', (error: Error) => {
+    retireWorker(worker, new Error(`Prediction worker input closed: ${error.message}`));
+  });
+
+  inferenceWorker = worker;
+  return worker;
+}
+
+async function makePrediction(modelPath: string, inputData: any): Promise<any> {
+  return new Promise((resolve, reject) => {
+    const worker = getInferenceWorker();
+    const id = `prediction_${Date.now()}_${nextRequestId++}`;
+
+    const timer = setTimeout(() => {
+      worker.pending.delete(id);
+      reject(new Error(`Prediction timed out after ${PREDICTION_TIMEOUT_MS}ms`));
+      // A worker that does not answer in time is presumed hung; later requests get a new one
+      retireWorker(worker, new Error('Prediction worker restarted after a timed out request'));
+    }, PREDICTION_TIMEOUT_MS);
+
+    worker.pending.set(id, { resolve, reject, timer });
+    worker.process.stdin.write(JSON.stringify({ id, model_path: modelPath, input_data: inputData }) + '\n');
   });
 }
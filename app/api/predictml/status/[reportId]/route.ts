@@ -1,7 +1,60 @@
 import { NextResponse } from 'next/server';
-import { existsSync } from 'fs';
+import { existsSync, readdirSync, readFileSync, statSync } from 'fs';
 import { join } from 'path';
 
+const REPORT_QUEUE_DIR = process.env.PREDICTML_REPORT_QUEUE_DIR || join(process.cwd(), 'uploads', 'report-queue');
+
+// Extensions of the report output formats (see OUTPUT_FORMATS in scripts/generic_ml_report_generator.py)
+const REPORT_FORMATS = ['docx', 'html', 'json'];
+
+// Format of the report generated last for this ID, recorded by scripts/generate_report.py.
+// Earlier formats of the same report stay on disk, so they must not be picked by extension order;
+// only reports generated before the status file existed fall back to the first file found.
+function currentReportFormat(reportsDir: string, reportId: string): string | undefined {
+  const statusPath = join(reportsDir, `${reportId}_status.json`);
+  if (existsSync(statusPath)) {
+    try {
+      const format = JSON.parse(readFileSync(statusPath, 'utf-8')).output_format;
+      return REPORT_FORMATS.includes(format) && existsSync(join(reportsDir, `${reportId}_report.${format}`))
+        ? format
+        : undefined;
+    } catch {
+      // Replaced while reading; fall back below
+    }
+  }
+  return REPORT_FORMATS.find((ext) => existsSync(join(reportsDir, `${reportId}_report.${ext}`)));
+}
+
+function readQueueJob(state: string, reportId: string) {
+  const jobPath = join(REPORT_QUEUE_DIR, state, `${reportId}.json`);
+  if (!existsSync(jobPath)) {
+    return null;
+  }
+  try {
+    return JSON.parse(readFileSync(jobPath, 'utf-8'));
+  } catch {
+    // Moved or replaced while reading
+    return null;
+  }
+}
+
+// 1-based position in the report queue, oldest job first (same order as scripts/job_queue.py)
+function queuePosition(reportId: string) {
+  const queuedDir = join(REPORT_QUEUE_DIR, 'queued');
+  const entries = readdirSync(queuedDir)
+    .filter((name) => name.endsWith('.json'))
+    .flatMap((name) => {
+      try {
+        return [{ name, mtime: statSync(join(queuedDir, name)).mtimeMs }];
+      } catch {
+        return [];
+      }
+    })
+    .sort((a, b) => a.mtime - b.mtime || a.name.localeCompare(b.name));
+  const index = entries.findIndex((entry) => entry.name === `${reportId}.json`);
+  return index >= 0 ? index + 1 : null;
+}
+
 export async function GET(
   request: Request,
   { params }: { params: { reportId: string } }
@@ -18,17 +71,53 @@ export async function GET(
 
     const { reportId } = params;
 
+    // Jobs submitted to the report worker pool
+    const queued = readQueueJob('queued', reportId);
+    if (queued) {
+      return NextResponse.json({
+        success: true,
+        status: 'queued',
+        reportId,
+        queuePosition: queuePosition(reportId),
+        submittedAt: queued.submitted_at,
+        message: 'Report is waiting for a worker.'
+      });
+    }
+
+    const running = readQueueJob('running', reportId);
+    if (running) {
+      return NextResponse.json({
+        success: true,
+        status: 'processing',
+        reportId,
+        submittedAt: running.submitted_at,
+        startedAt: running.started_at,
+        message: 'Report is being generated. Please check back in a moment.'
+      });
+    }
+
+    const failed = readQueueJob('failed', reportId);
+    if (failed) {
+      return NextResponse.json({
+        success: false,
+        status: 'failed',
+        reportId,
+        error: failed.error,
+        finishedAt: failed.finished_at,
+        message: 'Report generation failed'
+      });
+    }
+
     // Check if report file exists
     const reportsDir = join(process.cwd(), 'uploads', 'reports');
-    const reportPath = join(reportsDir, `${reportId}_report.docx`);
-
-    const exists = existsSync(reportPath);
+    const format = currentReportFormat(reportsDir, reportId);
 
-    if (exists) {
+    if (format) {
       return NextResponse.json({
         success: true,
         status: 'ready',
         reportId,
+        format,
         downloadUrl: `/api/predictml/download/${reportId}`,
         message: 'Report is ready for download'
       });
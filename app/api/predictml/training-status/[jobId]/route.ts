@@ -1,6 +1,48 @@
 import { NextResponse } from 'next/server';
 import { join } from 'path';
-import { readFileSync, existsSync } from 'fs';
+import { readFileSync, readdirSync, statSync, existsSync } from 'fs';
+
+// Queue of the training scheduler (PREDICTML_TRAINING_QUEUE=1, see scripts/training_scheduler.py)
+const TRAINING_QUEUE_DIR = process.env.PREDICTML_TRAINING_QUEUE_DIR || join(process.cwd(), 'uploads', 'training-queue');
+
+function readSchedulerJob(jobId: string): any {
+  for (const state of ['queued', 'running']) {
+    const jobPath = join(TRAINING_QUEUE_DIR, state, `${jobId}.json`);
+    if (existsSync(jobPath)) {
+      try {
+        return JSON.parse(readFileSync(jobPath, 'utf-8'));
+      } catch {
+        return null;
+      }
+    }
+  }
+  return null;
+}
+
+// Position in the scheduler's admission order; submission order until the scheduler has published one
+function queuePosition(jobId: string): number | null {
+  try {
+    const schedule = JSON.parse(readFileSync(join(TRAINING_QUEUE_DIR, 'schedule.json'), 'utf-8'));
+    const entry = schedule.queued.find((item: any) => item.id === jobId);
+    if (entry) {
+      return entry.position;
+    }
+  } catch {
+    // No schedule yet
+  }
+
+  try {
+    const queuedDir = join(TRAINING_QUEUE_DIR, 'queued');
+    const waiting = readdirSync(queuedDir)
+      .filter((name) => name.endsWith('.json'))
+      .map((name) => ({ id: name.slice(0, -'.json'.length), mtime: statSync(join(queuedDir, name)).mtimeMs }))
+      .sort((a, b) => a.mtime - b.mtime);
+    const index = waiting.findIndex((item) => item.id === jobId);
+    return index === -1 ? null : index + 1;
+  } catch {
+    return null;
+  }
+}
 
 export async function GET(
   request: Request,
@@ -37,13 +79,19 @@ export async function GET(
       );
     }
 
+    // Jobs waiting for or running under the scheduler also report their queue position and reservation
+    const schedulerJob = readSchedulerJob(jobId);
+    const queued = schedulerJob?.status === 'queued';
+
     return NextResponse.json({
       success: true,
       job: {
         id: job.id,
         datasetId: job.datasetId,
-        status: job.status,
-        progress: job.progress,
+        status: queued ? 'queued' : job.status,
+        progress: schedulerJob?.status === 'running' ? schedulerJob.progress ?? job.progress : job.progress,
+        queuePosition: queued ? queuePosition(jobId) : null,
+        reservation: schedulerJob?.reservation ?? null,
         startTime: job.startTime,
         endTime: job.endTime,
         lastUpdate: job.lastUpdate,
@@ -4,13 +4,217 @@ Uses PyCaret for automated machine learning
 """
 
 import sys
+import copy
 import json
+import math
+import time
+import resource
 import pandas as pd
 import numpy as np
+import joblib
 from pathlib import Path
+from datetime import datetime
+import platform
 import warnings
 warnings.filterwarnings('ignore')
 
+# Add the scripts directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from data_loader import load_dataframe, memory_usage_mb
+from training_profile import build_training_profile, check_drift
+
+MANIFEST_VERSION = 1
+
+# Options accepted through the options JSON argument and the auto-train route
+DEFAULT_TRAINING_OPTIONS = {
+    'time_budget_minutes': None,  # Wall-clock budget of the model search (None = unlimited)
+    'include': None,              # PyCaret estimator IDs to compare, e.g. ['lr', 'rf', 'lightgbm']
+    'exclude': None,              # PyCaret estimator IDs to skip
+    'folds': 10,                  # Cross-validation folds
+    'n_jobs': -1,                 # Parallel jobs across CPU cores (-1 = all cores)
+    'search_mode': 'full',        # 'full' or 'successive_halving'
+    'halving_min_rows': 10000,    # Rows of the first successive-halving sample
+    'halving_factor': 3,          # Sample growth and candidate reduction per round
+    'halving_folds': 3,           # Cross-validation folds on the subsamples
+    'retrain_mode': 'full',       # 'full' or 'warm_start' (start from the dataset's previous model)
+    'setup_sample_rows': None     # Fit preprocessing and search models on a stratified sample of this many rows
+}
+
+SEARCH_MODES = ('full', 'successive_halving')
+RETRAIN_MODES = ('full', 'warm_start')
+
+# Share of ensemble members added when a warm-started ensemble (e.g. a random
+# forest) is trained further on new data
+WARM_START_GROWTH = 0.2
+
+# Target quantile bins used to stratify regression samples
+REGRESSION_STRATA = 10
+
+def parse_training_options(options):
+    """
+    Validate training options and fill in defaults
+    
+    Args:
+        options: dict with any of the DEFAULT_TRAINING_OPTIONS keys (None values mean default)
+        
+    Returns:
+        dict: Complete training options
+    """
+    options = dict(options or {})
+    unknown = sorted(set(options) - set(DEFAULT_TRAINING_OPTIONS))
+    if unknown:
+        raise ValueError(f"Unknown training options: {', '.join(unknown)}")
+        
+    parsed = dict(DEFAULT_TRAINING_OPTIONS)
+    parsed.update({key: value for key, value in options.items() if value is not None})
+    
+    budget = parsed['time_budget_minutes']
+    if budget is not None and (not isinstance(budget, (int, float)) or budget <= 0):
+        raise ValueError("time_budget_minutes must be a positive number")
+    for key in ('include', 'exclude'):
+        value = parsed[key]
+        if value is not None and (not isinstance(value, list) or not all(isinstance(v, str) for v in value)):
+            raise ValueError(f"{key} must be a list of estimator IDs")
+    if parsed['include'] and parsed['exclude']:
+        raise ValueError("Use either include or exclude, not both")
+    if not isinstance(parsed['folds'], int) or parsed['folds'] < 2:
+        raise ValueError("folds must be an integer of at least 2")
+    if not isinstance(parsed['n_jobs'], int) or parsed['n_jobs'] == 0:
+        raise ValueError("n_jobs must be a non-zero integer (-1 = all cores)")
+    if parsed['search_mode'] not in SEARCH_MODES:
+        raise ValueError(f"search_mode must be one of: {', '.join(SEARCH_MODES)}")
+    if not isinstance(parsed['halving_min_rows'], int) or parsed['halving_min_rows'] < 100:
+        raise ValueError("halving_min_rows must be an integer of at least 100")
+    if not isinstance(parsed['halving_factor'], int) or parsed['halving_factor'] < 2:
+        raise ValueError("halving_factor must be an integer of at least 2")
+    if not isinstance(parsed['halving_folds'], int) or parsed['halving_folds'] < 2:
+        raise ValueError("halving_folds must be an integer of at least 2")
+    if parsed['retrain_mode'] not in RETRAIN_MODES:
+        raise ValueError(f"retrain_mode must be one of: {', '.join(RETRAIN_MODES)}")
+    sample_rows = parsed['setup_sample_rows']
+    if sample_rows is not None and (not isinstance(sample_rows, int) or sample_rows < 1000):
+        raise ValueError("setup_sample_rows must be an integer of at least 1000")
+        
+    return parsed
+
+def pycaret_module(problem_type):
+    """The PyCaret experiment module for a problem type"""
+    if problem_type == 'classification':
+        import pycaret.classification as module
+    else:
+        import pycaret.regression as module
+    return module
+
+def pycaret_major_version(pycaret):
+    """Major version of the PyCaret package an experiment module belongs to"""
+    package = sys.modules[pycaret.__name__.split('.')[0]]
+    return int(str(package.__version__).split('.')[0])
+
+def setup_arguments(df, target_column, problem_type, training_options, folds=None):
+    """Keyword arguments of setup() for a DataFrame and the training options"""
+    kwargs = {
+        'data': df,
+        'target': target_column,
+        'session_id': 42,
+        'verbose': False,
+        'silent': True,
+        'use_gpu': False,
+        'fold': folds or training_options['folds'],
+        'n_jobs': training_options['n_jobs'],
+        'normalize': True,
+        'transformation': True,
+        'ignore_low_variance': True,
+        'remove_multicollinearity': True,
+        'multicollinearity_threshold': 0.9
+    }
+    if problem_type == 'classification':
+        kwargs['fix_imbalance'] = True if df[target_column].value_counts().min() / len(df) < 0.1 else False
+    return kwargs
+
+def search_arguments(training_options, include=None, deadline=None):
+    """
+    Keyword arguments of compare_models() for the training options
+    
+    Args:
+        training_options: Parsed training options
+        include: Estimator IDs to compare instead of training_options['include']
+        deadline: time.perf_counter() value at which the time budget runs out
+    """
+    kwargs = {'n_select': 1, 'verbose': False}
+    include = include or training_options['include']
+    if include:
+        kwargs['include'] = include
+    elif training_options['exclude']:
+        kwargs['exclude'] = training_options['exclude']
+    if deadline is not None:
+        # compare_models stops starting new estimators once the budget is spent
+        # and returns the best model trained so far; the first one always runs
+        remaining = (deadline - time.perf_counter()) / 60
+        kwargs['budget_time'] = max(remaining, 1 / 60)
+    return kwargs
+
+def stratified_sample(df, target_column, rows, problem_type, min_per_stratum=2, random_state=42):
+    """
+    Sample about `rows` rows of df with the target distribution preserved
+    
+    Classification samples every class in proportion to its size, regression
+    every target decile. Each stratum keeps at least `min_per_stratum` rows
+    (or all of them) so stratified CV folds can still be formed.
+    """
+    if rows >= len(df):
+        return df
+    if problem_type == 'classification':
+        strata = pd.Series(pd.factorize(df[target_column])[0], index=df.index)
+    else:
+        ranks = df[target_column].rank(method='first')
+        strata = pd.qcut(ranks, q=REGRESSION_STRATA, labels=False).fillna(-1).astype(int)
+        
+    sizes = strata.map(strata.value_counts())
+    quota = np.maximum(np.minimum(sizes, min_per_stratum), np.round(sizes * rows / len(df)))
+    # Rank rows randomly within their stratum and keep each stratum's quota
+    order = pd.Series(np.random.default_rng(random_state).random(len(df)), index=df.index)
+    keep = order.groupby(strata).rank(method='first') <= quota
+    return df[keep.to_numpy()]
+
+def successive_halving(pycaret, df, target_column, problem_type, training_options, deadline=None):
+    """
+    Narrow the candidate estimators down by successive halving
+    
+    All candidates are cross-validated on a small stratified sample; the best
+    1/halving_factor of them are promoted to a sample halving_factor times
+    larger, and so on until one candidate is left or the next sample would be
+    the whole dataset.
+    
+    Returns:
+        list: IDs of the surviving estimators, or None to compare all of them
+    """
+    factor = training_options['halving_factor']
+    rows = training_options['halving_min_rows']
+    candidates = training_options['include']
+    rounds = 0
+    
+    while rows < len(df) and (candidates is None or len(candidates) > 1):
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        sample = stratified_sample(df, target_column, rows, problem_type,
+                                   min_per_stratum=training_options['halving_folds'])
+        pycaret.setup(**setup_arguments(sample, target_column, problem_type, training_options,
+                                        folds=training_options['halving_folds']))
+        pycaret.compare_models(**search_arguments(training_options, include=candidates, deadline=deadline))
+        
+        # The score grid is sorted best first and indexed by estimator ID
+        ranked = pycaret.pull().index.tolist()
+        if not ranked:
+            break
+        candidates = ranked[:max(1, math.ceil(len(ranked) / factor))]
+        rounds += 1
+        log_progress(f"Halving round {rounds}: {len(ranked)} models on {len(sample):,} rows, "
+                     f"kept {', '.join(candidates)}", min(25 + rounds * 5, 38))
+        rows *= factor
+        
+    return candidates
+
 def log_progress(message, progress=None):
     """Log progress to stderr for tracking"""
     log_data = {
@@ -20,7 +224,235 @@ def log_progress(message, progress=None):
     }
     print(json.dumps(log_data), file=sys.stderr, flush=True)
 
-def train_automl_model(data_path, target_column, problem_type='auto', output_dir='./models'):
+def peak_memory_mb():
+    """Peak resident memory in MB of this process and of its finished child processes (e.g. n_jobs workers)"""
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    unit = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return {
+        'process': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unit, 1),
+        'children': round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / unit, 1)
+    }
+
+def package_version(name):
+    """Return the installed version of a distribution, or None if missing"""
+    try:
+        from importlib.metadata import version
+        return version(name)
+    except Exception:
+        return None
+
+def load_previous_model(model_path, pycaret):
+    """
+    Fitted pipeline and manifest of a model saved by an earlier training run
+    
+    Returns:
+        tuple: (pipeline, manifest), or (None, None) if there is no previous model
+    """
+    manifest_path = Path(f"{model_path}.json")
+    if not manifest_path.exists() or not Path(f"{model_path}.pkl").exists():
+        return None, None
+        
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+        
+    lite_model = manifest.get('lite_model')
+    if lite_model:
+        pipeline = joblib.load(Path(model_path).parent / lite_model['file'])
+    else:
+        pipeline = pycaret.load_model(model_path, verbose=False)
+    return pipeline, manifest
+
+def warm_start_estimator(model_path, df, target_column, problem_type, pycaret):
+    """
+    Previous estimator to retrain from, if the new data allows it
+    
+    The previous model is reused when it was trained for the same target and
+    problem type and no column of the new data drifted from the training
+    profile stored in its manifest.
+    
+    Returns:
+        tuple: (fitted estimator or None, retrain info for the result JSON)
+    """
+    info = {'mode': 'full', 'reason': None, 'drift': None}
+    try:
+        pipeline, manifest = load_previous_model(model_path, pycaret)
+    except Exception as e:
+        info['reason'] = f"Previous model could not be loaded: {str(e)}"
+        return None, info
+        
+    if pipeline is None:
+        info['reason'] = 'No previous model for this dataset'
+        return None, info
+    if manifest.get('problem_type') != problem_type or manifest.get('target_column') != target_column:
+        info['reason'] = 'Previous model was trained for a different target or problem type'
+        return None, info
+        
+    drift = check_drift(manifest.get('training_profile'), df)
+    info['drift'] = {
+        'psi': dict(list(drift['psi'].items())[:10]),
+        'drifted_columns': drift['drifted_columns']
+    }
+    if drift['drifted']:
+        info['reason'] = drift['reason']
+        return None, info
+        
+    info['mode'] = 'warm_start'
+    info['base_model'] = manifest.get('model_name')
+    info['base_trained_at'] = manifest.get('trained_at')
+    return pipeline.steps[-1][1], info
+
+def training_data(pycaret):
+    """Preprocessed training split of the current experiment: (X, y)"""
+    try:
+        # PyCaret 3
+        return pycaret.get_config('X_train_transformed'), pycaret.get_config('y_train_transformed')
+    except Exception:
+        return pycaret.get_config('X_train'), pycaret.get_config('y_train')
+
+def target_replacement(pipeline):
+    """The {label: code} target mapping PyCaret 2 keeps on its dtypes step, or None"""
+    named_steps = getattr(pipeline, 'named_steps', {})
+    return getattr(named_steps.get('dtypes'), 'replacement', None)
+
+def transform_full_data(pycaret, df, target_column):
+    """
+    Preprocess all rows with the pipeline fitted by the current setup()
+    
+    Used when setup() ran on a sample: the transforms stay as fitted on the
+    sample and the final estimator is refitted on every row.
+    
+    Returns:
+        tuple: (X, y) as the estimator expects them
+    """
+    X = df.drop(columns=[target_column])
+    y = df[target_column]
+    if pycaret_major_version(pycaret) >= 3:
+        # The pipeline transforms features and target (label encoding)
+        return pycaret.get_config('pipeline').transform(X, y)
+        
+    # PyCaret 2: prep_pipe transforms the features; its dtypes step holds the
+    # target labels setup() encoded on the sample ({label: code})
+    prep_pipe = pycaret.get_config('prep_pipe')
+    X = prep_pipe.transform(X)
+    replacement = target_replacement(prep_pipe)
+    if replacement:
+        encoded = y.astype(str).map(replacement)
+        unseen = sorted(y[encoded.isna()].astype(str).unique())
+        if unseen:
+            raise ValueError(f"Target classes missing from the setup sample: {', '.join(unseen)}")
+        y = encoded.astype(int).rename(target_column)
+    return X, y
+
+def update_estimator(previous, X, y):
+    """
+    Train the previous estimator on new data, keeping what it learned where possible
+    
+    Estimators with partial_fit are updated incrementally, estimators with a
+    warm_start parameter continue from their fitted state (ensembles grow by
+    WARM_START_GROWTH), and any other estimator is refitted from scratch with
+    the same hyperparameters. The first two require the preprocessed features
+    to match the ones the previous estimator was fitted on.
+    
+    Returns:
+        tuple: (fitted estimator, update method)
+    """
+    from sklearn.base import clone
+    
+    compatible = getattr(previous, 'n_features_in_', None) == X.shape[1]
+    feature_names = getattr(previous, 'feature_names_in_', None)
+    if compatible and feature_names is not None and hasattr(X, 'columns'):
+        compatible = list(feature_names) == [str(col) for col in X.columns]
+        
+    params = previous.get_params()
+    if compatible and hasattr(previous, 'partial_fit'):
+        estimator = copy.deepcopy(previous)
+        estimator.partial_fit(X, y)
+        return estimator, 'partial_fit'
+    if compatible and 'warm_start' in params:
+        estimator = copy.deepcopy(previous)
+        updates = {'warm_start': True}
+        if isinstance(params.get('n_estimators'), int):
+            updates['n_estimators'] = params['n_estimators'] + max(1, round(params['n_estimators'] * WARM_START_GROWTH))
+        estimator.set_params(**updates)
+        estimator.fit(X, y)
+        return estimator, 'warm_start'
+        
+    estimator = clone(previous)
+    estimator.fit(X, y)
+    return estimator, 'refit'
+
+def export_lite_pipeline(pipeline, model_path, problem_type):
+    """
+    Save the fitted pipeline for PyCaret-free inference
+    
+    The pipeline is dumped with plain joblib to {model_path}.joblib so
+    model_inference.py can call predict/predict_proba on it directly without
+    importing the PyCaret experiment modules. For classification the target
+    classes are recorded in code order so encoded predictions can be mapped
+    back to the original labels.
+    
+    The dump is uncompressed so inference workers can load it with
+    mmap_mode='r' and share the large numpy arrays through the page cache.
+    """
+    lite_path = f"{model_path}.joblib"
+    joblib.dump(pipeline, lite_path, compress=0)
+    
+    classes = None
+    if problem_type == 'classification':
+        replacement = target_replacement(pipeline)
+        if replacement:
+            # PyCaret 2: the mapping transform_full_data() encodes the target with
+            classes = [label for label, _ in sorted(replacement.items(), key=lambda item: item[1])]
+        else:
+            # PyCaret 3: the label_encoding step wraps a fitted LabelEncoder
+            encoder = getattr(pipeline, 'named_steps', {}).get('label_encoding')
+            encoder = getattr(encoder, 'transformer', encoder)
+            if encoder is not None and hasattr(encoder, 'classes_'):
+                classes = np.asarray(encoder.classes_).tolist()
+    
+    return {
+        'file': Path(lite_path).name,
+        'classes': classes
+    }
+
+def write_model_manifest(model_path, df, target_column, problem_type, model_name, lite_model=None):
+    """
+    Write a JSON manifest next to the saved model
+    
+    The manifest lets model_inference.py load the artifact with the right
+    PyCaret module on the first try and refuse incompatible artifacts early.
+    Its training profile lets the next warm-start retrain check for drift.
+    """
+    features = [
+        {'name': str(col), 'dtype': str(df[col].dtype)}
+        for col in df.columns if col != target_column
+    ]
+    
+    manifest = {
+        'manifest_version': MANIFEST_VERSION,
+        'model_file': Path(f"{model_path}.pkl").name,
+        'model_name': model_name,
+        'problem_type': problem_type,
+        'target_column': target_column,
+        'features': features,
+        'lite_model': lite_model,
+        'training_profile': build_training_profile(df, target_column),
+        'versions': {
+            'python': platform.python_version(),
+            'pycaret': package_version('pycaret'),
+            'scikit-learn': package_version('scikit-learn'),
+            'pandas': package_version('pandas')
+        },
+        'trained_at': datetime.now().isoformat()
+    }
+    
+    manifest_path = f"{model_path}.json"
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    
+    return manifest_path
+
+def train_automl_model(data_path, target_column, problem_type='auto', output_dir='./models', options=None):
     """
     Train an AutoML model using PyCaret
     
@@ -29,20 +461,23 @@ def train_automl_model(data_path, target_column, problem_type='auto', output_dir
         target_column: Name of target column
         problem_type: 'classification', 'regression', or 'auto' (auto-detect)
         output_dir: Directory to save trained model
+        options: Training options (see DEFAULT_TRAINING_OPTIONS)
     
     Returns:
         dict: Training results and model information
     """
     try:
+        training_options = parse_training_options(options)
+        timings = {}
+        started = time.perf_counter()
+        
         log_progress("Loading dataset...", 5)
         
         # Load data
-        if data_path.endswith('.csv'):
-            df = pd.read_csv(data_path)
-        else:
-            df = pd.read_excel(data_path)
+        df = load_dataframe(data_path)
+        timings['load'] = time.perf_counter() - started
         
-        log_progress(f"Loaded {len(df)} rows with {len(df.columns)} columns", 10)
+        log_progress(f"Loaded {len(df)} rows with {len(df.columns)} columns ({memory_usage_mb(df)} MB)", 10)
         
         # Auto-detect problem type if not specified
         if problem_type == 'auto':
@@ -63,68 +498,104 @@ def train_automl_model(data_path, target_column, problem_type='auto', output_dir
         # Import appropriate module
         log_progress("Initializing AutoML environment...", 20)
         
-        if problem_type == 'classification':
-            from pycaret.classification import setup, compare_models, save_model, pull
-            
-            log_progress("Setting up classification experiment...", 25)
-            exp = setup(
-                data=df,
-                target=target_column,
-                session_id=42,
-                verbose=False,
-                silent=True,
-                use_gpu=False,
-                normalize=True,
-                transformation=True,
-                ignore_low_variance=True,
-                remove_multicollinearity=True,
-                multicollinearity_threshold=0.9,
-                fix_imbalance=True if df[target_column].value_counts().min() / len(df) < 0.1 else False
-            )
+        pycaret = pycaret_module(problem_type)
+        
+        dataset_id = Path(data_path).stem.split('_')[1] if '_' in Path(data_path).stem else 'model'
+        model_path = f"{output_dir}/{dataset_id}_model"
+        
+        previous_estimator = None
+        retrain = {'mode': 'full', 'reason': None, 'drift': None}
+        if training_options['retrain_mode'] == 'warm_start':
+            log_progress("Checking the previous model for a warm start...", 22)
+            previous_estimator, retrain = warm_start_estimator(model_path, df, target_column, problem_type, pycaret)
+            if previous_estimator is None:
+                log_progress(f"Running a full model search: {retrain['reason']}", 22)
+                
+        search_start = time.perf_counter()
+        deadline = None
+        if training_options['time_budget_minutes'] is not None:
+            deadline = search_start + training_options['time_budget_minutes'] * 60
             
-            log_progress("Training and comparing multiple models...", 40)
-            best_model = compare_models(n_select=1, verbose=False)
+        include = None
+        if previous_estimator is None and training_options['search_mode'] == 'successive_halving':
+            log_progress("Screening models on stratified subsamples...", 25)
+            include = successive_halving(pycaret, df, target_column, problem_type, training_options, deadline)
             
-            log_progress("Evaluating best model...", 80)
-            results = pull()
+        # Preprocessing is fitted (and models compared) on a stratified sample in setup-sample mode
+        setup_df = df
+        if training_options['setup_sample_rows'] is not None and len(df) > training_options['setup_sample_rows']:
+            setup_df = stratified_sample(df, target_column, training_options['setup_sample_rows'], problem_type,
+                                         min_per_stratum=training_options['folds'])
+            log_progress(f"Fitting preprocessing on a stratified sample of {len(setup_df):,} rows", 25)
             
-        else:  # regression
-            from pycaret.regression import setup, compare_models, save_model, pull
-            
-            log_progress("Setting up regression experiment...", 25)
-            exp = setup(
-                data=df,
-                target=target_column,
-                session_id=42,
-                verbose=False,
-                silent=True,
-                use_gpu=False,
-                normalize=True,
-                transformation=True,
-                ignore_low_variance=True,
-                remove_multicollinearity=True,
-                multicollinearity_threshold=0.9
-            )
+        log_progress(f"Setting up {problem_type} experiment...", 25)
+        setup_start = time.perf_counter()
+        setup_kwargs = setup_arguments(setup_df, target_column, problem_type, training_options)
+        exp = pycaret.setup(**setup_kwargs)
+        timings['setup'] = time.perf_counter() - setup_start
+        
+        if previous_estimator is not None:
+            log_progress(f"Retraining {type(previous_estimator).__name__} from the previous model...", 40)
+            X_train, y_train = training_data(pycaret)
+            best_model, retrain['update'] = update_estimator(previous_estimator, X_train, y_train)
+            search_time = time.perf_counter() - search_start
             
+            # Score on the hold-out split; the metrics grid has the same columns as compare_models
+            log_progress("Evaluating retrained model...", 80)
+            pycaret.predict_model(best_model, verbose=False)
+            results = pycaret.pull()
+        else:
             log_progress("Training and comparing multiple models...", 40)
-            best_model = compare_models(n_select=1, verbose=False)
+            best_model = pycaret.compare_models(**search_arguments(training_options, include=include, deadline=deadline))
+            search_time = time.perf_counter() - search_start
             
             log_progress("Evaluating best model...", 80)
-            results = pull()
+            results = pycaret.pull()
+            
+        timings['search'] = search_time - timings['setup']
         
+        refit_rows = None
+        if setup_df is not df and setup_kwargs.get('fix_imbalance'):
+            # pipeline.transform() skips PyCaret's train-only resampling step, so a refit
+            # would drop fix_imbalance; keep the model trained on the resampled sample
+            log_progress("Keeping the sample model: imbalance fixing only runs inside setup()", 85)
+        elif setup_df is not df:
+            # Metrics above come from the sample; the saved model is fitted on every row
+            log_progress(f"Refitting the final model on all {len(df):,} rows...", 85)
+            refit_rows = len(df)
+            refit_start = time.perf_counter()
+            X_full, y_full = transform_full_data(pycaret, df, target_column)
+            if previous_estimator is not None:
+                best_model, retrain['update'] = update_estimator(previous_estimator, X_full, y_full)
+            else:
+                from sklearn.base import clone
+                best_model = clone(best_model)
+                best_model.fit(X_full, y_full)
+            del X_full, y_full
+            timings['refit'] = time.perf_counter() - refit_start
+            
         # Save model
         log_progress("Saving trained model...", 90)
         Path(output_dir).mkdir(parents=True, exist_ok=True)
         
-        dataset_id = Path(data_path).stem.split('_')[1] if '_' in Path(data_path).stem else 'model'
-        model_path = f"{output_dir}/{dataset_id}_model"
-        save_model(best_model, model_path)
-        
-        log_progress("Model training completed successfully!", 100)
+        final_pipeline, _ = pycaret.save_model(best_model, model_path, verbose=False)
         
         # Prepare results
         model_name = type(best_model).__name__
         
+        log_progress("Exporting lightweight inference pipeline...", 95)
+        try:
+            lite_model = export_lite_pipeline(final_pipeline, model_path, problem_type)
+        except Exception as e:
+            # The PyCaret artifact is still usable; inference falls back to it
+            log_progress(f"Lightweight export skipped: {str(e)}", 95)
+            lite_model = None
+        
+        manifest_path = write_model_manifest(model_path, df, target_column, problem_type, model_name, lite_model)
+        timings['total'] = time.perf_counter() - started
+        
+        log_progress("Model training completed successfully!", 100)
+        
         # Get metrics from results dataframe
         if problem_type == 'classification':
             metrics = {
@@ -135,6 +606,7 @@ def train_automl_model(data_path, target_column, problem_type='auto', output_dir
                 'f1_score': float(results['F1'].iloc[0]) if 'F1' in results.columns else None,
                 'precision': float(results['Prec.'].iloc[0]) if 'Prec.' in results.columns else None,
                 'recall': float(results['Recall'].iloc[0]) if 'Recall' in results.columns else None,
+                'metrics_source': 'setup_sample' if setup_df is not df else 'all_rows',
             }
         else:
             metrics = {
@@ -144,18 +616,27 @@ def train_automl_model(data_path, target_column, problem_type='auto', output_dir
                 'rmse': float(results['RMSE'].iloc[0]) if 'RMSE' in results.columns else None,
                 'mae': float(results['MAE'].iloc[0]) if 'MAE' in results.columns else None,
                 'mse': float(results['MSE'].iloc[0]) if 'MSE' in results.columns else None,
+                'metrics_source': 'setup_sample' if setup_df is not df else 'all_rows',
             }
         
         return {
             'success': True,
             'model_path': f"{model_path}.pkl",
+            'manifest_path': manifest_path,
             'model_name': model_name,
             'problem_type': problem_type,
             'target_column': target_column,
             'dataset_shape': df.shape,
             'metrics': metrics,
             'feature_count': len(df.columns) - 1,
-            'training_samples': len(df)
+            'training_samples': len(df),
+            'training_options': training_options,
+            'search_time_s': round(search_time, 2),
+            'retrain': retrain,
+            'setup_rows': len(setup_df),
+            'refit_rows': refit_rows,
+            'timings_s': {phase: round(seconds, 2) for phase, seconds in timings.items()},
+            'peak_memory_mb': peak_memory_mb()
         }
         
     except Exception as e:
@@ -170,7 +651,7 @@ def main():
     if len(sys.argv) < 3:
         print(json.dumps({
             'success': False,
-            'error': 'Usage: python automl_trainer.py <data_path> <target_column> [problem_type] [output_dir]'
+            'error': 'Usage: python automl_trainer.py <data_path> <target_column> [problem_type] [output_dir] [options_json]'
         }))
         sys.exit(1)
     
@@ -179,8 +660,20 @@ def main():
     problem_type = sys.argv[3] if len(sys.argv) > 3 else 'auto'
     output_dir = sys.argv[4] if len(sys.argv) > 4 else './models'
     
+    # Parse training options if provided
+    options = {}
+    if len(sys.argv) > 5:
+        try:
+            options = json.loads(sys.argv[5])
+        except json.JSONDecodeError:
+            print(json.dumps({
+                'success': False,
+                'error': 'Invalid JSON in options argument'
+            }))
+            sys.exit(1)
+            
     log_progress("Starting AutoML training...", 0)
-    result = train_automl_model(data_path, target_column, problem_type, output_dir)
+    result = train_automl_model(data_path, target_column, problem_type, output_dir, options)
     
     # Output result as JSON to stdout
     print(json.dumps(result, indent=2))
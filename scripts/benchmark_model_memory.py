@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Model Memory Benchmark for PredictML
+Measures per-worker resident memory when several inference workers load the
+same exported pipeline, with and without memory-mapped numpy arrays
+
+Usage: python benchmark_model_memory.py <model_path> [--workers N] [--sample CSV]
+
+RSS counts shared pages in every process, so the proportional set size (PSS)
+from /proc/<pid>/smaps_rollup is reported as well: it splits shared pages
+between the processes mapping them and is the number that drops when the
+model's arrays are shared through the page cache. Memory-mapped pages are
+only faulted in when used, so pass --sample with a few input rows to score
+them in every worker before measuring.
+"""
+
+import sys
+import json
+import argparse
+import multiprocessing as mp
+from pathlib import Path
+
+# Add the scripts directory to path
+sys.path.append(str(Path(__file__).parent))
+
+
+def read_memory_kb():
+    """Return RSS, PSS and private memory of the current process in KB"""
+    usage = {'rss_kb': None, 'pss_kb': None, 'private_kb': None}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            rollup = {}
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                    rollup[parts[0][:-1]] = int(parts[1])
+        usage['rss_kb'] = rollup.get('Rss')
+        usage['pss_kb'] = rollup.get('Pss')
+        usage['private_kb'] = rollup.get('Private_Clean', 0) + rollup.get('Private_Dirty', 0)
+    except OSError:
+        # Not Linux: fall back to peak RSS, which is all getrusage offers
+        import resource
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        usage['rss_kb'] = maxrss // 1024 if sys.platform == 'darwin' else maxrss
+    return usage
+
+
+def _worker(model_path, mmap_mode, sample_path, loaded, release, results):
+    """Load the model, wait until every worker has it, then measure"""
+    import pandas as pd
+    import model_inference
+
+    sample = pd.read_csv(sample_path) if sample_path else None
+    before = read_memory_kb()
+    manifest = model_inference.read_model_manifest(model_path)
+    model = model_inference.load_lite_model(model_path, manifest, mmap_mode=mmap_mode)
+    if sample is not None:
+        model.predict_frame(sample)
+
+    # Measure only once all workers hold the model so shared pages are split
+    loaded.wait()
+    release.wait()
+    after = read_memory_kb()
+    results.put({'before': before, 'after': after})
+    del model
+
+
+def run_benchmark(model_path, workers, mmap_mode, sample_path=None):
+    """Start `workers` processes loading the model and collect their memory usage"""
+    ctx = mp.get_context('spawn')
+    loaded = ctx.Barrier(workers + 1)
+    release = ctx.Event()
+    results = ctx.Queue()
+
+    processes = [
+        ctx.Process(target=_worker, args=(model_path, mmap_mode, sample_path, loaded, release, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    loaded.wait()
+    release.set()
+    samples = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    def average_mb(phase, key):
+        values = [sample[phase][key] for sample in samples if sample[phase][key] is not None]
+        return round(sum(values) / len(values) / 1024, 2) if values else None
+
+    summary = {
+        'mmap_mode': mmap_mode,
+        'workers': workers,
+        'per_worker_mb': {}
+    }
+    for key in ('rss_kb', 'pss_kb', 'private_kb'):
+        name = key.replace('_kb', '')
+        before = average_mb('before', key)
+        after = average_mb('after', key)
+        summary['per_worker_mb'][name] = {
+            'before_load': before,
+            'after_load': after,
+            'model_cost': round(after - before, 2) if before is not None and after is not None else None
+        }
+
+    pss_after = summary['per_worker_mb']['pss']['after_load']
+    summary['total_pss_mb'] = round(pss_after * workers, 2) if pss_after is not None else None
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure per-worker memory of loaded model artifacts')
+    parser.add_argument('model_path', help='Path to {dataset_id}_model.pkl with an exported lightweight pipeline')
+    parser.add_argument('--workers', type=int, default=4, help='Number of worker processes to start')
+    parser.add_argument('--sample', help='CSV with a few input rows scored by every worker before measuring')
+    args = parser.parse_args()
+
+    import model_inference
+    manifest = model_inference.read_model_manifest(args.model_path)
+    if not manifest or not manifest.get('lite_model'):
+        print(json.dumps({
+            'success': False,
+            'error': 'Model has no exported lightweight pipeline; retrain to create one'
+        }))
+        sys.exit(1)
+
+    results = [
+        run_benchmark(args.model_path, args.workers, mmap_mode, args.sample)
+        for mmap_mode in (None, 'r')
+    ]
+
+    print(json.dumps({
+        'success': True,
+        'model_path': args.model_path,
+        'results': results
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
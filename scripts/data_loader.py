@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Shared Data Loading for PredictML
+Memory-efficient loading of uploaded CSV, Excel and Parquet files used by the
+trainer, validator, report generator and inference scripts
+
+The schema is sniffed from a sample of the file first: low-cardinality string
+columns are read directly as `category`, and integer columns are downcast to
+the smallest type that holds their values once loaded. CSVs are parsed with
+the pyarrow engine when pyarrow is installed.
+
+The first full load of a CSV/Excel upload is persisted as Parquet, keyed by a
+hash of the file contents, so the validate, report and training steps only
+parse the original file once. A changed file hashes differently and is simply
+re-parsed.
+"""
+
+import pandas as pd
+import os
+import sys
+import hashlib
+from pathlib import Path
+import warnings
+warnings.filterwarnings('ignore')
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+CSV_EXTENSIONS = ('.csv',)
+EXCEL_EXTENSIONS = ('.xlsx', '.xls')
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+SUPPORTED_EXTENSIONS = CSV_EXTENSIONS + EXCEL_EXTENSIONS + PARQUET_EXTENSIONS
+
+# Rows read to sniff column types
+SAMPLE_ROWS = 10000
+
+# A string column becomes `category` when its distinct values are at most this
+# fraction of the sampled rows (and at most MAX_CATEGORIES values)
+CATEGORY_RATIO = 0.5
+MAX_CATEGORIES = 10000
+
+DEFAULT_CHUNKSIZE = 100000
+
+# Parquet copies of parsed uploads live here (default: <upload dir>/.cache)
+CACHE_DIR = os.environ.get('PREDICTML_DATA_CACHE_DIR')
+CACHE_ENABLED = os.environ.get('PREDICTML_DATA_CACHE', '1') != '0'
+
+
+def file_format(path):
+    """Return 'csv', 'excel' or 'parquet' for a supported file path"""
+    lower = str(path).lower()
+    if lower.endswith(CSV_EXTENSIONS):
+        return 'csv'
+    if lower.endswith(EXCEL_EXTENSIONS):
+        return 'excel'
+    if lower.endswith(PARQUET_EXTENSIONS):
+        return 'parquet'
+    raise ValueError(f"Unsupported file format: {path}")
+
+
+def _read_sample(path, sample_rows):
+    fmt = file_format(path)
+    if fmt == 'csv':
+        return pd.read_csv(path, nrows=sample_rows)
+    if fmt == 'excel':
+        return pd.read_excel(path, nrows=sample_rows)
+    import pyarrow.parquet as pq
+    parquet_file = pq.ParquetFile(path)
+    return next(parquet_file.iter_batches(batch_size=sample_rows)).to_pandas()
+
+
+def _looks_like_dates(values):
+    """True if a few non-null string values all parse as dates"""
+    try:
+        pd.to_datetime(values.head(20), errors='raise')
+        return True
+    except (ValueError, TypeError, OverflowError):
+        return False
+
+
+def _is_low_cardinality(series):
+    """Whether a string column is worth storing as `category`"""
+    non_null = series.dropna()
+    if len(non_null) == 0:
+        return False
+    distinct = non_null.nunique()
+    if distinct > MAX_CATEGORIES or distinct > len(non_null) * CATEGORY_RATIO:
+        return False
+    # Date strings stay plain strings so downstream date detection sees them unchanged
+    return not _looks_like_dates(non_null)
+
+
+def sniff_schema(path, sample_rows=SAMPLE_ROWS):
+    """
+    Infer read dtypes from a sample of the file
+
+    Args:
+        path: Path to CSV/Excel/Parquet file
+        sample_rows: Number of leading rows to inspect
+
+    Returns:
+        dict: {'columns': [...], 'dtypes': {column: dtype}, 'sample_rows': n}
+              where dtypes only lists columns that should be read as `category`
+    """
+    sample = _read_sample(path, sample_rows)
+    dtypes = {}
+    for col in sample.columns:
+        if sample[col].dtype != 'object':
+            continue
+        if _is_low_cardinality(sample[col]):
+            dtypes[col] = 'category'
+
+    return {
+        'columns': sample.columns.tolist(),
+        'dtypes': dtypes,
+        'sample_rows': len(sample)
+    }
+
+
+def downcast_numeric(df, downcast_floats=False):
+    """
+    Downcast integer columns (and optionally floats) to the smallest safe type
+
+    Floats are left as float64 by default so statistics and model inputs keep
+    full precision.
+    """
+    for col in df.select_dtypes(include=['integer']).columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    if downcast_floats:
+        for col in df.select_dtypes(include=['floating']).columns:
+            df[col] = pd.to_numeric(df[col], downcast='float')
+    return df
+
+
+def categorize(df, columns=None):
+    """Convert low-cardinality string columns to `category` in place"""
+    for col in columns if columns is not None else df.select_dtypes(include=['object']).columns:
+        if _is_low_cardinality(df[col]):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def file_hash(path, block_size=1024 * 1024):
+    """Content hash of a file, read in blocks"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_path(path, optimize=True):
+    """Location of the Parquet cache for a source file's current contents"""
+    source = Path(path)
+    cache_dir = Path(CACHE_DIR) if CACHE_DIR else source.parent / '.cache'
+    suffix = '' if optimize else '-raw'
+    return cache_dir / f"{source.stem}-{file_hash(source)}{suffix}.parquet"
+
+
+def _write_cache(df, target, path, optimize=True):
+    """Persist a parsed DataFrame as Parquet, replacing older copies of the same source"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temp = target.with_suffix(f'.{os.getpid()}.tmp')
+    try:
+        df.to_parquet(temp, index=False)
+        os.replace(temp, target)
+    except Exception as e:
+        # e.g. non-string column names or mixed-type object columns
+        print(f"Skipping data cache for {Path(path).name}: {e}", file=sys.stderr)
+        temp.unlink(missing_ok=True)
+        return
+
+    # Copies of earlier contents of the same upload can never be hit again
+    suffix = '' if optimize else '-raw'
+    for stale in target.parent.glob(f"{Path(path).stem}-{'?' * 32}{suffix}.parquet"):
+        if stale != target:
+            stale.unlink(missing_ok=True)
+
+
+def _read_csv(path, dtype=None, columns=None):
+    if HAS_PYARROW:
+        try:
+            return pd.read_csv(path, engine='pyarrow', dtype=dtype, usecols=columns)
+        except Exception as e:
+            # The pyarrow parser is stricter about malformed rows; retry with the C parser
+            print(f"pyarrow CSV engine failed ({e}), falling back to the C parser", file=sys.stderr)
+    return pd.read_csv(path, dtype=dtype, usecols=columns, low_memory=False)
+
+
+def load_dataframe(path, optimize=True, columns=None, sample_rows=SAMPLE_ROWS, use_cache=True):
+    """
+    Load a whole CSV/Excel/Parquet file into a DataFrame
+
+    Args:
+        path: Path to the file
+        optimize: Sniff categories from a sample and downcast integer columns
+        columns: Optional subset of columns to load
+        sample_rows: Rows used to sniff the schema
+        use_cache: Read/write the Parquet copy of CSV/Excel files
+
+    Returns:
+        DataFrame
+    """
+    fmt = file_format(path)
+    cached = None
+    if use_cache and CACHE_ENABLED and HAS_PYARROW and fmt != 'parquet':
+        cached = cache_path(path, optimize)
+        if cached.exists():
+            return pd.read_parquet(cached, columns=columns)
+        # Parse every column once so the cache serves any later column subset
+        df = load_dataframe(path, optimize=optimize, sample_rows=sample_rows, use_cache=False)
+        _write_cache(df, cached, path, optimize)
+        return df[columns] if columns is not None else df
+
+    dtype = None
+    if optimize and fmt == 'csv':
+        dtype = sniff_schema(path, sample_rows)['dtypes']
+        if columns is not None:
+            dtype = {col: value for col, value in dtype.items() if col in columns}
+
+    if fmt == 'csv':
+        df = _read_csv(path, dtype=dtype or None, columns=columns)
+    elif fmt == 'excel':
+        df = pd.read_excel(path, usecols=columns)
+    else:
+        df = pd.read_parquet(path, columns=columns)
+
+    if optimize:
+        if fmt != 'csv':
+            categorize(df)
+        downcast_numeric(df)
+    return df
+
+
+def iter_chunks(path, chunksize=DEFAULT_CHUNKSIZE, optimize=True, columns=None):
+    """
+    Yield the file as DataFrames of at most `chunksize` rows
+
+    Only one chunk is held in memory at a time for CSV and Parquet. Excel has
+    no streaming reader, so the workbook is read once and sliced.
+    """
+    fmt = file_format(path)
+    if CACHE_ENABLED and HAS_PYARROW and fmt != 'parquet':
+        cached = cache_path(path, optimize)
+        if cached.exists():
+            # An earlier step already parsed this file; stream the Parquet copy
+            path, fmt = cached, 'parquet'
+
+    if fmt == 'csv':
+        dtype = sniff_schema(path)['dtypes'] if optimize else None
+        chunks = pd.read_csv(path, chunksize=chunksize, dtype=dtype or None, usecols=columns)
+    elif fmt == 'parquet':
+        import pyarrow.parquet as pq
+        batches = pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns)
+        chunks = (batch.to_pandas() for batch in batches)
+    else:
+        df = pd.read_excel(path, usecols=columns)
+        chunks = (df.iloc[start:start + chunksize].copy() for start in range(0, len(df), chunksize))
+
+    for chunk in chunks:
+        if optimize:
+            if fmt != 'csv':
+                categorize(chunk)
+            downcast_numeric(chunk)
+        yield chunk
+
+
+def memory_usage_mb(df):
+    """Deep memory usage of a DataFrame in MB"""
+    return round(df.memory_usage(deep=True).sum() / (1024 * 1024), 2)
+
+
+def estimate_shape(path, probe_bytes=1024 * 1024):
+    """
+    Approximate (rows, columns) of a file without loading it
+
+    Parquet row counts come from the file metadata. CSV rows are extrapolated
+    from the line lengths in the first `probe_bytes`, Excel rows from the sheet
+    dimensions.
+    """
+    fmt = file_format(path)
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        metadata = pq.ParquetFile(path).metadata
+        return metadata.num_rows, metadata.num_columns
+
+    columns = len(_read_sample(path, 1).columns)
+    if fmt == 'csv':
+        size = os.path.getsize(path)
+        with open(path, 'rb') as f:
+            probe = f.read(probe_bytes)
+        lines = probe.count(b'\n')
+        if len(probe) < probe_bytes:
+            # The whole file was read; a last line may lack its newline, and the header is not a row
+            lines += 0 if probe.endswith(b'\n') else 1
+            return max(0, lines - 1), columns
+        return int(size * lines / len(probe)) - 1, columns
+
+    from openpyxl import load_workbook
+    workbook = load_workbook(path, read_only=True)
+    try:
+        return max(0, (workbook.active.max_row or 1) - 1), columns
+    finally:
+        workbook.close()
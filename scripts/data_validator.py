@@ -7,25 +7,192 @@ Analyzes uploaded data for quality issues, missing patterns, and mandatory field
 import pandas as pd
 import numpy as np
 import json
+import os
 import sys
 from pathlib import Path
 from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
+# Add the scripts directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from data_loader import load_dataframe, iter_chunks, sniff_schema, SUPPORTED_EXTENSIONS
+from sketches import HyperLogLog, ReservoirSampler, hash_values
+
+# Files larger than this are validated in approximate mode unless told otherwise
+APPROXIMATE_THRESHOLD_MB = float(os.environ.get('PREDICTML_APPROX_THRESHOLD_MB', 500))
+DEFAULT_SAMPLE_ROWS = 100000
+
+
+class DataProfile:
+    """
+    Per-column statistics computed once and shared by every validate_* method
+    
+    Null counts, distinct counts, numeric min/max and dtypes are each computed
+    with a single vectorized call over the whole DataFrame, and the duplicate
+    row mask is computed once instead of per check.
+    """
+    
+    def __init__(self, df, numeric_cols):
+        """
+        Profile a DataFrame
+        
+        Args:
+            df: DataFrame to profile
+            numeric_cols: Columns to compute min/max for
+        """
+        self.n_rows = int(df.shape[0])
+        self.n_cols = int(df.shape[1])
+        self.dtypes = df.dtypes.astype(str).to_dict()
+        
+        null_counts = df.isnull().sum()
+        self.null_counts = null_counts.astype(int).to_dict()
+        self.non_null_counts = (self.n_rows - null_counts).astype(int).to_dict()
+        self.distinct_counts = df.nunique(dropna=True).astype(int).to_dict()
+        
+        numeric = df[numeric_cols]
+        self.min_values = numeric.min().to_dict() if numeric_cols else {}
+        self.max_values = numeric.max().to_dict() if numeric_cols else {}
+        
+        self.duplicate_mask = df.duplicated()
+        self.duplicate_rows = int(self.duplicate_mask.sum())
+        
+        self.approximate = False
+        self._df = df
+    
+    @property
+    def missing_cells(self):
+        return sum(self.null_counts.values())
+    
+    def value_counts(self, col):
+        """Counts of each non-null value in a column"""
+        return self._df[col].value_counts()
+
+
+class SketchProfile:
+    """
+    Approximate column profile built by streaming a file in chunks
+    
+    Row, null and non-null counts, numeric min/max and the target column's
+    value counts are exact. The duplicate row count is exact as well, counted
+    from a set of 64-bit row hashes (8 bytes per row). Distinct counts per
+    column are HyperLogLog estimates and come with ~95% (two standard error)
+    bounds.
+    Validation checks that need actual rows run on a uniform reservoir
+    sample of the file.
+    """
+    
+    def __init__(self, file_path, target_column=None, sample_rows=DEFAULT_SAMPLE_ROWS, chunksize=100000):
+        """
+        Profile a file without loading it whole
+        
+        Args:
+            file_path: Path to CSV/Excel/Parquet file
+            target_column: Column whose value counts are tracked exactly
+            sample_rows: Size of the reservoir sample kept for row-level checks
+            chunksize: Rows read per chunk
+        """
+        self.approximate = True
+        self.target_column = target_column
+        self.n_rows = 0
+        null_counts = None
+        minimums, maximums = {}, {}
+        column_sketches = {}
+        row_hashes = []
+        target_counts = None
+        sampler = ReservoirSampler(sample_rows)
+        
+        # Chunks keep pandas' default dtypes so equal values hash identically across chunks
+        for chunk in iter_chunks(file_path, chunksize=chunksize, optimize=False):
+            self.n_rows += len(chunk)
+            
+            chunk_nulls = chunk.isnull().sum()
+            null_counts = chunk_nulls if null_counts is None else null_counts.add(chunk_nulls, fill_value=0)
+            
+            for col in chunk.columns:
+                column_sketches.setdefault(col, HyperLogLog()).add(chunk[col])
+            row_hashes.append(np.unique(hash_values(chunk)))
+            
+            numeric = chunk.select_dtypes(include=[np.number])
+            for col, value in numeric.min().items():
+                if pd.notna(value):
+                    minimums[col] = min(minimums.get(col, value), value)
+            for col, value in numeric.max().items():
+                if pd.notna(value):
+                    maximums[col] = max(maximums.get(col, value), value)
+            
+            if target_column in chunk.columns:
+                counts = chunk[target_column].value_counts()
+                target_counts = counts if target_counts is None else target_counts.add(counts, fill_value=0)
+            
+            sampler.add(chunk)
+        
+        self.sample = sampler.sample
+        self.n_cols = int(self.sample.shape[1])
+        self.dtypes = self.sample.dtypes.astype(str).to_dict()
+        self.null_counts = null_counts.astype(int).to_dict() if null_counts is not None else {}
+        self.non_null_counts = {col: self.n_rows - count for col, count in self.null_counts.items()}
+        
+        # Estimates can exceed the number of values actually present; clip them
+        self.distinct_counts = {}
+        self.distinct_bounds = {}
+        for col, sketch in column_sketches.items():
+            low, high = sketch.bounds()
+            limit = self.non_null_counts[col]
+            self.distinct_counts[col] = int(min(round(sketch.estimate()), limit))
+            self.distinct_bounds[col] = [int(min(low, limit)), int(min(high, limit))]
+        
+        self.min_values = minimums
+        self.max_values = maximums
+        
+        # A HyperLogLog estimate of distinct rows would turn its ~1% error into
+        # phantom duplicates; distinct hashes count them exactly
+        distinct_rows = len(np.unique(np.concatenate(row_hashes))) if row_hashes else 0
+        self.duplicate_rows = int(self.n_rows - distinct_rows)
+        
+        self.relative_error = float(HyperLogLog().relative_error)
+        self._target_counts = target_counts.astype(int).sort_values(ascending=False) if target_counts is not None else None
+    
+    @property
+    def missing_cells(self):
+        return sum(self.null_counts.values())
+    
+    def value_counts(self, col):
+        """Exact counts for the tracked target column, sample counts otherwise"""
+        if col == self.target_column and self._target_counts is not None:
+            return self._target_counts
+        return self.sample[col].value_counts()
+    
+    def summary(self):
+        """Description of the approximation for the validation output"""
+        return {
+            'enabled': True,
+            'method': 'HyperLogLog distinct counts, row hashes for duplicates, reservoir sampling',
+            'total_rows': self.n_rows,
+            'sample_rows': int(len(self.sample)),
+            'distinct_count_relative_std_error': round(self.relative_error, 4),
+            'bounds_confidence': '~95% (two standard errors)',
+            'exact_fields': ['total_rows', 'missing counts', 'min/max', 'target value counts',
+                             'duplicate_rows', 'unique_rows'],
+            'estimated_fields': ['unique_values', 'uniqueness_ratio'],
+            'sampled_fields': ['date column detection', 'mandatory_combinations value counts']
+        }
+
 
 class DataValidator:
     """
     Comprehensive data validation for ML prediction models
     """
     
-    def __init__(self, df, target_column=None):
+    def __init__(self, df, target_column=None, profile=None):
         """
         Initialize data validator
         
         Args:
-            df: DataFrame to validate
+            df: DataFrame to validate (a row sample when `profile` is a SketchProfile)
             target_column: Target column for prediction (optional)
+            profile: Precomputed DataProfile/SketchProfile (computed from df if None)
         """
         self.df = df.copy()
         self.target_column = target_column
@@ -48,10 +215,19 @@ class DataValidator:
         # Attempt to detect date columns in object columns
         self._detect_date_columns()
         
+        self._profile = profile
+    
+    @property
+    def profile(self):
+        """Column profile shared by all checks, computed on first use"""
+        if self._profile is None:
+            self._profile = DataProfile(self.df, self.numeric_cols)
+        return self._profile
+        
     def _detect_date_columns(self):
         """Detect date columns that might be stored as strings"""
         for col in self.categorical_cols:
-            if self.df[col].dtype == 'object':
+            if self.df[col].dtype == 'object' or isinstance(self.df[col].dtype, pd.CategoricalDtype):
                 # Check if column name suggests date
                 date_keywords = ['date', 'time', 'created', 'updated', 'start', 'end', 'birth']
                 if any(keyword in col.lower() for keyword in date_keywords):
@@ -67,16 +243,17 @@ class DataValidator:
     
     def validate_overall_quality(self):
         """Assess overall data quality metrics"""
-        total_cells = self.df.shape[0] * self.df.shape[1]
-        missing_cells = self.df.isnull().sum().sum()
+        profile = self.profile
+        total_cells = profile.n_rows * profile.n_cols
+        missing_cells = profile.missing_cells
         
         self.validation_results['overall_quality'] = {
-            'total_rows': int(self.df.shape[0]),
-            'total_columns': int(self.df.shape[1]),
+            'total_rows': profile.n_rows,
+            'total_columns': profile.n_cols,
             'missing_cells': int(missing_cells),
             'completeness_percentage': round((1 - missing_cells/total_cells) * 100, 2),
-            'duplicate_rows': int(self.df.duplicated().sum()),
-            'unique_rows': int(self.df.shape[0] - self.df.duplicated().sum())
+            'duplicate_rows': profile.duplicate_rows,
+            'unique_rows': profile.n_rows - profile.duplicate_rows
         }
         
         # Quality assessment
@@ -105,16 +282,17 @@ class DataValidator:
     def validate_missing_data(self):
         """Analyze missing data patterns"""
         missing_summary = {}
+        profile = self.profile
         
         for col in self.df.columns:
-            missing_count = self.df[col].isnull().sum()
-            missing_pct = (missing_count / len(self.df)) * 100
+            missing_count = profile.null_counts[col]
+            missing_pct = (missing_count / profile.n_rows) * 100
             
             if missing_count > 0:
                 missing_summary[col] = {
                     'missing_count': int(missing_count),
                     'missing_percentage': round(missing_pct, 2),
-                    'data_type': str(self.df[col].dtype)
+                    'data_type': profile.dtypes[col]
                 }
         
         self.validation_results['missing_data'] = missing_summary
@@ -139,15 +317,22 @@ class DataValidator:
             'column_details': {}
         }
         
+        profile = self.profile
         for col in self.df.columns:
-            unique_count = self.df[col].nunique()
-            total_count = len(self.df[col].dropna())
+            unique_count = profile.distinct_counts[col]
+            total_count = profile.non_null_counts[col]
             
             col_info = {
-                'data_type': str(self.df[col].dtype),
+                'data_type': profile.dtypes[col],
                 'unique_values': int(unique_count),
                 'uniqueness_ratio': round(unique_count / total_count if total_count > 0 else 0, 3)
             }
+            if profile.approximate:
+                col_info['unique_values_estimated'] = True
+                col_info['unique_values_bounds'] = profile.distinct_bounds[col]
+            if col in profile.min_values and pd.notna(profile.min_values[col]):
+                col_info['min'] = float(profile.min_values[col])
+                col_info['max'] = float(profile.max_values[col])
             
             # Suggest potential issues
             if col in self.categorical_cols and unique_count > total_count * 0.8:
@@ -165,7 +350,7 @@ class DataValidator:
             # Try to suggest potential target columns
             potential_targets = []
             for col in self.df.columns:
-                unique_vals = self.df[col].nunique()
+                unique_vals = self.profile.distinct_counts[col]
                 if 2 <= unique_vals <= 10:  # Good for classification
                     col_lower = col.lower().replace('_', '').replace(' ', '')
                     score = 0
@@ -186,21 +371,26 @@ class DataValidator:
             return
         
         target_col = self.df[self.target_column]
-        unique_values = target_col.unique()
+        value_counts = self.profile.value_counts(self.target_column)
+        missing_count = self.profile.null_counts[self.target_column]
+        if self.profile.approximate:
+            # Rare classes may be missing from the sample; the streamed counts are complete
+            unique_values = list(value_counts.index) + ([np.nan] if missing_count else [])
+        else:
+            unique_values = target_col.unique()
         
         target_analysis = {
             'column_name': self.target_column,
             'unique_values': [str(v) for v in unique_values if pd.notna(v)],
-            'value_counts': {str(k): int(v) for k, v in target_col.value_counts().to_dict().items()},
-            'missing_count': int(target_col.isnull().sum()),
-            'missing_percentage': round(float((target_col.isnull().sum() / len(target_col)) * 100), 2)
+            'value_counts': {str(k): int(v) for k, v in value_counts.to_dict().items()},
+            'missing_count': int(missing_count),
+            'missing_percentage': round(float((missing_count / self.profile.n_rows) * 100), 2)
         }
         
         # Determine if binary, multiclass, or regression
         if len(unique_values) == 2:
             target_analysis['type'] = 'binary_classification'
             # Check for class imbalance
-            value_counts = target_col.value_counts()
             minority_class_pct = (value_counts.min() / value_counts.sum()) * 100
             target_analysis['class_balance'] = {
                 'minority_class_percentage': round(float(minority_class_pct), 2),
@@ -304,6 +494,9 @@ class DataValidator:
         self.validate_mandatory_combinations()
         self.generate_recommendations()
         
+        if self.profile.approximate:
+            self.validation_results['approximation'] = self.profile.summary()
+        
         # Add metadata
         self.validation_results['metadata'] = {
             'validation_timestamp': datetime.now().isoformat(),
@@ -314,44 +507,59 @@ class DataValidator:
         return self.validation_results
 
 
-def validate_data_from_file(file_path, target_column=None):
+def detect_target_column(columns):
+    """Guess the target column from common target column names (partial matching)"""
+    target_candidates = ['target', 'label', 'y', 'outcome', 'churn', 'attrition', 'left', 'exit', 'status', 'will_leave', 'risk']
+    for col in columns:
+        col_lower = col.lower().replace('_', '').replace(' ', '')
+        for candidate in target_candidates:
+            if candidate in col_lower or col_lower in candidate:
+                return col
+    return None
+
+
+def validate_data_from_file(file_path, target_column=None, approximate=None, sample_rows=DEFAULT_SAMPLE_ROWS):
     """
     Main function to validate data from uploaded file
     
     Args:
         file_path: Path to the uploaded file
         target_column: Optional target column name
+        approximate: Stream the file and estimate distinct counts
+                     instead of loading it whole; None decides by file size
+        sample_rows: Rows kept for row-level checks in approximate mode
     
     Returns:
         dict: Validation results
     """
     try:
         # Read the file
-        if file_path.lower().endswith('.csv'):
-            df = pd.read_csv(file_path)
-        elif file_path.lower().endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(file_path)
-        else:
+        if not file_path.lower().endswith(SUPPORTED_EXTENSIONS):
             return {
                 'success': False,
                 'error': 'Unsupported file format'
             }
         
-        # Auto-detect target column if not provided
-        if not target_column:
-            # Look for common target column names (with partial matching)
-            target_candidates = ['target', 'label', 'y', 'outcome', 'churn', 'attrition', 'left', 'exit', 'status', 'will_leave', 'risk']
-            for col in df.columns:
-                col_lower = col.lower().replace('_', '').replace(' ', '')
-                for candidate in target_candidates:
-                    if candidate in col_lower or col_lower in candidate:
-                        target_column = col
-                        break
-                if target_column:
-                    break
-        
-        # Create validator and run validation
-        validator = DataValidator(df, target_column)
+        if approximate is None:
+            approximate = os.path.getsize(file_path) > APPROXIMATE_THRESHOLD_MB * 1024 * 1024
+        
+        if approximate:
+            # Auto-detect target column if not provided
+            if not target_column:
+                target_column = detect_target_column(sniff_schema(file_path, sample_rows=1)['columns'])
+            
+            profile = SketchProfile(file_path, target_column, sample_rows=sample_rows)
+            validator = DataValidator(profile.sample, target_column, profile=profile)
+        else:
+            df = load_dataframe(file_path)
+            
+            # Auto-detect target column if not provided
+            if not target_column:
+                target_column = detect_target_column(df.columns)
+            
+            validator = DataValidator(df, target_column)
+        
+        # Run validation
         results = validator.run_validation()
         
         return {
@@ -376,12 +584,27 @@ def main():
         }))
         sys.exit(1)
     
-    file_path = sys.argv[1]
-    target_column = sys.argv[2] if len(sys.argv) > 2 else None
+    # Usage: python data_validator.py <file_path> [target_column] [--approximate|--exact] [--sample-rows N]
+    args = sys.argv[1:]
+    approximate = None
+    sample_rows = DEFAULT_SAMPLE_ROWS
+    if '--approximate' in args:
+        approximate = True
+        args.remove('--approximate')
+    if '--exact' in args:
+        approximate = False
+        args.remove('--exact')
+    if '--sample-rows' in args:
+        index = args.index('--sample-rows')
+        sample_rows = int(args[index + 1])
+        del args[index:index + 2]
+    
+    file_path = args[0]
+    target_column = args[1] if len(args) > 1 else None
     
-    result = validate_data_from_file(file_path, target_column)
+    result = validate_data_from_file(file_path, target_column, approximate, sample_rows)
     print(json.dumps(result))
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
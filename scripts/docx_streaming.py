@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Streaming DOCX Tables for PredictML
+Writes very large tables into a saved .docx chunk by chunk instead of building
+them with python-docx
+
+python-docx keeps every cell of a table as XML objects in memory, and each
+add_row() gets slower as the table grows, so per-record listings for 100k+ rows
+are impractical. Instead the report adds a placeholder paragraph where a large
+table belongs and saves the (small) document as usual. save_with_streamed_tables()
+then copies the package, replacing each placeholder in word/document.xml with
+table XML generated from an iterator of DataFrame chunks. Only one chunk of
+rows is held in memory at a time.
+"""
+
+import os
+import re
+import uuid
+import zipfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+DOCUMENT_PART = 'word/document.xml'
+
+# Usable page width of the default template (8.5in minus 1in margins), in twentieths of a point
+DEFAULT_TABLE_WIDTH = 9360
+
+# Characters that are not allowed in XML 1.0 documents
+_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def add_table_placeholder(doc):
+    """Add a placeholder paragraph for a streamed table and return its marker"""
+    marker = f'STREAMED-TABLE-{uuid.uuid4().hex}'
+    doc.add_paragraph(marker)
+    return marker
+
+
+def _cell_xml(text, width):
+    text = escape(_INVALID_XML_CHARS.sub('', text))
+    return (
+        f'<w:tc><w:tcPr><w:tcW w:w="{width}" w:type="dxa"/></w:tcPr>'
+        f'<w:p><w:r><w:t xml:space="preserve">{text}</w:t></w:r></w:p></w:tc>'
+    )
+
+
+def _row_xml(values, width, header=False):
+    properties = '<w:trPr><w:tblHeader/></w:trPr>' if header else ''
+    cells = ''.join(_cell_xml(value, width) for value in values)
+    return f'<w:tr>{properties}{cells}</w:tr>'
+
+
+def iter_table_xml(columns, chunks, style='TableGrid'):
+    """
+    Yield the XML of a table in pieces
+
+    Args:
+        columns: Header labels
+        chunks: Iterable of DataFrames whose columns match `columns` in order
+        style: Table style id (python-docx's 'Table Grid' is 'TableGrid')
+    """
+    width = DEFAULT_TABLE_WIDTH // max(1, len(columns))
+    grid = ''.join(f'<w:gridCol w:w="{width}"/>' for _ in columns)
+    yield (
+        f'<w:tbl><w:tblPr><w:tblStyle w:val="{style}"/><w:tblW w:w="0" w:type="auto"/>'
+        f'<w:tblLook w:val="04A0"/></w:tblPr><w:tblGrid>{grid}</w:tblGrid>'
+    )
+    # The header row repeats on every page
+    yield _row_xml([str(column) for column in columns], width, header=True)
+    for chunk in chunks:
+        text = chunk.astype(str).to_numpy()
+        yield ''.join(_row_xml(row, width) for row in text)
+    yield '</w:tbl>'
+
+
+def _split_at_placeholders(document_xml, markers):
+    """Split document XML into [text, marker, text, marker, ..., text] at placeholder paragraphs"""
+    pieces = []
+    position = 0
+    found = sorted((document_xml.find(marker), marker) for marker in markers)
+    for index, marker in found:
+        if index < 0:
+            raise ValueError(f"Streamed table placeholder {marker} not found in the document")
+        # The whole placeholder paragraph (<w:p>...</w:p>) is replaced by the table
+        start = max(document_xml.rfind('<w:p>', 0, index), document_xml.rfind('<w:p ', 0, index))
+        end = document_xml.find('</w:p>', index) + len('</w:p>')
+        pieces.extend([document_xml[position:start], marker])
+        position = end
+    pieces.append(document_xml[position:])
+    return pieces
+
+
+def save_with_streamed_tables(doc, output_path, tables):
+    """
+    Save a document, streaming large tables into their placeholders
+
+    Args:
+        doc: python-docx Document containing the placeholders
+        output_path: Where to write the .docx
+        tables: dict of marker -> (columns, iterable of DataFrame chunks)
+    """
+    if not tables:
+        doc.save(output_path)
+        return
+
+    output_path = Path(output_path)
+    base_path = output_path.with_name(f'.{output_path.name}.{os.getpid()}.base')
+    temp_path = output_path.with_name(f'.{output_path.name}.{os.getpid()}.tmp')
+    try:
+        doc.save(base_path)
+        with zipfile.ZipFile(base_path) as source, \
+                zipfile.ZipFile(temp_path, 'w', compression=zipfile.ZIP_DEFLATED) as target:
+            for item in source.infolist():
+                if item.filename != DOCUMENT_PART:
+                    target.writestr(item, source.read(item.filename))
+                    continue
+
+                pieces = _split_at_placeholders(source.read(item).decode('utf-8'), tables)
+                with target.open(DOCUMENT_PART, 'w', force_zip64=True) as stream:
+                    for piece in pieces:
+                        if piece in tables:
+                            columns, chunks = tables[piece]
+                            for xml in iter_table_xml(columns, chunks):
+                                stream.write(xml.encode('utf-8'))
+                            # Word expects a paragraph between a table and what follows it
+                            stream.write(b'<w:p/>')
+                        else:
+                            stream.write(piece.encode('utf-8'))
+        os.replace(temp_path, output_path)
+    finally:
+        base_path.unlink(missing_ok=True)
+        temp_path.unlink(missing_ok=True)
@@ -8,6 +8,7 @@ import sys
 import os
 import json
 from pathlib import Path
+from datetime import datetime
 
 # Add the scripts directory to path
 sys.path.append(str(Path(__file__).parent))
@@ -15,51 +16,54 @@ sys.path.append(str(Path(__file__).parent))
 from generic_ml_report_generator import generate_report_from_upload
 
 
-def main():
+def write_report_status(output_dir, report_id, output_format, render_profile):
     """
-    Main entry point for report generation
-    Usage: python generate_report.py <file_path> <report_id> [options_json]
+    Record which output of a report ID is current
+
+    The status and download routes read it to serve the format generated
+    last, since earlier formats of the same report stay on disk.
     """
-    if len(sys.argv) < 3:
-        print(json.dumps({
-            'success': False,
-            'error': 'Missing required arguments: file_path and report_id'
-        }))
-        sys.exit(1)
-    
-    file_path = sys.argv[1]
-    report_id = sys.argv[2]
-    
-    # Parse options if provided
-    options = {}
-    if len(sys.argv) > 3:
-        try:
-            options = json.loads(sys.argv[3])
-        except json.JSONDecodeError:
-            print(json.dumps({
-                'success': False,
-                'error': 'Invalid JSON in options argument'
-            }))
-            sys.exit(1)
+    status = {
+        'report_id': report_id,
+        'output_format': output_format,
+        'render_profile': render_profile,
+        'file': f'{report_id}_report.{output_format}',
+        'generated_at': datetime.now().isoformat()
+    }
+    status_path = Path(output_dir) / f'{report_id}_status.json'
+    temp_path = status_path.with_name(f'{status_path.name}.{os.getpid()}.tmp')
+    temp_path.write_text(json.dumps(status))
+    os.replace(temp_path, status_path)
+
+
+def run_report(file_path, report_id, options):
+    """
+    Generate the report for an upload and return the JSON-serializable result
     
+    Used by main() and by the resident workers in report_worker.py
+    """
     # Validate file exists
     if not os.path.exists(file_path):
-        print(json.dumps({
+        return {
             'success': False,
             'error': f'File not found: {file_path}'
-        }))
-        sys.exit(1)
+        }
     
     try:
         # Extract options
         target_column = options.get('target_column', 'target')
         model_name = options.get('model_name', 'ML Prediction Model')
         positive_class = options.get('positive_class', None)
+        chart_workers = options.get('chart_workers', None)
+        render_profile = options.get('render_profile', 'standard')
+        use_cache = options.get('use_cache', True)
+        include_record_listing = options.get('include_record_listing', False)
+        output_format = options.get('output_format', 'docx')
         
         # Generate output path
         output_dir = Path(file_path).parent / 'reports'
         output_dir.mkdir(exist_ok=True)
-        output_path = output_dir / f'{report_id}_report.docx'
+        output_path = output_dir / f'{report_id}_report.{output_format}'
         
         # Generate report
         result_path = generate_report_from_upload(
@@ -67,24 +71,63 @@ def main():
             target_column=target_column,
             model_name=model_name,
             positive_class=positive_class,
-            output_path=str(output_path)
+            output_path=str(output_path),
+            chart_workers=chart_workers,
+            render_profile=render_profile,
+            use_cache=use_cache,
+            include_record_listing=include_record_listing,
+            output_format=output_format
         )
+        write_report_status(output_dir, report_id, output_format, render_profile)
         
-        # Return success response
-        print(json.dumps({
+        return {
             'success': True,
             'report_path': str(result_path),
             'report_id': report_id,
+            'render_profile': render_profile,
+            'output_format': output_format,
             'message': 'Report generated successfully'
-        }))
+        }
         
     except Exception as e:
-        print(json.dumps({
+        return {
             'success': False,
             'error': str(e),
             'report_id': report_id
+        }
+
+
+def main():
+    """
+    Main entry point for report generation
+    Usage: python generate_report.py <file_path> <report_id> [options_json]
+    """
+    if len(sys.argv) < 3:
+        print(json.dumps({
+            'success': False,
+            'error': 'Missing required arguments: file_path and report_id'
         }))
         sys.exit(1)
+        
+    file_path = sys.argv[1]
+    report_id = sys.argv[2]
+    
+    # Parse options if provided
+    options = {}
+    if len(sys.argv) > 3:
+        try:
+            options = json.loads(sys.argv[3])
+        except json.JSONDecodeError:
+            print(json.dumps({
+                'success': False,
+                'error': 'Invalid JSON in options argument'
+            }))
+            sys.exit(1)
+            
+    result = run_report(file_path, report_id, options)
+    print(json.dumps(result))
+    if not result['success']:
+        sys.exit(1)
 
 
 if __name__ == '__main__':
@@ -5,6 +5,8 @@ Automatically generates comprehensive analysis reports for any ML prediction mod
 
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Render off-screen, also inside chart worker processes
 import matplotlib.pyplot as plt
 import seaborn as sns
 from docx import Document
@@ -12,21 +14,160 @@ from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from datetime import datetime
 import io
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+# Add the scripts directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from data_loader import load_dataframe, file_hash
+from report_statistics import ReportStatistics
+from report_cache import ReportCache, report_fingerprint, CACHE_ENABLED as REPORT_CACHE_ENABLED
+from docx_streaming import add_table_placeholder, save_with_streamed_tables
+from report_renderers import render_html, render_json
+from report_correlation import summarize_correlations, LARGE_MODE_MIN_COLUMNS as CORRELATION_LARGE_MODE_COLUMNS
+
 # Set style for plots
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
 
 
+# Render quality profiles
+#
+# draft:    screen resolution JPEGs with simplified styling for instant previews
+# standard: medium resolution PNGs, the default
+# print:    300 DPI PNGs for printed reports
+RENDER_PROFILES = {
+    'draft': {
+        'dpi': 96,
+        'format': 'jpeg',
+        'pil_kwargs': {'quality': 70, 'optimize': True},
+        'simplified': True
+    },
+    'standard': {
+        'dpi': 150,
+        'format': 'png',
+        'pil_kwargs': {'compress_level': 6},
+        'simplified': False
+    },
+    'print': {
+        'dpi': 300,
+        'format': 'png',
+        'pil_kwargs': {'compress_level': 9, 'optimize': True},
+        'simplified': False
+    }
+}
+DEFAULT_RENDER_PROFILE = 'standard'
+
+
+# Report output formats; html and json are rendered from analyze() without matplotlib
+OUTPUT_FORMATS = ('docx', 'html', 'json')
+
+# Rows per chunk written to streamed per-record tables
+RECORD_LISTING_CHUNK_ROWS = 5000
+
+
+# Chart renderers
+#
+# Each renderer draws one figure from precomputed, picklable data so charts can
+# be rendered in worker processes while the main process assembles the report.
+
+def _plot_target_distribution(labels, counts, target_column):
+    plt.figure(figsize=(8, 6))
+    colors = ['#3498DB', '#E74C3C', '#2ECC71', '#F39C12']
+    plt.pie(counts, labels=labels, autopct='%1.1f%%',
+            startangle=90, colors=colors[:len(counts)])
+    plt.title(f'{target_column} Distribution', fontsize=14, fontweight='bold')
+    plt.axis('equal')
+
+
+def _plot_category_rates(category_rates, col, target_column):
+    plt.figure(figsize=(10, 6))
+    category_rates.plot(kind='barh' if len(category_rates) > 5 else 'bar', 
+                        color='#9B59B6')
+    plt.title(f'{target_column} Rate by {col}', fontsize=14, fontweight='bold')
+    plt.ylabel(f'{target_column} Rate' if len(category_rates) <= 5 else col, fontsize=12)
+    plt.xlabel(col if len(category_rates) <= 5 else f'{target_column} Rate', fontsize=12)
+    plt.grid(axis='y' if len(category_rates) <= 5 else 'x', alpha=0.3)
+
+
+def _plot_numeric_distribution(bin_edges, neg_counts, pos_counts, col, target_column):
+    plt.figure(figsize=(10, 6))
+    # Histograms are binned in the main process; draw them from the counts
+    plt.hist([bin_edges[:-1], bin_edges[:-1]], bins=bin_edges, weights=[neg_counts, pos_counts],
+             label=['Negative', 'Positive'], color=['#3498DB', '#E74C3C'], alpha=0.7)
+    plt.title(f'{col} Distribution by {target_column}', fontsize=14, fontweight='bold')
+    plt.xlabel(col, fontsize=12)
+    plt.ylabel('Frequency', fontsize=12)
+    plt.legend()
+    plt.grid(axis='y', alpha=0.3)
+
+
+def _plot_rate_over_time(period_rates, target_column):
+    plt.figure(figsize=(12, 6))
+    period_rates.plot(kind='line', marker='o', linewidth=2, color='#3498DB')
+    plt.title(f'{target_column} Rate Over Time', fontsize=14, fontweight='bold')
+    plt.xlabel('Time Period', fontsize=12)
+    plt.ylabel(f'{target_column} Rate', fontsize=12)
+    plt.grid(axis='both', alpha=0.3)
+    plt.xticks(rotation=45)
+
+
+def _plot_correlation_matrix(corr_matrix, annot=True, title='Feature Correlation Matrix'):
+    plt.figure(figsize=(10, 8))
+    sns.heatmap(corr_matrix, annot=annot, cmap='coolwarm', center=0,
+                fmt='.2f', square=True, linewidths=1)
+    plt.title(title, fontsize=14, fontweight='bold')
+
+
+def _plot_risk_distribution(bin_edges, counts, mean_score):
+    plt.figure(figsize=(10, 6))
+    plt.hist(bin_edges[:-1], bins=bin_edges, weights=counts, color='#E67E22', alpha=0.7, edgecolor='black')
+    plt.title('Risk Score Distribution', fontsize=14, fontweight='bold')
+    plt.xlabel('Risk Score (0-100)', fontsize=12)
+    plt.ylabel('Number of Records', fontsize=12)
+    plt.axvline(mean_score, color='red', linestyle='--',
+                label=f'Mean: {mean_score:.1f}')
+    plt.legend()
+    plt.grid(axis='y', alpha=0.3)
+
+
+CHART_RENDERERS = {
+    'target_distribution': _plot_target_distribution,
+    'category_rates': _plot_category_rates,
+    'numeric_distribution': _plot_numeric_distribution,
+    'rate_over_time': _plot_rate_over_time,
+    'correlation_matrix': _plot_correlation_matrix,
+    'risk_distribution': _plot_risk_distribution,
+}
+
+
+def render_chart(job, profile=RENDER_PROFILES[DEFAULT_RENDER_PROFILE]):
+    """Render one chart job in memory and return (key, image bytes)"""
+    CHART_RENDERERS[job['renderer']](**job['data'])
+    plt.tight_layout()
+    buffer = io.BytesIO()
+    # A tight bounding box costs an extra draw pass; simplified charts skip it
+    plt.savefig(buffer, format=profile['format'], dpi=profile['dpi'],
+                bbox_inches=None if profile['simplified'] else 'tight', facecolor='white',
+                pil_kwargs=profile['pil_kwargs'])
+    plt.close()
+    return job['key'], buffer.getvalue()
+
+
 class GenericMLReportGenerator:
     """
     A flexible report generator that adapts to any dataset and prediction model
     """
     
-    def __init__(self, df, target_column, model_name="ML Model", positive_class=None):
+    def __init__(self, df, target_column, model_name="ML Model", positive_class=None, chart_workers=None,
+                 render_profile=DEFAULT_RENDER_PROFILE, cache=None, data_hash=None,
+                 include_record_listing=False):
         """
         Initialize the report generator
         
@@ -35,10 +176,29 @@ class GenericMLReportGenerator:
             target_column: Name of the target/prediction column
             model_name: Name of the ML model/use case (e.g., "Attrition Prediction", "Churn Prediction")
             positive_class: The positive class value (e.g., "Yes", 1, True)
+            chart_workers: Processes used to render charts (None = one per CPU, 1 = render inline)
+            render_profile: Chart quality profile, one of RENDER_PROFILES ('draft', 'standard', 'print')
+            cache: Optional ReportCache for reusing charts and tables across runs
+            data_hash: Content hash of the dataset, required for `cache` to be used
+            include_record_listing: Append a per-record risk score table covering every row
         """
+        if render_profile not in RENDER_PROFILES:
+            raise ValueError(f"Unknown render profile '{render_profile}'. "
+                             f"Available: {', '.join(RENDER_PROFILES)}")
+                             
         self.df = df.copy()
         self.target_column = target_column
         self.model_name = model_name
+        self.chart_workers = chart_workers
+        self.render_profile = render_profile
+        self.render_settings = RENDER_PROFILES[render_profile]
+        self.include_record_listing = include_record_listing
+        self.charts = {}
+        self.risk_scores = None
+        self.analysis = None
+        self.correlation_summary = None
+        # Large tables written while saving: placeholder marker -> (columns, row chunks)
+        self.streamed_tables = {}
         
         # Auto-detect positive class if not provided
         if positive_class is None:
@@ -68,11 +228,42 @@ class GenericMLReportGenerator:
         if target_column in self.categorical_cols:
             self.categorical_cols.remove(target_column)
         
-        # Calculate positive rate
-        self.positive_rate = (df[target_column] == self.positive_class).mean()
+        # Shared statistics layer (positive indicator, group rates, numeric summaries)
+        self.stats = ReportStatistics(self.df, target_column, self.positive_class, self.numeric_cols)
+        self.positive_rate = self.stats.positive_rate
+        
+        # Sections are cached per data/target/positive class/profile; the model name only affects text
+        self.cache = cache if data_hash is not None else None
+        self.cache_key = (
+            report_fingerprint(data_hash, target_column, self.positive_class, render_profile)
+            if self.cache else None
+        )
+        
+    def create_report(self, output_path, output_format='docx'):
+        """
+        Generate the complete report
+        
+        Args:
+            output_path: Where to write the report
+            output_format: 'docx' (charts rendered with matplotlib), 'html' (inline SVG charts)
+                           or 'json' (the analyze() sections for the dashboard to draw)
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{output_format}'. "
+                             f"Available: {', '.join(OUTPUT_FORMATS)}")
+                             
+        self._load_cached_tables()
+        if output_format != 'docx':
+            render = render_json if output_format == 'json' else render_html
+            render(self.analyze(), output_path)
+            self._store_cached_tables()
+            print(f"Report generated successfully: {output_path}", file=sys.stderr)
+            return
+            
+        # Render every chart up front (in parallel), then assemble the document
+        self._compute_risk_scores()
+        self.charts = self.build_charts()
         
-    def create_report(self, output_path):
-        """Generate the complete report"""
         doc = Document()
         
         # Cover Page
@@ -118,10 +309,15 @@ class GenericMLReportGenerator:
         # Appendices
         self._add_appendices(doc)
         
+        if self.include_record_listing:
+            self._add_record_listing(doc)
+            
+        self._store_cached_tables()
+        
         # Add headers
         self._add_page_headers(doc)
         
-        doc.save(output_path)
+        save_with_streamed_tables(doc, output_path, self.streamed_tables)
         print(f"Report generated successfully: {output_path}", file=sys.stderr)
         
     def _add_cover_page(self, doc):
@@ -174,7 +370,7 @@ class GenericMLReportGenerator:
         Key Highlights:
         • Overall {self.target_column} rate: {self.positive_rate*100:.1f}%
         • Total features analyzed: {len(self.numeric_cols) + len(self.categorical_cols)}
-        • Data quality: {(1 - self.df.isnull().sum().sum()/(self.df.shape[0]*self.df.shape[1]))*100:.1f}% complete
+        • Data quality: {self._completeness():.1f}% complete
         
         This analysis provides actionable insights through statistical analysis, visualization,
         and predictive scoring to support data-driven decision making.
@@ -196,21 +392,7 @@ class GenericMLReportGenerator:
         hdr_cells[1].text = 'Value'
         hdr_cells[2].text = 'Status'
         
-        total_missing = self.df.isnull().sum().sum()
-        missing_pct = (total_missing / (self.df.shape[0] * self.df.shape[1])) * 100
-        completeness = 100 - missing_pct
-        
-        quality_stats = [
-            ('Total Records', f"{len(self.df):,}", 'Complete'),
-            ('Total Missing Values', f"{total_missing:,} ({missing_pct:.1f}%)", 
-             'Excellent' if missing_pct < 1 else 'Good' if missing_pct < 5 else 'Needs Attention'),
-            ('Data Completeness', f"{completeness:.1f}%", 
-             'Excellent' if completeness > 99 else 'Good' if completeness > 95 else 'Acceptable'),
-            ('Numeric Features', f"{len(self.numeric_cols)}", 'Available'),
-            ('Categorical Features', f"{len(self.categorical_cols)}", 'Available')
-        ]
-        
-        for metric, value, status in quality_stats:
+        for metric, value, status in self._quality_metrics():
             row_cells = quality_table.add_row().cells
             row_cells[0].text = metric
             row_cells[1].text = value
@@ -226,68 +408,327 @@ class GenericMLReportGenerator:
         hdr_cells[0].text = 'KPI'
         hdr_cells[1].text = 'Value'
         
+        for kpi, value in self._kpis():
+            row_cells = kpi_table.add_row().cells
+            row_cells[0].text = kpi
+            row_cells[1].text = value
+            
+    def _completeness(self):
+        """Percentage of non-missing cells"""
+        return (1 - self.df.isnull().sum().sum()/(self.df.shape[0]*self.df.shape[1]))*100
+        
+    def _quality_metrics(self):
+        """Data quality table rows: (metric, value, status)"""
+        total_missing = self.df.isnull().sum().sum()
+        missing_pct = (total_missing / (self.df.shape[0] * self.df.shape[1])) * 100
+        completeness = 100 - missing_pct
+        
+        return [
+            ('Total Records', f"{len(self.df):,}", 'Complete'),
+            ('Total Missing Values', f"{total_missing:,} ({missing_pct:.1f}%)", 
+             'Excellent' if missing_pct < 1 else 'Good' if missing_pct < 5 else 'Needs Attention'),
+            ('Data Completeness', f"{completeness:.1f}%", 
+             'Excellent' if completeness > 99 else 'Good' if completeness > 95 else 'Acceptable'),
+            ('Numeric Features', f"{len(self.numeric_cols)}", 'Available'),
+            ('Categorical Features', f"{len(self.categorical_cols)}", 'Available')
+        ]
+        
+    def _kpis(self):
+        """KPI table rows: (kpi, value)"""
         kpis = [
             ('Total Records', f"{len(self.df):,}"),
-            (f'{self.target_column} - Positive Class', f"{(self.df[self.target_column] == self.positive_class).sum():,}"),
+            (f'{self.target_column} - Positive Class', f"{self.stats.positive_count:,}"),
             (f'{self.target_column} Rate', f"{self.positive_rate*100:.1f}%"),
         ]
         
         # Add numeric column stats
         for col in self.numeric_cols[:5]:  # Top 5 numeric features
-            kpis.append((f'Average {col}', f"{self.df[col].mean():.2f}"))
+            kpis.append((f'Average {col}', f"{self.stats.column_stats(col)['mean']:.2f}"))
+        return kpis
+        
+    def _target_distribution(self):
+        target_counts = self.df[self.target_column].value_counts()
+        return target_counts.index.tolist(), target_counts.values
+        
+    def _numeric_histogram(self, col):
+        """25-bin histogram of a numeric column split by class: (bin_edges, neg_counts, pos_counts)"""
+        is_positive = self.stats.is_positive
+        pos_data = self.df.loc[is_positive, col].dropna().to_numpy()
+        neg_data = self.df.loc[~is_positive, col].dropna().to_numpy()
+        bin_edges = np.histogram_bin_edges(np.concatenate([neg_data, pos_data]), bins=25)
+        return (bin_edges,
+                np.histogram(neg_data, bins=bin_edges)[0],
+                np.histogram(pos_data, bins=bin_edges)[0])
+                
+    def _large_correlation_mode(self):
+        """Wide datasets get a sampled, blocked correlation summary instead of the full matrix"""
+        return len(self.numeric_cols) > CORRELATION_LARGE_MODE_COLUMNS
+        
+    def _correlations(self):
+        """Memoized summarize_correlations() result (large correlation mode only)"""
+        if self.correlation_summary is None:
+            self.correlation_summary = summarize_correlations(
+                self.df, self.numeric_cols, self.stats.is_positive)
+        return self.correlation_summary
+        
+    def _correlation_matrix(self):
+        if self._large_correlation_mode():
+            return self._correlations()['matrix']
+        return self.df[self.numeric_cols].dropna().corr()
+        
+    def _correlation_chart_title(self):
+        if self._large_correlation_mode():
+            summary = self._correlations()
+            return (f"Feature Correlation Matrix (top {len(summary['matrix'])} of "
+                    f"{summary['total_columns']} features by {self.target_column} correlation)")
+        return 'Feature Correlation Matrix'
+        
+    def _risk_histogram(self):
+        """20-bin histogram of risk scores: (bin_edges, counts)"""
+        risk_scores = self.risk_scores.dropna().to_numpy()
+        bin_edges = np.histogram_bin_edges(risk_scores, bins=20)
+        return bin_edges, np.histogram(risk_scores, bins=bin_edges)[0]
+        
+    def analyze(self):
+        """
+        Compute every report section as plain data, independent of the output format
+        
+        Returns:
+            dict: Sections of the report (lists, numbers and strings only), memoized
+        """
+        if self.analysis is not None:
+            return self.analysis
+        if self.risk_scores is None:
+            self._compute_risk_scores()
             
-        for kpi, value in kpis:
-            row_cells = kpi_table.add_row().cells
-            row_cells[0].text = kpi
-            row_cells[1].text = value
+        labels, counts = self._target_distribution()
+        analysis = {
+            'metadata': {
+                'title': f'{self.model_name} Analysis Report',
+                'model_name': self.model_name,
+                'target_column': self.target_column,
+                'positive_class': str(self.positive_class),
+                'generated_at': datetime.now().isoformat(),
+                'records': len(self.df),
+                'features_analyzed': len(self.numeric_cols) + len(self.categorical_cols)
+            },
+            'executive_summary': {
+                'records': len(self.df),
+                'positive_count': self.stats.positive_count,
+                'positive_rate': float(self.positive_rate),
+                'completeness': float(self._completeness())
+            },
+            'data_quality': [
+                {'metric': metric, 'value': value, 'status': status}
+                for metric, value, status in self._quality_metrics()
+            ],
+            'kpis': [{'kpi': kpi, 'value': value} for kpi, value in self._kpis()],
+            'target_distribution': {
+                'labels': [str(label) for label in labels],
+                'counts': [int(count) for count in counts]
+            },
+            'categorical': [],
+            'numerical': [],
+            'temporal': [],
+            'correlation': None,
+            'recommendations': self._build_recommendations(),
+            'numeric_summary': []
+        }
+        
+        if self.categorical_cols:
+            for col in self._categorical_analysis_columns():
+                rates = self.stats.category_rates(col).sort_values(ascending=False)
+                analysis['categorical'].append({
+                    'column': col,
+                    'labels': [str(label) for label in rates.index],
+                    'rates': rates.astype(float).tolist()
+                })
+                
+        for col in self.numeric_cols[:5]:
+            bin_edges, neg_counts, pos_counts = self._numeric_histogram(col)
+            col_stats = self.stats.column_stats(col)
+            analysis['numerical'].append({
+                'column': col,
+                'stats': {key: float(col_stats[key]) for key in ('mean', 'median', 'std', 'min', 'max')},
+                'bin_edges': bin_edges.tolist(),
+                'negative_counts': neg_counts.tolist(),
+                'positive_counts': pos_counts.tolist()
+            })
+            
+        for date_col in self.date_cols[:3]:
+            rates = self.stats.period_rates(date_col, 'M')
+            analysis['temporal'].append({
+                'column': date_col,
+                'periods': [str(period) for period in rates.index],
+                'rates': rates.astype(float).tolist()
+            })
+            
+        if len(self.numeric_cols) > 1:
+            corr_matrix = self._correlation_matrix()
+            analysis['correlation'] = {
+                'title': self._correlation_chart_title(),
+                'columns': [str(col) for col in corr_matrix.columns],
+                'matrix': corr_matrix.to_numpy().tolist()
+            }
+            if self._large_correlation_mode():
+                summary = self._correlations()
+                analysis['correlation'].update({
+                    'total_columns': summary['total_columns'],
+                    'rows_used': summary['rows_used'],
+                    'sampled': summary['sampled'],
+                    'top_pairs': [
+                        {'feature_a': str(a), 'feature_b': str(b), 'correlation': r}
+                        for a, b, r in summary['top_pairs']
+                    ],
+                    'target_correlations': [
+                        {'feature': str(col), 'correlation': float(r)}
+                        for col, r in summary['target_correlations'].head(len(summary['top_pairs'])).items()
+                    ]
+                })
+            
+        bin_edges, counts = self._risk_histogram()
+        analysis['risk_scores'] = {
+            'bin_edges': bin_edges.tolist(),
+            'counts': counts.tolist(),
+            'mean': float(self.risk_scores.mean())
+        }
+        
+        summary = self.stats.numeric_summary
+        for col in self.numeric_cols[:10]:
+            analysis['numeric_summary'].append({
+                'feature': col,
+                **{key: float(summary.at[col, key]) for key in ('mean', 'std', 'min', 'max')},
+                'missing': int(summary.at[col, 'missing'])
+            })
+            
+        self.analysis = analysis
+        return analysis
+        
+    def _categorical_analysis_columns(self):
+        """Top categorical features with a chartable number of categories"""
+        return [col for col in self.categorical_cols[:5] if self.df[col].nunique() <= 50]
+        
+    def prepare_charts(self, cached=None):
+        """
+        Compute the data for every chart in the report
+        
+        Args:
+            cached: Optional dict filled with chart key -> image bytes for charts found
+                    in the report cache; their data is not computed
+                    
+        Returns:
+            list: Chart jobs ({'key', 'renderer', 'data'}) for render_charts()
+        """
+        jobs = []
+        
+        def add_job(key, renderer, make_data):
+            if self.cache and cached is not None:
+                image = self.cache.get(self.cache_key, f'chart-{key}')
+                if image is not None:
+                    cached[key] = image
+                    return
+            jobs.append({'key': key, 'renderer': renderer, 'data': make_data()})
+            
+        # Target distribution
+        def target_data():
+            labels, counts = self._target_distribution()
+            return dict(labels=labels, counts=counts, target_column=self.target_column)
+        add_job('target_distribution', 'target_distribution', target_data)
+        
+        # Rates by category
+        if self.categorical_cols:
+            for col in self._categorical_analysis_columns():
+                add_job(f'cat_{col}', 'category_rates', lambda col=col: dict(
+                    category_rates=self.stats.category_rates(col).sort_values(ascending=False),
+                    col=col, target_column=self.target_column))
+                    
+        # Numeric distributions split by class
+        def numeric_data(col):
+            bin_edges, neg_counts, pos_counts = self._numeric_histogram(col)
+            return dict(bin_edges=bin_edges, neg_counts=neg_counts, pos_counts=pos_counts,
+                        col=col, target_column=self.target_column)
+        for col in self.numeric_cols[:5]:
+            add_job(f'num_{col}', 'numeric_distribution', lambda col=col: numeric_data(col))
+            
+        # Rates over time
+        if self.date_cols:
+            for date_col in self.date_cols[:3]:
+                add_job(f'temporal_{date_col}', 'rate_over_time', lambda date_col=date_col: dict(
+                    period_rates=self.stats.period_rates(date_col, 'M'), target_column=self.target_column))
+                    
+        # Correlation matrix
+        if len(self.numeric_cols) > 1:
+            add_job('correlation', 'correlation_matrix', lambda: dict(
+                corr_matrix=self._correlation_matrix(),
+                annot=not (self.render_settings['simplified'] or self._large_correlation_mode()),
+                title=self._correlation_chart_title()))
+                
+        # Risk score distribution
+        def risk_data():
+            bin_edges, counts = self._risk_histogram()
+            return dict(bin_edges=bin_edges, counts=counts, mean_score=float(self.risk_scores.mean()))
+        add_job('risk_scores', 'risk_distribution', risk_data)
+        
+        return jobs
+        
+    def build_charts(self):
+        """Charts for the report: cached images plus newly rendered ones"""
+        cached = {}
+        rendered = self.render_charts(self.prepare_charts(cached))
+        if self.cache:
+            for key, image in rendered.items():
+                self.cache.put(self.cache_key, f'chart-{key}', image)
+            print(f"Report cache: reused {len(cached)} of {len(cached) + len(rendered)} charts",
+                  file=sys.stderr)
+        return {**cached, **rendered}
+        
+    def _load_cached_tables(self):
+        """Reuse the numeric summary table from an earlier run on the same data"""
+        if not self.cache:
+            return
+        summary = self.cache.get(self.cache_key, 'numeric_summary.json')
+        if summary is not None:
+            # Keep labels such as '1e5' as written and the statistics as floats
+            self.stats.numeric_summary = pd.read_json(io.StringIO(summary.decode()), orient='split',
+                                                      convert_axes=False, dtype=False)
+            
+    def _store_cached_tables(self):
+        if not self.cache or not self.numeric_cols:
+            return
+        if not self.cache.contains(self.cache_key, 'numeric_summary.json'):
+            self.cache.put(self.cache_key, 'numeric_summary.json',
+                           self.stats.numeric_summary.to_json(orient='split', double_precision=15).encode())
+                           
+    def render_charts(self, jobs):
+        """
+        Render chart jobs, in a process pool when there is more than one worker
+        
+        Returns:
+            dict: Chart key -> image bytes (held per generator, so concurrent reports never share files)
+        """
+        render = partial(render_chart, profile=self.render_settings)
+        workers = self.chart_workers or min(len(jobs), os.cpu_count() or 1)
+        if workers <= 1 or len(jobs) <= 1:
+            return dict(render(job) for job in jobs)
+            
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return dict(pool.map(render, jobs))
             
     def _add_target_analysis(self, doc):
         """Analyze target variable distribution"""
         doc.add_heading(f'{self.target_column} Distribution Analysis', level=1)
         
         # Target distribution pie chart
-        plt.figure(figsize=(8, 6))
-        target_counts = self.df[self.target_column].value_counts()
-        colors = ['#3498DB', '#E74C3C', '#2ECC71', '#F39C12']
-        plt.pie(target_counts.values, labels=target_counts.index, autopct='%1.1f%%',
-                startangle=90, colors=colors[:len(target_counts)])
-        plt.title(f'{self.target_column} Distribution', fontsize=14, fontweight='bold')
-        plt.axis('equal')
-        plt.tight_layout()
-        plt.savefig('/tmp/target_distribution.png', dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
-        
-        doc.add_picture('/tmp/target_distribution.png', width=Inches(5))
+        doc.add_picture(io.BytesIO(self.charts['target_distribution']), width=Inches(5))
         
     def _add_categorical_analysis(self, doc):
         """Analyze categorical features"""
         doc.add_heading('Categorical Features Analysis', level=1)
         
         # Analyze top categorical features
-        for col in self.categorical_cols[:5]:  # Top 5 categorical features
-            if self.df[col].nunique() > 50:  # Skip if too many categories
-                continue
-                
+        for col in self._categorical_analysis_columns():
             doc.add_heading(f'{col} Analysis', level=2)
-            
-            # Calculate rates by category
-            category_rates = self.df.groupby(col)[self.target_column].apply(
-                lambda x: (x == self.positive_class).mean()
-            ).sort_values(ascending=False)
-            
-            # Plot
-            plt.figure(figsize=(10, 6))
-            category_rates.plot(kind='barh' if len(category_rates) > 5 else 'bar', 
-                              color='#9B59B6')
-            plt.title(f'{self.target_column} Rate by {col}', fontsize=14, fontweight='bold')
-            plt.ylabel(f'{self.target_column} Rate' if len(category_rates) <= 5 else col, fontsize=12)
-            plt.xlabel(col if len(category_rates) <= 5 else f'{self.target_column} Rate', fontsize=12)
-            plt.grid(axis='y' if len(category_rates) <= 5 else 'x', alpha=0.3)
-            plt.tight_layout()
-            plt.savefig(f'/tmp/cat_{col}.png', dpi=300, bbox_inches='tight', facecolor='white')
-            plt.close()
-            
-            doc.add_picture(f'/tmp/cat_{col}.png', width=Inches(6))
+            doc.add_picture(io.BytesIO(self.charts[f'cat_{col}']), width=Inches(6))
             
     def _add_numerical_analysis(self, doc):
         """Analyze numerical features"""
@@ -297,33 +738,16 @@ class GenericMLReportGenerator:
         for col in self.numeric_cols[:5]:  # Top 5 numeric features
             doc.add_heading(f'{col} Distribution', level=2)
             
-            # Distribution plot
-            plt.figure(figsize=(10, 6))
-            
-            # Create separate distributions for positive and negative classes
-            pos_data = self.df[self.df[self.target_column] == self.positive_class][col].dropna()
-            neg_data = self.df[self.df[self.target_column] != self.positive_class][col].dropna()
-            
-            plt.hist([neg_data, pos_data], bins=25, label=['Negative', 'Positive'],
-                    color=['#3498DB', '#E74C3C'], alpha=0.7)
-            plt.title(f'{col} Distribution by {self.target_column}', fontsize=14, fontweight='bold')
-            plt.xlabel(col, fontsize=12)
-            plt.ylabel('Frequency', fontsize=12)
-            plt.legend()
-            plt.grid(axis='y', alpha=0.3)
-            plt.tight_layout()
-            plt.savefig(f'/tmp/num_{col}.png', dpi=300, bbox_inches='tight', facecolor='white')
-            plt.close()
-            
-            doc.add_picture(f'/tmp/num_{col}.png', width=Inches(6))
+            doc.add_picture(io.BytesIO(self.charts[f'num_{col}']), width=Inches(6))
             
             # Add statistics
+            col_stats = self.stats.column_stats(col)
             stats_text = f"""
-            Mean: {self.df[col].mean():.2f}
-            Median: {self.df[col].median():.2f}
-            Std Dev: {self.df[col].std():.2f}
-            Min: {self.df[col].min():.2f}
-            Max: {self.df[col].max():.2f}
+            Mean: {col_stats['mean']:.2f}
+            Median: {col_stats['median']:.2f}
+            Std Dev: {col_stats['std']:.2f}
+            Min: {col_stats['min']:.2f}
+            Max: {col_stats['max']:.2f}
             """
             doc.add_paragraph(stats_text.strip())
             
@@ -333,48 +757,66 @@ class GenericMLReportGenerator:
         
         for date_col in self.date_cols[:3]:  # Analyze up to 3 date columns
             doc.add_heading(f'Trends Over Time ({date_col})', level=2)
-            
-            # Create time-based aggregations
-            temp_df = self.df.copy()
-            temp_df['year_month'] = pd.to_datetime(temp_df[date_col]).dt.to_period('M')
-            
-            monthly_rates = temp_df.groupby('year_month')[self.target_column].apply(
-                lambda x: (x == self.positive_class).mean()
-            )
-            
-            plt.figure(figsize=(12, 6))
-            monthly_rates.plot(kind='line', marker='o', linewidth=2, color='#3498DB')
-            plt.title(f'{self.target_column} Rate Over Time', fontsize=14, fontweight='bold')
-            plt.xlabel('Time Period', fontsize=12)
-            plt.ylabel(f'{self.target_column} Rate', fontsize=12)
-            plt.grid(axis='both', alpha=0.3)
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            plt.savefig(f'/tmp/temporal_{date_col}.png', dpi=300, bbox_inches='tight', facecolor='white')
-            plt.close()
-            
-            doc.add_picture(f'/tmp/temporal_{date_col}.png', width=Inches(6))
+            doc.add_picture(io.BytesIO(self.charts[f'temporal_{date_col}']), width=Inches(6))
             
     def _add_correlation_analysis(self, doc):
         """Add correlation analysis for numeric features"""
         doc.add_heading('Feature Correlation Analysis', level=1)
         
-        # Calculate correlation matrix
-        numeric_df = self.df[self.numeric_cols].dropna()
-        
-        if len(numeric_df.columns) > 1:
-            corr_matrix = numeric_df.corr()
-            
-            plt.figure(figsize=(10, 8))
-            sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', center=0,
-                       fmt='.2f', square=True, linewidths=1)
-            plt.title('Feature Correlation Matrix', fontsize=14, fontweight='bold')
-            plt.tight_layout()
-            plt.savefig('/tmp/correlation.png', dpi=300, bbox_inches='tight', facecolor='white')
-            plt.close()
+        if 'correlation' in self.charts:
+            doc.add_picture(io.BytesIO(self.charts['correlation']), width=Inches(6.5))
             
-            doc.add_picture('/tmp/correlation.png', width=Inches(6.5))
+        if len(self.numeric_cols) > 1 and self._large_correlation_mode():
+            summary = self._correlations()
+            rows_note = (f"a random sample of {summary['rows_used']:,} records" if summary['sampled']
+                         else f"all {summary['rows_used']:,} records")
+            doc.add_paragraph(
+                f"The dataset has {summary['total_columns']} numeric features, so the heatmap shows the "
+                f"{len(summary['matrix'])} most correlated with {self.target_column}, clustered so related "
+                f"features are adjacent. Correlations were computed on {rows_note}."
+            )
             
+            doc.add_heading('Strongest Feature Correlations', level=2)
+            pairs_table = doc.add_table(rows=1, cols=3)
+            pairs_table.style = 'Table Grid'
+            hdr_cells = pairs_table.rows[0].cells
+            hdr_cells[0].text = 'Feature'
+            hdr_cells[1].text = 'Feature'
+            hdr_cells[2].text = 'Correlation'
+            for col_a, col_b, corr in summary['top_pairs']:
+                row_cells = pairs_table.add_row().cells
+                row_cells[0].text = str(col_a)
+                row_cells[1].text = str(col_b)
+                row_cells[2].text = f"{corr:.3f}"
+                
+            doc.add_heading(f'Correlation with {self.target_column}', level=2)
+            target_table = doc.add_table(rows=1, cols=2)
+            target_table.style = 'Table Grid'
+            hdr_cells = target_table.rows[0].cells
+            hdr_cells[0].text = 'Feature'
+            hdr_cells[1].text = 'Correlation'
+            for col, corr in summary['target_correlations'].head(len(summary['top_pairs'])).items():
+                row_cells = target_table.add_row().cells
+                row_cells[0].text = str(col)
+                row_cells[1].text = f"{corr:.3f}"
+                
+    def _compute_risk_scores(self):
+        """Simple risk score based on correlation with target"""
+        risk_score = pd.Series(50.0, index=self.df.index)  # Base score
+        
+        # Add contributions from numeric features
+        for col in self.numeric_cols[:5]:
+            col_stats = self.stats.column_stats(col)
+            if col_stats['std'] > 0:
+                normalized = (self.df[col] - col_stats['mean']) / col_stats['std']
+                risk_score += normalized * 10
+                
+        # Normalize to 0-100
+        if risk_score.std() > 0:
+            risk_score = ((risk_score - risk_score.min()) / 
+                          (risk_score.max() - risk_score.min())) * 100
+        self.risk_scores = risk_score
+        
     def _add_risk_scoring(self, doc):
         """Add predictive risk scoring"""
         doc.add_heading('Predictive Risk Scoring', level=1)
@@ -384,49 +826,19 @@ class GenericMLReportGenerator:
             "Higher scores indicate higher likelihood of the positive outcome."
         )
         
-        # Simple risk score based on correlation with target
-        self.df['Risk_Score'] = 50  # Base score
-        
-        # Add contributions from numeric features
-        for col in self.numeric_cols[:5]:
-            if self.df[col].std() > 0:
-                normalized = (self.df[col] - self.df[col].mean()) / self.df[col].std()
-                self.df['Risk_Score'] += normalized * 10
-                
-        # Normalize to 0-100
-        if self.df['Risk_Score'].std() > 0:
-            self.df['Risk_Score'] = ((self.df['Risk_Score'] - self.df['Risk_Score'].min()) / 
-                                     (self.df['Risk_Score'].max() - self.df['Risk_Score'].min())) * 100
+        self.df['Risk_Score'] = self.risk_scores
         
         # Plot distribution
-        plt.figure(figsize=(10, 6))
-        plt.hist(self.df['Risk_Score'], bins=20, color='#E67E22', alpha=0.7, edgecolor='black')
-        plt.title('Risk Score Distribution', fontsize=14, fontweight='bold')
-        plt.xlabel('Risk Score (0-100)', fontsize=12)
-        plt.ylabel('Number of Records', fontsize=12)
-        plt.axvline(self.df['Risk_Score'].mean(), color='red', linestyle='--',
-                   label=f'Mean: {self.df["Risk_Score"].mean():.1f}')
-        plt.legend()
-        plt.grid(axis='y', alpha=0.3)
-        plt.tight_layout()
-        plt.savefig('/tmp/risk_scores.png', dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
-        
-        doc.add_picture('/tmp/risk_scores.png', width=Inches(6))
+        doc.add_picture(io.BytesIO(self.charts['risk_scores']), width=Inches(6))
         
-    def _add_recommendations(self, doc):
-        """Add strategic recommendations"""
-        doc.add_heading('Strategic Recommendations', level=1)
-        
-        # Identify high-impact features
+    def _build_recommendations(self):
+        """Strategic recommendations: dicts with priority, area, finding, action, impact"""
         recommendations = []
         
         # Check categorical features with high variance
         for col in self.categorical_cols[:3]:
             if self.df[col].nunique() < 50:
-                rates = self.df.groupby(col)[self.target_column].apply(
-                    lambda x: (x == self.positive_class).mean()
-                )
+                rates = self.stats.category_rates(col)
                 if rates.std() > 0.1:  # Significant variance
                     high_risk_cat = rates.idxmax()
                     recommendations.append({
@@ -454,6 +866,13 @@ class GenericMLReportGenerator:
                 'impact': 'Improved prediction accuracy'
             }
         ])
+        return recommendations
+        
+    def _add_recommendations(self, doc):
+        """Add strategic recommendations"""
+        doc.add_heading('Strategic Recommendations', level=1)
+        
+        recommendations = self._build_recommendations()
         
         # Create recommendations table
         rec_table = doc.add_table(rows=1, cols=5)
@@ -482,7 +901,7 @@ class GenericMLReportGenerator:
         # Numeric features summary
         if self.numeric_cols:
             doc.add_heading('Numerical Features', level=3)
-            stats_df = self.df[self.numeric_cols].describe().T
+            summary = self.stats.numeric_summary
             
             stats_table = doc.add_table(rows=1, cols=6)
             stats_table.style = 'Table Grid'
@@ -494,11 +913,11 @@ class GenericMLReportGenerator:
             for col in self.numeric_cols[:10]:  # Top 10
                 row_cells = stats_table.add_row().cells
                 row_cells[0].text = col
-                row_cells[1].text = f"{self.df[col].mean():.2f}"
-                row_cells[2].text = f"{self.df[col].std():.2f}"
-                row_cells[3].text = f"{self.df[col].min():.2f}"
-                row_cells[4].text = f"{self.df[col].max():.2f}"
-                row_cells[5].text = f"{self.df[col].isnull().sum()}"
+                row_cells[1].text = f"{summary.at[col, 'mean']:.2f}"
+                row_cells[2].text = f"{summary.at[col, 'std']:.2f}"
+                row_cells[3].text = f"{summary.at[col, 'min']:.2f}"
+                row_cells[4].text = f"{summary.at[col, 'max']:.2f}"
+                row_cells[5].text = f"{int(summary.at[col, 'missing'])}"
                 
         doc.add_heading('Appendix B: Methodology', level=2)
         methodology = f"""
@@ -518,7 +937,7 @@ class GenericMLReportGenerator:
         - Risk scoring using normalized feature values
         
         Visualization:
-        - High-resolution charts (300 DPI)
+        - Charts rendered at {self.render_settings['dpi']} DPI ({self.render_profile} profile)
         - Professional color schemes
         - Multiple chart types for different data types
         
@@ -529,6 +948,28 @@ class GenericMLReportGenerator:
         """
         doc.add_paragraph(methodology.strip())
         
+    def _add_record_listing(self, doc):
+        """Add a risk score table for every record, streamed into the document on save"""
+        doc.add_heading('Appendix C: Record-Level Risk Scores', level=2)
+        doc.add_paragraph(
+            f"All {len(self.df):,} records ordered by risk score, highest first."
+        )
+        
+        feature_cols = self.numeric_cols[:2] + self.categorical_cols[:2]
+        columns = ['Record', self.target_column, 'Risk Score'] + feature_cols
+        
+        def chunks():
+            order = np.argsort(-self.risk_scores.to_numpy(), kind='stable')
+            for start in range(0, len(order), RECORD_LISTING_CHUNK_ROWS):
+                rows = order[start:start + RECORD_LISTING_CHUNK_ROWS]
+                chunk = self.df.iloc[rows][feature_cols].copy()
+                chunk.insert(0, 'Record', rows + 1)
+                chunk.insert(1, self.target_column, self.df[self.target_column].iloc[rows].to_numpy())
+                chunk.insert(2, 'Risk Score', self.risk_scores.iloc[rows].round(1).to_numpy())
+                yield chunk
+                
+        self.streamed_tables[add_table_placeholder(doc)] = (columns, chunks())
+        
     def _add_page_headers(self, doc):
         """Add page headers"""
         for section in doc.sections:
@@ -539,7 +980,9 @@ class GenericMLReportGenerator:
 
 
 def generate_report_from_upload(file_path, target_column, model_name="Prediction Model", 
-                                positive_class=None, output_path=None):
+                                positive_class=None, output_path=None, chart_workers=None,
+                                render_profile=DEFAULT_RENDER_PROFILE, use_cache=True,
+                                include_record_listing=False, output_format='docx'):
     """
     Main function to generate report from uploaded file
     
@@ -549,31 +992,46 @@ def generate_report_from_upload(file_path, target_column, model_name="Prediction
         model_name: Name of the model (e.g., "Churn Prediction", "Fraud Detection")
         positive_class: The positive class value (auto-detected if None)
         output_path: Where to save the report (auto-generated if None)
+        chart_workers: Processes used to render charts (None = one per CPU)
+        render_profile: Chart quality profile ('draft', 'standard' or 'print')
+        use_cache: Reuse charts and tables cached by earlier reports on the same data
+        include_record_listing: Append a risk score table for every record
+        output_format: 'docx', 'html' or 'json' (html and json skip matplotlib rendering)
     """
     # Load data
-    if file_path.endswith('.csv'):
-        df = pd.read_csv(file_path)
-    else:
-        df = pd.read_excel(file_path)
+    df = load_dataframe(file_path)
     
+    # Section cache next to the generated reports (<upload dir>/reports/.cache)
+    cache = None
+    data_hash = None
+    if use_cache and REPORT_CACHE_ENABLED:
+        cache_dir = os.environ.get('PREDICTML_REPORT_CACHE_DIR') or Path(file_path).parent / 'reports' / '.cache'
+        cache = ReportCache(cache_dir)
+        data_hash = file_hash(file_path)
+        
     print(f"Loaded {len(df)} records from {file_path}", file=sys.stderr)
     print(f"Columns: {', '.join(df.columns.tolist())}", file=sys.stderr)
     
     # Generate output path if not provided
     if output_path is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = f"{model_name.replace(' ', '_')}_Report_{timestamp}.docx"
+        output_path = f"{model_name.replace(' ', '_')}_Report_{timestamp}.{output_format}"
     
     # Create report generator
     generator = GenericMLReportGenerator(
         df=df,
         target_column=target_column,
         model_name=model_name,
-        positive_class=positive_class
+        positive_class=positive_class,
+        chart_workers=chart_workers,
+        render_profile=render_profile,
+        cache=cache,
+        data_hash=data_hash,
+        include_record_listing=include_record_listing
     )
     
     # Generate report
-    generator.create_report(output_path)
+    generator.create_report(output_path, output_format=output_format)
     
     return output_path
 
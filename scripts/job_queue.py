@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+File-backed Job Queue for PredictML
+A local job queue without an external broker, shared by the resident workers
+and the Next.js API routes
+
+Each job is one JSON file named <job_id>.json that moves between the state
+directories of the queue root:
+
+    queued/   waiting to be picked up (oldest first)
+    running/  claimed by a worker
+    done/     finished successfully, with the worker's result
+    failed/   finished with an error (including timeouts and crashed workers)
+
+Moving a file with os.rename is atomic within one filesystem, so several
+worker processes can claim jobs from the same queue without a lock: exactly
+one rename of a queued file succeeds. Job files are always written to a
+temporary name first and renamed into place, so readers never see a partial
+file.
+"""
+
+import os
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+STATES = ('queued', 'running', 'done', 'failed')
+
+
+def utc_now():
+    """Current time as an ISO 8601 string"""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def parse_time(value):
+    """Parse an ISO 8601 timestamp written by utc_now() or JavaScript's toISOString()"""
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+class JobQueue:
+    """
+    Job queue stored as JSON files under `root`
+
+    Args:
+        root: Queue directory (created with its state subdirectories if missing)
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        for state in STATES:
+            (self.root / state).mkdir(parents=True, exist_ok=True)
+
+    def path(self, state, job_id):
+        return self.root / state / f'{job_id}.json'
+
+    def _write(self, path, job):
+        temp = self.root / f'.{path.name}.{os.getpid()}.tmp'
+        with open(temp, 'w') as f:
+            json.dump(job, f, default=str)
+        os.replace(temp, path)
+
+    def _read(self, path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def enqueue(self, job_id, payload):
+        """Add a job; `payload` is stored in the job file alongside the queue fields"""
+        job = {
+            'id': job_id,
+            'status': 'queued',
+            'submitted_at': utc_now(),
+            'attempts': 0,
+            **payload
+        }
+        self._write(self.path('queued', job_id), job)
+        # A resubmitted job replaces the outcome of its previous run
+        for state in ('done', 'failed'):
+            self.path(state, job_id).unlink(missing_ok=True)
+        return job
+
+    def read(self, state, job_id):
+        return self._read(self.path(state, job_id))
+
+    def find(self, job_id):
+        """Return (state, job) for a job in any state, or (None, None)"""
+        for state in STATES:
+            job = self.read(state, job_id)
+            if job is not None:
+                return state, job
+        return None, None
+
+    def jobs(self, state):
+        """Jobs in a state, oldest first"""
+        entries = []
+        for path in (self.root / state).glob('*.json'):
+            try:
+                entries.append((path.stat().st_mtime_ns, path.name, path))
+            except FileNotFoundError:
+                continue  # Moved by another process since the listing
+        jobs = (self._read(path) for _, _, path in sorted(entries))
+        return [job for job in jobs if job is not None]
+
+    def position(self, job_id):
+        """1-based position of a queued job (1 = next to run), or None"""
+        for index, job in enumerate(self.jobs('queued'), start=1):
+            if job['id'] == job_id:
+                return index
+        return None
+
+    def claim(self, worker_pid, order=None, accept=None):
+        """
+        Move the next queued job to running and return it, or None if the queue is empty
+
+        Args:
+            worker_pid: PID recorded on the job so a supervisor can time it out
+            order: Optional key function over job dicts; defaults to submission order
+            accept: Optional predicate over job dicts; jobs it rejects stay queued
+        """
+        candidates = self.jobs('queued')
+        if order is not None:
+            candidates.sort(key=order)
+        for job in candidates:
+            if accept is not None and not accept(job):
+                continue
+            running = self.path('running', job['id'])
+            try:
+                os.rename(self.path('queued', job['id']), running)
+            except FileNotFoundError:
+                continue  # Claimed by another worker
+            job = self._read(running) or job
+            job.update({
+                'status': 'running',
+                'started_at': utc_now(),
+                'worker_pid': worker_pid,
+                'attempts': job.get('attempts', 0) + 1
+            })
+            self._write(running, job)
+            return job
+        return None
+
+    def update(self, job, **fields):
+        """Record fields on a running job and return the updated job"""
+        job = dict(job, **fields)
+        self._write(self.path('running', job['id']), job)
+        return job
+
+    def finish(self, job, result=None, error=None):
+        """Move a running job to done (no error) or failed, recording the result"""
+        state = 'failed' if error is not None else 'done'
+        job = dict(job, status=state, finished_at=utc_now())
+        if result is not None:
+            job['result'] = result
+        if error is not None:
+            job['error'] = error
+        self._write(self.path(state, job['id']), job)
+        self.path('running', job['id']).unlink(missing_ok=True)
+        return job
+
+    def requeue(self, job):
+        """Put a running job back in the queue (e.g. after its worker was lost)"""
+        job = dict(job, status='queued')
+        for key in ('started_at', 'worker_pid'):
+            job.pop(key, None)
+        self._write(self.path('queued', job['id']), job)
+        self.path('running', job['id']).unlink(missing_ok=True)
+        return job
@@ -1,84 +1,329 @@
 """
 Model Inference Script
 Load trained model and make predictions
+
+Usage:
+    python model_inference.py <model_path> <input_json>
+    python model_inference.py --serve [--cache-size N] [--cache-mb MB]
+                                      [--batch-window-ms MS] [--batch-max-rows N]
+    python model_inference.py score-file <model_path> <input_path> <output_path>
+                                         [--chunksize N] [--workers N]
+
+In --serve mode the script stays resident and reads one JSON request per line
+from stdin ({"id": ..., "model_path": ..., "input_data": ...}), writing one
+JSON response per line to stdout. Loaded models are kept in an LRU cache so
+repeated predictions against the same model skip the cold start, and
+requests that arrive within a few milliseconds of each other are scored as
+one DataFrame per model.
+
+When automl_trainer.py exported a lightweight pipeline (see the model
+manifest), predictions call its predict/predict_proba directly and never
+import pycaret.classification / pycaret.regression. Set
+PREDICTML_INFERENCE_BACKEND=pycaret to force PyCaret's predict_model.
+
+score-file streams a CSV/Parquet input through the model chunk by chunk and
+writes the inputs plus prediction columns to a CSV/Parquet output, so large
+files can be scored with bounded memory.
 """
 
+import os
 import sys
 import json
+import time
+import queue
+import argparse
+import threading
+from collections import OrderedDict
 import pandas as pd
 import joblib
 from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+# Add the scripts directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from data_loader import iter_chunks
+
+DEFAULT_CACHE_SIZE = int(os.environ.get('PREDICTML_MODEL_CACHE_SIZE', 8))
+DEFAULT_CACHE_MB = int(os.environ.get('PREDICTML_MODEL_CACHE_MB', 1024))
+DEFAULT_BATCH_WINDOW_MS = float(os.environ.get('PREDICTML_BATCH_WINDOW_MS', 5))
+DEFAULT_BATCH_MAX_ROWS = int(os.environ.get('PREDICTML_BATCH_MAX_ROWS', 512))
+DEFAULT_SCORE_CHUNKSIZE = 50000
+
+# Artifacts are refused when these parts of the training-time versions differ
+# (number of leading version components that must match)
+COMPATIBLE_VERSION_PARTS = {
+    'pycaret': 1,
+    'scikit-learn': 2
+}
+SUPPORTED_MANIFEST_VERSION = 1
+
+# 'auto' uses the PyCaret-free pipeline when the trainer exported one,
+# 'lite' requires it and 'pycaret' always goes through predict_model
+INFERENCE_BACKEND = os.environ.get('PREDICTML_INFERENCE_BACKEND', 'auto')
+
+# Memory-map numpy arrays of exported pipelines read-only so several worker
+# processes serving the same model share one copy via the page cache.
+# Set PREDICTML_MMAP_MODE to an empty string to load private copies instead.
+MMAP_MODE = os.environ.get('PREDICTML_MMAP_MODE', 'r') or None
+
+class IncompatibleModelError(Exception):
+    """Raised when a model artifact cannot be loaded in this environment"""
+
+def _installed_version(name):
+    try:
+        from importlib.metadata import version
+        return version(name)
+    except Exception:
+        return None
+
+def read_model_manifest(model_path):
+    """Return the sidecar manifest written by automl_trainer.py, or None"""
+    manifest_path = Path(model_path.replace('.pkl', '') + '.json')
+    if not manifest_path.exists():
+        return None
+    with open(manifest_path) as f:
+        return json.load(f)
+
+def check_manifest_compatibility(manifest):
+    """Raise IncompatibleModelError if the artifact was built for another environment"""
+    if manifest.get('manifest_version', 0) > SUPPORTED_MANIFEST_VERSION:
+        raise IncompatibleModelError(
+            f"Model manifest version {manifest.get('manifest_version')} is newer than supported "
+            f"({SUPPORTED_MANIFEST_VERSION})"
+        )
+    
+    if manifest.get('problem_type') not in ('classification', 'regression'):
+        raise IncompatibleModelError(f"Unknown problem type in manifest: {manifest.get('problem_type')}")
+    
+    trained_versions = manifest.get('versions', {})
+    for package, parts in COMPATIBLE_VERSION_PARTS.items():
+        trained = trained_versions.get(package)
+        if not trained:
+            continue
+        installed = _installed_version(package)
+        if installed is None:
+            raise IncompatibleModelError(f"Model requires {package} {trained}, which is not installed")
+        if installed.split('.')[:parts] != trained.split('.')[:parts]:
+            raise IncompatibleModelError(
+                f"Model was trained with {package} {trained} but {installed} is installed"
+            )
+
+class LitePipelineModel:
+    """
+    A fitted pipeline exported by automl_trainer.py, scored without PyCaret
+
+    Produces the same prediction_label / prediction_score columns as
+    PyCaret's predict_model so callers do not need to know which backend
+    served the request.
+    """
+
+    def __init__(self, pipeline, problem_type, features=None, classes=None):
+        self.pipeline = pipeline
+        self.problem_type = problem_type
+        self.features = features
+        self.classes = classes
+
+    def decode_labels(self, labels):
+        """
+        Map encoded predictions back to the original class labels
+
+        PyCaret 2 pipelines predict the integer codes of the target; PyCaret 3
+        pipelines may decode them already. Only integer predictions that are
+        not class labels themselves are treated as codes.
+        """
+        labels = pd.Series(labels)
+        if self.classes is None or not pd.api.types.is_integer_dtype(labels):
+            return labels.tolist()
+        classes = pd.Series(self.classes)
+        if pd.api.types.is_integer_dtype(classes) and labels.isin(classes).all():
+            return labels.tolist()
+        if labels.min() < 0 or labels.max() >= len(classes):
+            raise ValueError(f"Model predicted class codes outside the {len(classes)} known classes")
+        return classes.iloc[labels.to_numpy()].tolist()
+
+    def predict_frame(self, df):
+        X = df.reindex(columns=self.features) if self.features else df
+        predictions = df.copy()
+        labels = self.pipeline.predict(X)
+        
+        if self.problem_type == 'classification':
+            predictions['prediction_label'] = self.decode_labels(labels)
+            if hasattr(self.pipeline, 'predict_proba'):
+                try:
+                    probabilities = self.pipeline.predict_proba(X)
+                    predictions['prediction_score'] = probabilities.max(axis=1).round(4)
+                except Exception:
+                    # Estimators such as hinge-loss SVMs expose predict_proba but cannot use it
+                    pass
+        else:
+            predictions['prediction_label'] = labels
+        
+        return predictions
+
+def load_lite_model(model_path, manifest, mmap_mode=MMAP_MODE):
+    """Load the exported joblib pipeline described in the manifest"""
+    lite_model = manifest['lite_model']
+    lite_path = Path(model_path).parent / lite_model['file']
+    pipeline = joblib.load(lite_path, mmap_mode=mmap_mode)
+    features = [feature['name'] for feature in manifest.get('features', [])]
+    return LitePipelineModel(pipeline, manifest['problem_type'], features, lite_model.get('classes'))
+
 def load_model(model_path):
     """Load trained PyCaret model"""
+    manifest = read_model_manifest(model_path)
+    if INFERENCE_BACKEND == 'lite' and not (manifest and manifest.get('lite_model')):
+        raise IncompatibleModelError(f"No lightweight pipeline was exported for {model_path}")
+    
+    if manifest is not None:
+        # Load exactly once, with the module the model was trained with
+        check_manifest_compatibility(manifest)
+        problem_type = manifest['problem_type']
+        if manifest.get('lite_model') and INFERENCE_BACKEND != 'pycaret':
+            return load_lite_model(model_path, manifest), problem_type
+        if problem_type == 'classification':
+            from pycaret.classification import load_model as load_pycaret_model
+        else:
+            from pycaret.regression import load_model as load_pycaret_model
+        return load_pycaret_model(model_path.replace('.pkl', ''), verbose=False), problem_type
+    
+    # Legacy artifacts without a manifest: probe classification, then regression
     try:
         from pycaret.classification import load_model as load_clf_model
-        return load_clf_model(model_path.replace('.pkl', '')), 'classification'
+        return load_clf_model(model_path.replace('.pkl', ''), verbose=False), 'classification'
     except:
         try:
             from pycaret.regression import load_model as load_reg_model
-            return load_reg_model(model_path.replace('.pkl', '')), 'regression'
+            return load_reg_model(model_path.replace('.pkl', ''), verbose=False), 'regression'
         except Exception as e:
             raise Exception(f"Failed to load model: {str(e)}")
 
-def make_predictions(model_path, input_data):
+class ModelCache:
+    """
+    LRU cache of loaded models keyed by model path and modification time
+
+    The size of the pickle on disk is used as the memory estimate for each
+    entry; least recently used models are evicted once either the entry
+    limit or the memory cap is exceeded.
+    """
+
+    def __init__(self, max_entries=DEFAULT_CACHE_SIZE, max_mb=DEFAULT_CACHE_MB):
+        self.max_entries = max_entries
+        self.max_bytes = max_mb * 1024 * 1024
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def total_bytes(self):
+        return sum(entry['size'] for entry in self._entries.values())
+
+    def get(self, model_path):
+        """Return (model, problem_type), loading from disk on a miss"""
+        path = str(Path(model_path).resolve())
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns)
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            entry = self._entries[key]
+            return entry['model'], entry['problem_type']
+
+        self.misses += 1
+
+        # Drop stale entries for a model file that has been overwritten
+        for stale_key in [k for k in self._entries if k[0] == path]:
+            del self._entries[stale_key]
+
+        model, problem_type = load_model(path)
+        self._entries[key] = {
+            'model': model,
+            'problem_type': problem_type,
+            'size': stat.st_size
+        }
+        self._evict()
+        return model, problem_type
+
+    def _evict(self):
+        # Always keep the most recently loaded model, even if it alone exceeds the cap
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes
+        ):
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'total_mb': round(self.total_bytes / (1024 * 1024), 2),
+            'max_mb': round(self.max_bytes / (1024 * 1024), 2),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+def to_dataframe(input_data):
+    """Convert a record dict, list of records or DataFrame to a DataFrame"""
+    if isinstance(input_data, dict):
+        return pd.DataFrame([input_data])
+    elif isinstance(input_data, list):
+        return pd.DataFrame(input_data)
+    return input_data
+
+def score_dataframe(model, problem_type, df):
+    """Run predict_model on a DataFrame and return the scored DataFrame"""
+    if isinstance(model, LitePipelineModel):
+        return model.predict_frame(df)
+    if problem_type == 'classification':
+        from pycaret.classification import predict_model
+    else:
+        from pycaret.regression import predict_model
+    return predict_model(model, data=df)
+
+def format_results(predictions, problem_type):
+    """Extract labels (and probabilities for classification) from scored rows"""
+    # Get prediction column name (usually 'prediction_label' or 'Label')
+    pred_col = 'prediction_label' if 'prediction_label' in predictions.columns else 'Label'
+    
+    results = {
+        'predictions': predictions[pred_col].tolist(),
+        'problem_type': problem_type
+    }
+    
+    # Add probabilities if available
+    if problem_type == 'classification':
+        prob_cols = [col for col in predictions.columns if col.startswith('prediction_score') or col.startswith('Score')]
+        if prob_cols:
+            results['probabilities'] = predictions[prob_cols].to_dict('records')
+    
+    return results
+
+def make_predictions(model_path, input_data, cache=None):
     """
     Make predictions using trained model
     
     Args:
         model_path: Path to saved model
         input_data: Dictionary or DataFrame with input features
+        cache: Optional ModelCache to reuse already loaded models
     
     Returns:
         dict: Predictions and probabilities
     """
     try:
         # Load model
-        model, problem_type = load_model(model_path)
-        
-        # Convert input to DataFrame if dict
-        if isinstance(input_data, dict):
-            df = pd.DataFrame([input_data])
-        elif isinstance(input_data, list):
-            df = pd.DataFrame(input_data)
+        if cache is not None:
+            model, problem_type = cache.get(model_path)
         else:
-            df = input_data
+            model, problem_type = load_model(model_path)
         
-        # Make predictions
-        if problem_type == 'classification':
-            from pycaret.classification import predict_model
-            predictions = predict_model(model, data=df)
-            
-            # Get prediction column name (usually 'prediction_label' or 'Label')
-            pred_col = 'prediction_label' if 'prediction_label' in predictions.columns else 'Label'
-            
-            results = {
-                'predictions': predictions[pred_col].tolist(),
-                'problem_type': problem_type
-            }
-            
-            # Add probabilities if available
-            prob_cols = [col for col in predictions.columns if col.startswith('prediction_score') or col.startswith('Score')]
-            if prob_cols:
-                results['probabilities'] = predictions[prob_cols].to_dict('records')
-            
-        else:  # regression
-            from pycaret.regression import predict_model
-            predictions = predict_model(model, data=df)
-            
-            # Get prediction column name (usually 'prediction_label' or 'Label')
-            pred_col = 'prediction_label' if 'prediction_label' in predictions.columns else 'Label'
-            
-            results = {
-                'predictions': predictions[pred_col].tolist(),
-                'problem_type': problem_type
-            }
+        df = to_dataframe(input_data)
+        predictions = score_dataframe(model, problem_type, df)
         
         return {
             'success': True,
-            'results': results,
+            'results': format_results(predictions, problem_type),
             'input_shape': df.shape
         }
         
@@ -89,11 +334,306 @@ def make_predictions(model_path, input_data):
             'error_type': type(e).__name__
         }
 
+class PredictionBatcher:
+    """
+    Coalesce concurrent prediction requests into vectorized predict_model calls
+
+    Requests are collected for up to `window_ms` after the first one arrives
+    (or until `max_rows` input rows are pending), grouped by model, scored as
+    one DataFrame per model and split back into per-request responses in the
+    order they were received.
+
+    A command (e.g. stats) closes the batch it arrives in and is answered
+    after the predictions queued before it, from the serving thread.
+    """
+
+    def __init__(self, cache, window_ms=DEFAULT_BATCH_WINDOW_MS, max_rows=DEFAULT_BATCH_MAX_ROWS):
+        self.cache = cache
+        self.window = window_ms / 1000.0
+        self.max_rows = max_rows
+
+    def collect(self, requests):
+        """Block for the first request, then gather more until the window closes"""
+        first = requests.get()
+        if first is None:
+            return None
+        
+        batch = [first]
+        if 'command' in first:
+            return batch
+        pending_rows = first['rows']
+        deadline = time.monotonic() + self.window
+        
+        while pending_rows < self.max_rows:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # Input closed: score what we have, then stop on the next collect()
+                requests.put(None)
+                break
+            batch.append(item)
+            if 'command' in item:
+                break
+            pending_rows += item['rows']
+        
+        return batch
+
+    def score(self, batch):
+        """Return one response per request in the batch, preserving order"""
+        responses = {}
+        groups = OrderedDict()
+        commands = []
+        for index, item in enumerate(batch):
+            if 'response' in item:
+                responses[index] = item['response']
+            elif 'command' in item:
+                commands.append(index)
+            else:
+                groups.setdefault(item['model_path'], []).append(index)
+        
+        for model_path, indices in groups.items():
+            if len(indices) == 1:
+                index = indices[0]
+                responses[index] = make_predictions(model_path, batch[index]['df'], cache=self.cache)
+                continue
+            try:
+                model, problem_type = self.cache.get(model_path)
+                frames = [batch[index]['df'] for index in indices]
+                predictions = score_dataframe(model, problem_type, pd.concat(frames, ignore_index=True))
+                
+                offset = 0
+                for index, frame in zip(indices, frames):
+                    chunk = predictions.iloc[offset:offset + len(frame)]
+                    offset += len(frame)
+                    responses[index] = {
+                        'success': True,
+                        'results': format_results(chunk, problem_type),
+                        'input_shape': frame.shape
+                    }
+            except Exception:
+                # One bad request must not fail its neighbours: score them individually
+                for index in indices:
+                    responses[index] = make_predictions(model_path, batch[index]['df'], cache=self.cache)
+        
+        # Commands come last in their batch, so they see every prediction queued before them
+        for index in commands:
+            responses[index] = {'success': True, 'cache': self.cache.stats()}
+        
+        for index, item in enumerate(batch):
+            responses[index]['id'] = item['id']
+        return [responses[index] for index in range(len(batch))]
+
+def _read_requests(stream, requests):
+    """Parse request lines from `stream` onto the `requests` queue"""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            requests.put({'id': None, 'rows': 0, 'response': {
+                'success': False, 'error': f'Invalid JSON request: {str(e)}'
+            }})
+            continue
+        
+        request_id = request.get('id')
+        if request.get('command') == 'stats':
+            requests.put({'id': request_id, 'rows': 0, 'command': 'stats'})
+        elif not request.get('model_path') or request.get('input_data') is None:
+            requests.put({'id': request_id, 'rows': 0, 'response': {
+                'success': False, 'error': 'Missing model_path or input_data'
+            }})
+        else:
+            try:
+                df = to_dataframe(request['input_data'])
+            except Exception as e:
+                requests.put({'id': request_id, 'rows': 0, 'response': {
+                    'success': False, 'error': f'Invalid input_data: {str(e)}', 'error_type': type(e).__name__
+                }})
+                continue
+            requests.put({'id': request_id, 'model_path': request['model_path'], 'df': df, 'rows': len(df)})
+    
+    requests.put(None)
+
+def serve(cache_size=DEFAULT_CACHE_SIZE, cache_mb=DEFAULT_CACHE_MB,
+          batch_window_ms=DEFAULT_BATCH_WINDOW_MS, batch_max_rows=DEFAULT_BATCH_MAX_ROWS):
+    """
+    Run as a long-lived worker using a JSON line protocol on stdin/stdout
+
+    Each request line is {"id": ..., "model_path": ..., "input_data": ...}.
+    Each response line echoes the id alongside the make_predictions() result.
+    Requests arriving within the batch window are scored together.
+    """
+    cache = ModelCache(max_entries=cache_size, max_mb=cache_mb)
+    batcher = PredictionBatcher(cache, window_ms=batch_window_ms, max_rows=batch_max_rows)
+    requests = queue.Queue()
+    
+    reader = threading.Thread(target=_read_requests, args=(sys.stdin, requests), daemon=True)
+    reader.start()
+    print(json.dumps({'type': 'ready', 'pid': os.getpid()}), file=sys.stderr, flush=True)
+    
+    while True:
+        batch = batcher.collect(requests)
+        if batch is None:
+            break
+        for response in batcher.score(batch):
+            sys.stdout.write(json.dumps(response, default=str) + '\n')
+        sys.stdout.flush()
+
+class _ChunkWriter:
+    """Append scored chunks to a CSV or Parquet output file"""
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self.is_parquet = output_path.lower().endswith('.parquet')
+        self._parquet_writer = None
+        self._wrote_header = False
+
+    def write(self, df):
+        if self.is_parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            if self._parquet_writer is None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                self._parquet_writer = pq.ParquetWriter(self.output_path, table.schema)
+            else:
+                # Cast later chunks to the first chunk's schema so the file stays consistent
+                table = pa.Table.from_pandas(df, schema=self._parquet_writer.schema, preserve_index=False)
+            self._parquet_writer.write_table(table)
+        else:
+            df.to_csv(self.output_path, mode='a' if self._wrote_header else 'w',
+                      header=not self._wrote_header, index=False)
+            self._wrote_header = True
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+# Per-process model used by score_file() pool workers
+_worker_model = None
+
+def _init_score_worker(model_path):
+    global _worker_model
+    _worker_model = load_model(model_path)
+
+def _score_chunk(df):
+    model, problem_type = _worker_model
+    return score_dataframe(model, problem_type, df)
+
+def score_file(model_path, input_path, output_path, chunksize=DEFAULT_SCORE_CHUNKSIZE, workers=1):
+    """
+    Score a CSV/Parquet file chunk by chunk and stream results to `output_path`
+
+    Memory stays bounded by the chunk size: with workers > 1 chunks are scored
+    in a process pool (each worker loads the model once) with at most two
+    chunks per worker in flight, and are written back in input order.
+
+    Args:
+        model_path: Path to saved model
+        input_path: CSV or Parquet file with input features
+        output_path: CSV or Parquet file to write inputs plus prediction columns
+        chunksize: Rows per chunk
+        workers: Number of scoring processes
+
+    Returns:
+        dict: Summary of the scoring run
+    """
+    start_time = time.time()
+    writer = _ChunkWriter(output_path)
+    rows_scored = 0
+    chunks = 0
+    
+    try:
+        # Chunks keep pandas' default dtypes: downcasting each chunk separately
+        # would give every chunk a different schema in the output file
+        if workers <= 1:
+            model, problem_type = load_model(model_path)
+            for chunk in iter_chunks(input_path, chunksize, optimize=False):
+                writer.write(score_dataframe(model, problem_type, chunk))
+                rows_scored += len(chunk)
+                chunks += 1
+        else:
+            from collections import deque
+            from concurrent.futures import ProcessPoolExecutor
+            
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_score_worker,
+                                     initargs=(model_path,)) as pool:
+                in_flight = deque()
+                for chunk in iter_chunks(input_path, chunksize, optimize=False):
+                    in_flight.append(pool.submit(_score_chunk, chunk))
+                    if len(in_flight) >= workers * 2:
+                        scored = in_flight.popleft().result()
+                        writer.write(scored)
+                        rows_scored += len(scored)
+                        chunks += 1
+                while in_flight:
+                    scored = in_flight.popleft().result()
+                    writer.write(scored)
+                    rows_scored += len(scored)
+                    chunks += 1
+        
+        return {
+            'success': True,
+            'output_path': output_path,
+            'rows_scored': rows_scored,
+            'chunks': chunks,
+            'elapsed_seconds': round(time.time() - start_time, 2)
+        }
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e),
+            'error_type': type(e).__name__,
+            'rows_scored': rows_scored
+        }
+    finally:
+        writer.close()
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--serve':
+        parser = argparse.ArgumentParser(description='Resident PredictML inference worker')
+        parser.add_argument('--serve', action='store_true')
+        parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE,
+                            help='Maximum number of models kept loaded')
+        parser.add_argument('--cache-mb', type=int, default=DEFAULT_CACHE_MB,
+                            help='Memory cap for loaded models, in MB')
+        parser.add_argument('--batch-window-ms', type=float, default=DEFAULT_BATCH_WINDOW_MS,
+                            help='How long to wait for concurrent requests to coalesce')
+        parser.add_argument('--batch-max-rows', type=int, default=DEFAULT_BATCH_MAX_ROWS,
+                            help='Score a batch as soon as this many rows are pending')
+        args = parser.parse_args()
+        serve(cache_size=args.cache_size, cache_mb=args.cache_mb,
+              batch_window_ms=args.batch_window_ms, batch_max_rows=args.batch_max_rows)
+        sys.exit(0)
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'score-file':
+        parser = argparse.ArgumentParser(description='Score a CSV/Parquet file in chunks')
+        parser.add_argument('command')
+        parser.add_argument('model_path')
+        parser.add_argument('input_path')
+        parser.add_argument('output_path')
+        parser.add_argument('--chunksize', type=int, default=DEFAULT_SCORE_CHUNKSIZE,
+                            help='Rows scored per chunk')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Number of processes scoring chunks in parallel')
+        args = parser.parse_args()
+        result = score_file(args.model_path, args.input_path, args.output_path,
+                            chunksize=args.chunksize, workers=args.workers)
+        print(json.dumps(result, indent=2))
+        sys.exit(0 if result['success'] else 1)
+
     if len(sys.argv) < 3:
         print(json.dumps({
             'success': False,
-            'error': 'Usage: python model_inference.py <model_path> <input_json>'
+            'error': 'Usage: python model_inference.py <model_path> <input_json> | --serve | score-file <model_path> <input_path> <output_path>'
         }))
         sys.exit(1)
     
@@ -122,4 +662,4 @@ def main():
         sys.exit(1)
 
 if __name__ == '__main__':
-    main()
+    main()
\ No newline at end of file
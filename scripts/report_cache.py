@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Report Section Cache for PredictML
+Stores rendered charts and computed tables of a report so regenerating a report
+for the same data only redoes the sections whose inputs changed
+
+Entries are grouped by a fingerprint of everything a cached section depends on
+(dataset contents, target column, positive class, render profile). Options that
+only change report text, such as the model name, are not part of it, so those
+reruns reuse every cached section. The cache is bounded by total size on disk
+and evicts the least recently used entries first.
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+from pathlib import Path
+
+# Bump when cached section contents change shape so old entries are ignored
+CACHE_FORMAT_VERSION = 3
+
+# Total size of cached files (default 512 MB)
+DEFAULT_MAX_MB = float(os.environ.get('PREDICTML_REPORT_CACHE_MB', '512'))
+CACHE_ENABLED = os.environ.get('PREDICTML_REPORT_CACHE', '1') != '0'
+
+
+def report_fingerprint(data_hash, target_column, positive_class, render_profile):
+    """Key for the sections of one report configuration"""
+    # Keep the type of the class label: 1 and '1' (or True and 'True') select different rows.
+    # numpy scalars are unwrapped so np.int64(1) and 1 share a key
+    if hasattr(positive_class, 'item'):
+        positive_class = positive_class.item()
+    parts = {
+        'version': CACHE_FORMAT_VERSION,
+        'data': data_hash,
+        'target_column': target_column,
+        'positive_class': [type(positive_class).__name__, repr(positive_class)],
+        'render_profile': render_profile
+    }
+    digest = hashlib.blake2b(json.dumps(parts, sort_keys=True).encode(), digest_size=16)
+    return digest.hexdigest()
+
+
+class ReportCache:
+    """
+    Disk cache of report sections, bounded by total size
+
+    Args:
+        cache_dir: Directory holding one subdirectory per fingerprint
+        max_mb: Maximum total size of cached files in MB
+    """
+
+    def __init__(self, cache_dir, max_mb=DEFAULT_MAX_MB):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, fingerprint, name):
+        safe = re.sub(r'[^A-Za-z0-9_.-]', '_', name)
+        if safe != name:
+            # Keep names that only differ in replaced characters apart
+            safe = f"{safe}-{hashlib.blake2b(name.encode(), digest_size=4).hexdigest()}"
+        return self.cache_dir / fingerprint / safe
+
+    def get(self, fingerprint, name):
+        """Cached bytes of a section, or None"""
+        path = self._path(fingerprint, name)
+        try:
+            data = path.read_bytes()
+            # Mark as recently used for eviction
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def contains(self, fingerprint, name):
+        return self._path(fingerprint, name).exists()
+
+    def put(self, fingerprint, name, data):
+        """Store section bytes, then evict old entries beyond the size limit"""
+        path = self._path(fingerprint, name)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+            temp.write_bytes(data)
+            os.replace(temp, path)
+        except OSError as e:
+            print(f"Skipping report cache write for {name}: {e}", file=sys.stderr)
+            return
+        self.evict()
+
+    def _entries(self):
+        entries = []
+        for path in self.cache_dir.glob('*/*'):
+            if path.name.endswith('.tmp'):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size_bytes(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Delete least recently used files until the cache fits in max_bytes"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            path.unlink(missing_ok=True)
+            total -= size
+            try:
+                path.parent.rmdir()  # Only succeeds once the fingerprint is empty
+            except OSError:
+                pass
+            if total <= self.max_bytes:
+                break
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Scalable Correlation Analysis for PredictML
+Correlation summaries for reports on datasets with many numeric columns
+
+The full correlation matrix grows with the square of the column count, and an
+annotated heatmap of hundreds of columns is both slow to draw and unreadable.
+For wide datasets the report instead:
+
+- computes correlations on at most `sample_rows` rows (a fixed random sample),
+- processes the columns in blocks, so only a block x block slice of the matrix
+  is held in memory at a time,
+- keeps the `top_k` most strongly correlated feature pairs and the correlation
+  of every feature with the target,
+- draws a heatmap of only the `heatmap_columns` features most correlated with
+  the target, ordered by hierarchical clustering so related features sit
+  together.
+
+Correlations use pairwise-complete observations, like DataFrame.corr(): a
+missing value only excludes its row from the pairs involving that column.
+"""
+
+import os
+import heapq
+import warnings
+import numpy as np
+import pandas as pd
+
+# Numeric columns above which the scalable mode is used
+LARGE_MODE_MIN_COLUMNS = int(os.environ.get('PREDICTML_CORRELATION_LARGE_COLUMNS', 30))
+
+# Rows used by the scalable mode (a random sample beyond this)
+DEFAULT_SAMPLE_ROWS = int(os.environ.get('PREDICTML_CORRELATION_SAMPLE_ROWS', 100000))
+
+# Columns per block of the blocked correlation computation
+BLOCK_COLUMNS = 256
+
+DEFAULT_TOP_K = 20
+DEFAULT_HEATMAP_COLUMNS = 25
+
+
+def _prepare(values):
+    """
+    Centered values with NaN replaced by 0, and the float mask of present values
+
+    The mask is None when nothing is missing, which allows the cheaper
+    complete-data formula in _block_correlation.
+    """
+    present = ~np.isnan(values)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        # Centering does not change correlations but keeps the sums below well conditioned
+        centered = values - np.nanmean(values, axis=0)
+    if present.all():
+        return centered, None
+    centered[~present] = 0.0
+    return centered, present.astype(np.float64)
+
+
+def _block_correlation(x, mx, y, my):
+    """
+    Pairwise-complete Pearson correlation between the columns of two blocks
+
+    Args:
+        x, y: Centered values with missing entries set to 0
+        mx, my: Masks of present values (1.0/0.0) for x and y, or None if complete
+
+    Returns:
+        Array of shape (x columns, y columns); NaN where undefined
+    """
+    if mx is None and my is None:
+        # No missing values: one product of the centered blocks
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = (x.T @ y) / np.outer(np.sqrt((x * x).sum(axis=0)), np.sqrt((y * y).sum(axis=0)))
+        return np.clip(corr, -1.0, 1.0)
+    mx = np.ones_like(x) if mx is None else mx
+    my = np.ones_like(y) if my is None else my
+    n = mx.T @ my
+    sum_x = x.T @ my
+    sum_y = mx.T @ y
+    sum_xx = (x * x).T @ my
+    sum_yy = mx.T @ (y * y)
+    sum_xy = x.T @ y
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = n * sum_xy - sum_x * sum_y
+        variance = (n * sum_xx - sum_x ** 2) * (n * sum_yy - sum_y ** 2)
+        corr = covariance / np.sqrt(variance)
+    corr[(n < 2) | ~(variance > 0)] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def _columns(mask, columns):
+    return None if mask is None else mask[:, columns]
+
+
+def blocked_correlation(values, block=BLOCK_COLUMNS):
+    """Full pairwise-complete correlation matrix of a 2-D float array, computed in column blocks"""
+    columns = values.shape[1]
+    centered, present = _prepare(values)
+    corr = np.empty((columns, columns))
+    for i in range(0, columns, block):
+        for j in range(i, columns, block):
+            part = _block_correlation(centered[:, i:i + block], _columns(present, slice(i, i + block)),
+                                      centered[:, j:j + block], _columns(present, slice(j, j + block)))
+            corr[i:i + block, j:j + block] = part
+            corr[j:j + block, i:i + block] = part.T
+    return corr
+
+
+def top_correlated_pairs(values, columns, top_k=DEFAULT_TOP_K, block=BLOCK_COLUMNS):
+    """
+    The `top_k` feature pairs with the largest absolute correlation
+
+    Only one block x block slice of the matrix exists at a time; each slice
+    contributes at most `top_k` candidates.
+
+    Returns:
+        list of (column_a, column_b, correlation), strongest first
+    """
+    centered, present = _prepare(values)
+    best = []
+    for i in range(0, len(columns), block):
+        for j in range(i, len(columns), block):
+            part = _block_correlation(centered[:, i:i + block], _columns(present, slice(i, i + block)),
+                                      centered[:, j:j + block], _columns(present, slice(j, j + block)))
+            strength = np.abs(part)
+            if i == j:
+                # Each pair once, without the diagonal
+                strength[np.tril_indices_from(strength)] = np.nan
+            strength = np.nan_to_num(strength, nan=-1.0)
+            flat = strength.ravel()
+            count = min(top_k, flat.size)
+            for index in np.argpartition(flat, -count)[-count:]:
+                if flat[index] < 0:
+                    continue
+                row, col = divmod(int(index), part.shape[1])
+                candidate = (float(flat[index]), columns[i + row], columns[j + col], float(part[row, col]))
+                if len(best) < top_k:
+                    heapq.heappush(best, candidate)
+                elif candidate[0] > best[0][0]:
+                    heapq.heapreplace(best, candidate)
+    return [(a, b, r) for _, a, b, r in sorted(best, key=lambda item: -item[0])]
+
+
+def target_correlations(values, target, block=BLOCK_COLUMNS):
+    """Correlation of every column of `values` with the 1-D `target` array"""
+    target_values, target_present = _prepare(np.asarray(target, dtype=np.float64).reshape(-1, 1))
+    centered, present = _prepare(values)
+    parts = [
+        _block_correlation(centered[:, i:i + block], _columns(present, slice(i, i + block)),
+                           target_values, target_present)[:, 0]
+        for i in range(0, values.shape[1], block)
+    ]
+    return np.concatenate(parts) if parts else np.empty(0)
+
+
+def cluster_order(corr):
+    """Leaf order of average-linkage clustering on 1 - |correlation|"""
+    if len(corr) < 3:
+        return np.arange(len(corr))
+    from scipy.cluster.hierarchy import leaves_list, linkage
+    from scipy.spatial.distance import squareform
+
+    distance = 1.0 - np.abs(np.nan_to_num(corr, nan=0.0))
+    np.fill_diagonal(distance, 0.0)
+    distance = (distance + distance.T) / 2
+    return leaves_list(linkage(squareform(distance, checks=False), method='average'))
+
+
+def summarize_correlations(df, numeric_cols, is_positive, sample_rows=DEFAULT_SAMPLE_ROWS,
+                           top_k=DEFAULT_TOP_K, heatmap_columns=DEFAULT_HEATMAP_COLUMNS, random_state=42):
+    """
+    Bounded-cost correlation summary of a wide dataset
+
+    Args:
+        df: DataFrame with the data
+        numeric_cols: Feature columns to correlate
+        is_positive: Boolean Series marking the positive class (the target)
+        sample_rows: Rows used at most; larger datasets are sampled
+        top_k: Number of strongest feature pairs kept
+        heatmap_columns: Features shown in the heatmap
+        random_state: Seed of the row sample
+
+    Returns:
+        dict with 'matrix' (clustered heatmap DataFrame), 'top_pairs',
+        'target_correlations' (Series, strongest first), 'rows_used', 'sampled'
+        and 'total_columns'
+    """
+    rows = df.index
+    sampled = len(rows) > sample_rows
+    if sampled:
+        rows = df.sample(n=sample_rows, random_state=random_state).index
+    values = df.loc[rows, numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    target = is_positive.loc[rows].to_numpy(dtype=np.float64)
+
+    with_target = pd.Series(target_correlations(values, target), index=numeric_cols)
+    with_target = with_target.reindex(with_target.abs().sort_values(ascending=False, na_position='last').index)
+
+    # Heatmap of the features most related to the target, clustered
+    shown = [numeric_cols.index(col) for col in with_target.index[:heatmap_columns]]
+    matrix = blocked_correlation(values[:, shown])
+    order = cluster_order(matrix)
+    names = [numeric_cols[shown[index]] for index in order]
+    matrix = pd.DataFrame(matrix[np.ix_(order, order)], index=names, columns=names)
+
+    return {
+        'matrix': matrix,
+        'top_pairs': top_correlated_pairs(values, numeric_cols, top_k=top_k),
+        'target_correlations': with_target,
+        'rows_used': len(rows),
+        'sampled': sampled,
+        'total_columns': len(numeric_cols)
+    }
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Lightweight Report Renderers for PredictML
+Write the sections computed by GenericMLReportGenerator.analyze() as JSON or as
+a self-contained HTML page
+
+Neither format uses matplotlib: JSON carries the chart data for the dashboard
+to draw, and HTML draws each chart as inline SVG built from plain strings. Both
+take the same analysis dict the DOCX report is assembled from, so the numbers
+in every format agree.
+"""
+
+import os
+import json
+import math
+from html import escape
+from pathlib import Path
+
+# Same colors as the matplotlib charts of the DOCX report
+PIE_COLORS = ['#3498DB', '#E74C3C', '#2ECC71', '#F39C12']
+NEGATIVE_COLOR = '#3498DB'
+POSITIVE_COLOR = '#E74C3C'
+CATEGORY_COLOR = '#9B59B6'
+RISK_COLOR = '#E67E22'
+
+CHART_WIDTH = 640
+CHART_HEIGHT = 320
+MARGIN_LEFT = 60
+MARGIN_BOTTOM = 40
+MARGIN_TOP = 30
+
+PAGE_STYLE = """
+body { font-family: Calibri, Arial, sans-serif; max-width: 960px; margin: 2em auto; color: #222; }
+h1 { text-align: center; }
+.subtitle { text-align: center; color: #666; }
+table { border-collapse: collapse; margin: 1em 0; }
+th, td { border: 1px solid #999; padding: 4px 8px; text-align: left; }
+th { background: #eee; }
+svg { display: block; margin: 1em 0; }
+svg text { font-family: Calibri, Arial, sans-serif; font-size: 11px; }
+"""
+
+
+def _sanitize(value):
+    """Replace NaN/inf (not valid JSON) with None"""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {key: _sanitize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_sanitize(item) for item in value]
+    return value
+
+
+def _write_atomic(output_path, text):
+    output_path = Path(output_path)
+    temp = output_path.with_name(f'.{output_path.name}.{os.getpid()}.tmp')
+    try:
+        temp.write_text(text, encoding='utf-8')
+        os.replace(temp, output_path)
+    finally:
+        temp.unlink(missing_ok=True)
+
+
+def render_json(analysis, output_path):
+    """Write the analysis sections as JSON"""
+    _write_atomic(output_path, json.dumps(_sanitize(analysis), indent=2, default=str))
+
+
+# SVG charts
+#
+# Each helper returns one <svg> element. Values are plain Python numbers from
+# the analysis dict; missing values (None/NaN) are drawn as zero.
+
+def _number(value):
+    return 0.0 if value is None or (isinstance(value, float) and not math.isfinite(value)) else float(value)
+
+
+def _svg(body, title, width=CHART_WIDTH, height=CHART_HEIGHT):
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" role="img" aria-label="{escape(title)}">'
+        f'<text x="{width / 2:.0f}" y="18" text-anchor="middle" font-weight="bold" '
+        f'style="font-size:14px">{escape(title)}</text>{body}</svg>'
+    )
+
+
+def _axes(y_max, y_format='{:.0f}', width=CHART_WIDTH, height=CHART_HEIGHT):
+    """Y axis with five gridlines and the x axis line"""
+    parts = []
+    plot_height = height - MARGIN_TOP - MARGIN_BOTTOM
+    for step in range(5):
+        value = y_max * step / 4
+        y = height - MARGIN_BOTTOM - plot_height * step / 4
+        parts.append(
+            f'<line x1="{MARGIN_LEFT}" y1="{y:.1f}" x2="{width - 10}" y2="{y:.1f}" stroke="#ddd"/>'
+            f'<text x="{MARGIN_LEFT - 6}" y="{y + 4:.1f}" text-anchor="end">{y_format.format(value)}</text>'
+        )
+    parts.append(
+        f'<line x1="{MARGIN_LEFT}" y1="{height - MARGIN_BOTTOM}" x2="{width - 10}" '
+        f'y2="{height - MARGIN_BOTTOM}" stroke="#333"/>'
+    )
+    return ''.join(parts)
+
+
+def svg_pie(labels, counts, title):
+    total = sum(counts) or 1
+    cx, cy, radius = CHART_WIDTH / 2 - 80, CHART_HEIGHT / 2 + 10, 120
+    parts = []
+    angle = -math.pi / 2
+    for index, (label, count) in enumerate(zip(labels, counts)):
+        color = PIE_COLORS[index % len(PIE_COLORS)]
+        sweep = 2 * math.pi * count / total
+        if count == total:
+            parts.append(f'<circle cx="{cx}" cy="{cy}" r="{radius}" fill="{color}"/>')
+        elif count > 0:
+            x1, y1 = cx + radius * math.cos(angle), cy + radius * math.sin(angle)
+            x2, y2 = cx + radius * math.cos(angle + sweep), cy + radius * math.sin(angle + sweep)
+            large = 1 if sweep > math.pi else 0
+            parts.append(
+                f'<path d="M{cx},{cy} L{x1:.2f},{y1:.2f} A{radius},{radius} 0 {large} 1 {x2:.2f},{y2:.2f} Z" '
+                f'fill="{color}" stroke="#fff"/>'
+            )
+        angle += sweep
+        legend_y = 60 + index * 20
+        parts.append(
+            f'<rect x="{CHART_WIDTH - 190}" y="{legend_y - 10}" width="12" height="12" fill="{color}"/>'
+            f'<text x="{CHART_WIDTH - 172}" y="{legend_y}">{escape(str(label))}: '
+            f'{count:,} ({count / total * 100:.1f}%)</text>'
+        )
+    return _svg(''.join(parts), title)
+
+
+def svg_horizontal_bars(labels, values, title, color=CATEGORY_COLOR):
+    """Horizontal bars of rates in [0, 1], labelled as percentages"""
+    values = [_number(value) for value in values]
+    bar_height = 18
+    height = MARGIN_TOP + 20 + bar_height * len(values) * 1.4
+    x0 = 160
+    plot_width = CHART_WIDTH - x0 - 70
+    v_max = max(values + [1e-12])
+    parts = []
+    for index, (label, value) in enumerate(zip(labels, values)):
+        y = MARGIN_TOP + 10 + index * bar_height * 1.4
+        width = plot_width * value / v_max
+        parts.append(
+            f'<text x="{x0 - 6}" y="{y + 13}" text-anchor="end">{escape(str(label)[:24])}</text>'
+            f'<rect x="{x0}" y="{y}" width="{width:.1f}" height="{bar_height}" fill="{color}"/>'
+            f'<text x="{x0 + width + 4:.1f}" y="{y + 13}">{value * 100:.1f}%</text>'
+        )
+    return _svg(''.join(parts), title, height=int(height))
+
+
+def svg_histogram(bin_edges, series, title):
+    """
+    Histogram drawn from precomputed counts
+
+    Args:
+        bin_edges: n + 1 bin edges
+        series: list of (label, counts, color); series are overlaid
+    """
+    y_max = max([max((_number(c) for c in counts), default=0) for _, counts, _ in series] + [1])
+    plot_width = CHART_WIDTH - MARGIN_LEFT - 10
+    plot_height = CHART_HEIGHT - MARGIN_TOP - MARGIN_BOTTOM
+    bins = max(1, len(bin_edges) - 1)
+    bar_width = plot_width / bins
+    parts = [_axes(y_max)]
+    for label, counts, color in series:
+        for index, count in enumerate(counts):
+            height = plot_height * _number(count) / y_max
+            x = MARGIN_LEFT + index * bar_width
+            y = CHART_HEIGHT - MARGIN_BOTTOM - height
+            parts.append(
+                f'<rect x="{x:.1f}" y="{y:.1f}" width="{bar_width:.1f}" height="{height:.1f}" '
+                f'fill="{color}" fill-opacity="0.6"/>'
+            )
+    # Label the first, middle and last edges
+    for index in sorted({0, bins // 2, bins}):
+        if index < len(bin_edges):
+            x = MARGIN_LEFT + index * bar_width
+            parts.append(
+                f'<text x="{x:.1f}" y="{CHART_HEIGHT - MARGIN_BOTTOM + 16}" text-anchor="middle">'
+                f'{_number(bin_edges[index]):.4g}</text>'
+            )
+    if len(series) > 1:
+        for index, (label, _, color) in enumerate(series):
+            parts.append(
+                f'<rect x="{CHART_WIDTH - 110}" y="{MARGIN_TOP + index * 18}" width="12" height="12" '
+                f'fill="{color}" fill-opacity="0.6"/>'
+                f'<text x="{CHART_WIDTH - 92}" y="{MARGIN_TOP + 10 + index * 18}">{escape(label)}</text>'
+            )
+    return _svg(''.join(parts), title)
+
+
+def svg_line(labels, values, title, color=NEGATIVE_COLOR):
+    """Line of rates in [0, 1] over ordered labels"""
+    values = [_number(value) for value in values]
+    y_max = max(values + [1e-12])
+    plot_width = CHART_WIDTH - MARGIN_LEFT - 20
+    plot_height = CHART_HEIGHT - MARGIN_TOP - MARGIN_BOTTOM
+    step = plot_width / max(1, len(values) - 1)
+    points = [
+        (MARGIN_LEFT + 10 + index * step, CHART_HEIGHT - MARGIN_BOTTOM - plot_height * value / y_max)
+        for index, value in enumerate(values)
+    ]
+    parts = [_axes(y_max, y_format='{:.0%}')]
+    parts.append(
+        f'<polyline fill="none" stroke="{color}" stroke-width="2" '
+        f'points="{" ".join(f"{x:.1f},{y:.1f}" for x, y in points)}"/>'
+    )
+    parts.extend(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="3" fill="{color}"/>' for x, y in points)
+    for index in sorted({0, len(labels) // 2, len(labels) - 1}):
+        if 0 <= index < len(labels):
+            parts.append(
+                f'<text x="{points[index][0]:.1f}" y="{CHART_HEIGHT - MARGIN_BOTTOM + 16}" '
+                f'text-anchor="middle">{escape(str(labels[index]))}</text>'
+            )
+    return _svg(''.join(parts), title)
+
+
+def _diverging_color(value):
+    """Blue (-1) to white (0) to red (+1), like the coolwarm colormap"""
+    value = max(-1.0, min(1.0, _number(value)))
+    if value >= 0:
+        r, g, b = 255, int(255 - 150 * value), int(255 - 180 * value)
+    else:
+        r, g, b = int(255 + 190 * value), int(255 + 120 * value), 255
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+
+def svg_heatmap(columns, matrix, title, annotate=True):
+    size = len(columns)
+    label_width = 120
+    cell = max(8, min(48, (CHART_WIDTH - label_width - 10) // max(1, size)))
+    width = label_width + cell * size + 10
+    height = MARGIN_TOP + label_width + cell * size
+    parts = []
+    for row, values in enumerate(matrix):
+        y = MARGIN_TOP + label_width + row * cell
+        parts.append(
+            f'<text x="{label_width - 4}" y="{y + cell / 2 + 4:.1f}" text-anchor="end">'
+            f'{escape(str(columns[row])[:18])}</text>'
+        )
+        for col, value in enumerate(values):
+            x = label_width + col * cell
+            parts.append(
+                f'<rect x="{x}" y="{y}" width="{cell}" height="{cell}" fill="{_diverging_color(value)}">'
+                f'<title>{escape(str(columns[row]))} / {escape(str(columns[col]))}: {_number(value):.2f}</title></rect>'
+            )
+            if annotate and cell >= 28:
+                parts.append(
+                    f'<text x="{x + cell / 2:.1f}" y="{y + cell / 2 + 4:.1f}" text-anchor="middle">'
+                    f'{_number(value):.2f}</text>'
+                )
+    for col, name in enumerate(columns):
+        x = label_width + col * cell + cell / 2
+        y = MARGIN_TOP + label_width - 4
+        parts.append(
+            f'<text x="{x:.1f}" y="{y}" transform="rotate(-45 {x:.1f} {y})">{escape(str(name)[:18])}</text>'
+        )
+    return _svg(''.join(parts), title, width=int(width), height=int(height))
+
+
+def _table(headers, rows):
+    head = ''.join(f'<th>{escape(str(header))}</th>' for header in headers)
+    body = ''.join(
+        '<tr>' + ''.join(f'<td>{escape(str(value))}</td>' for value in row) + '</tr>'
+        for row in rows
+    )
+    return f'<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>'
+
+
+def render_html(analysis, output_path):
+    """Write the analysis sections as a self-contained HTML page with inline SVG charts"""
+    meta = analysis['metadata']
+    summary = analysis['executive_summary']
+    target = meta['target_column']
+    parts = [
+        f'<h1>{escape(meta["title"])}</h1>',
+        f'<p class="subtitle">Generated on {escape(meta["generated_at"][:10])}</p>',
+
+        '<h2>Executive Summary</h2>',
+        f'<p>This report presents a comprehensive analysis of {summary["records"]:,} records '
+        f'for {escape(meta["model_name"])}. {summary["positive_count"]:,} records '
+        f'({summary["positive_rate"] * 100:.1f}%) belong to the positive class of '
+        f'{escape(target)}; the data is {summary["completeness"]:.1f}% complete.</p>',
+
+        '<h2>Data Overview</h2>',
+        _table(['Metric', 'Value', 'Status'],
+               [(row['metric'], row['value'], row['status']) for row in analysis['data_quality']]),
+
+        '<h2>Key Performance Indicators</h2>',
+        _table(['KPI', 'Value'], [(row['kpi'], row['value']) for row in analysis['kpis']]),
+
+        f'<h2>{escape(target)} Analysis</h2>',
+        svg_pie(analysis['target_distribution']['labels'], analysis['target_distribution']['counts'],
+                f'Distribution of {target}'),
+    ]
+
+    if analysis['categorical']:
+        parts.append('<h2>Categorical Feature Analysis</h2>')
+        for section in analysis['categorical']:
+            parts.append(svg_horizontal_bars(section['labels'], section['rates'],
+                                             f'{target} Rate by {section["column"]}'))
+
+    if analysis['numerical']:
+        parts.append('<h2>Numerical Feature Analysis</h2>')
+        for section in analysis['numerical']:
+            stats = section['stats']
+            parts.append(svg_histogram(section['bin_edges'], [
+                ('Negative', section['negative_counts'], NEGATIVE_COLOR),
+                ('Positive', section['positive_counts'], POSITIVE_COLOR)
+            ], f'{section["column"]} Distribution by {target}'))
+            parts.append(
+                f'<p>Mean: {_number(stats["mean"]):.2f}, Median: {_number(stats["median"]):.2f}, '
+                f'Std Dev: {_number(stats["std"]):.2f}, Range: {_number(stats["min"]):.2f} - '
+                f'{_number(stats["max"]):.2f}</p>'
+            )
+
+    if analysis['temporal']:
+        parts.append('<h2>Temporal Analysis</h2>')
+        for section in analysis['temporal']:
+            parts.append(svg_line(section['periods'], section['rates'], f'{target} Rate Over Time'))
+
+    correlation = analysis['correlation']
+    if correlation:
+        parts.append('<h2>Feature Correlation Analysis</h2>')
+        parts.append(svg_heatmap(correlation['columns'], correlation['matrix'], correlation['title']))
+        if correlation.get('top_pairs'):
+            parts.extend([
+                '<h3>Strongest Feature Correlations</h3>',
+                _table(['Feature', 'Feature', 'Correlation'],
+                       [(pair['feature_a'], pair['feature_b'], f'{_number(pair["correlation"]):.3f}')
+                        for pair in correlation['top_pairs']]),
+                f'<h3>Correlation with {escape(target)}</h3>',
+                _table(['Feature', 'Correlation'],
+                       [(row['feature'], f'{_number(row["correlation"]):.3f}')
+                        for row in correlation['target_correlations']]),
+            ])
+
+    risk = analysis['risk_scores']
+    parts.extend([
+        '<h2>Predictive Risk Scoring</h2>',
+        f'<p>Risk scores are calculated based on feature importance and correlation with {escape(target)}. '
+        'Higher scores indicate higher likelihood of the positive outcome.</p>',
+        svg_histogram(risk['bin_edges'], [('Records', risk['counts'], RISK_COLOR)],
+                      f'Risk Score Distribution (mean {_number(risk["mean"]):.1f})'),
+
+        '<h2>Strategic Recommendations</h2>',
+        _table(['Priority', 'Area', 'Finding', 'Recommended Action', 'Expected Impact'],
+               [(rec['priority'], rec['area'], rec['finding'], rec['action'], rec['impact'])
+                for rec in analysis['recommendations']]),
+    ])
+
+    if analysis['numeric_summary']:
+        parts.extend([
+            '<h2>Appendix A: Feature Summary Statistics</h2>',
+            _table(['Feature', 'Mean', 'Std', 'Min', 'Max', 'Missing'],
+                   [(row['feature'], f'{_number(row["mean"]):.2f}', f'{_number(row["std"]):.2f}',
+                     f'{_number(row["min"]):.2f}', f'{_number(row["max"]):.2f}', row['missing'])
+                    for row in analysis['numeric_summary']]),
+        ])
+
+    page = (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+        f'<title>{escape(meta["title"])}</title><style>{PAGE_STYLE}</style></head>'
+        f'<body>{"".join(parts)}</body></html>'
+    )
+    _write_atomic(output_path, page)
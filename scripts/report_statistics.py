@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Shared Report Statistics for PredictML
+Aggregates computed once per report and read by every report section
+
+Rates of the positive class are means of a single boolean indicator column,
+so per-category and per-period rates are vectorized groupby means instead of
+a Python function called for every group. Per-column numeric statistics are
+computed together on first use and shared by the KPI, numerical analysis,
+risk scoring and appendix sections.
+"""
+
+import warnings
+import numpy as np
+import pandas as pd
+
+# Columns of ReportStatistics.numeric_summary
+NUMERIC_STATS = ['count', 'missing', 'mean', 'std', 'min', 'max', 'median']
+
+# Numeric columns converted to a float array at a time
+NUMERIC_BLOCK_COLUMNS = 64
+
+
+class ReportStatistics:
+    """
+    Memoized statistics over a report's DataFrame
+
+    Args:
+        df: DataFrame with the data
+        target_column: Name of the target/prediction column
+        positive_class: The positive class value of the target
+        numeric_cols: Numeric feature columns summarized by numeric_summary
+    """
+
+    def __init__(self, df, target_column, positive_class, numeric_cols=None):
+        self.df = df
+        self.target_column = target_column
+        self.positive_class = positive_class
+        self.numeric_cols = list(numeric_cols) if numeric_cols is not None else []
+
+        # One boolean indicator shared by every rate computation
+        self.is_positive = (df[target_column] == positive_class).rename(target_column)
+        self.positive_count = int(self.is_positive.sum())
+        self.positive_rate = self.positive_count / len(df) if len(df) else 0.0
+
+        self._category_rates = {}
+        self._period_rates = {}
+        self._numeric_summary = None
+
+    @property
+    def numeric_summary(self):
+        """
+        Count, missing, mean, std, min, max and median of every numeric column
+
+        Computed on first access and memoized. Columns are converted to float
+        arrays in blocks and all statistics are taken from the same array, so
+        each column is read from the DataFrame once.
+
+        Returns:
+            DataFrame indexed by column name with NUMERIC_STATS as columns
+        """
+        if self._numeric_summary is None:
+            blocks = []
+            for start in range(0, len(self.numeric_cols), NUMERIC_BLOCK_COLUMNS):
+                cols = self.numeric_cols[start:start + NUMERIC_BLOCK_COLUMNS]
+                values = self.df[cols].to_numpy(dtype=np.float64, na_value=np.nan)
+                missing = np.isnan(values).sum(axis=0)
+                with warnings.catch_warnings(), np.errstate(all='ignore'):
+                    # All-missing columns yield NaN statistics
+                    warnings.simplefilter('ignore', RuntimeWarning)
+                    blocks.append(pd.DataFrame({
+                        'count': len(values) - missing,
+                        'missing': missing,
+                        'mean': np.nanmean(values, axis=0),
+                        'std': np.nanstd(values, axis=0, ddof=1),
+                        'min': np.nanmin(values, axis=0),
+                        'max': np.nanmax(values, axis=0),
+                        'median': np.nanmedian(values, axis=0)
+                    }, index=cols))
+            self._numeric_summary = (
+                pd.concat(blocks) if blocks else pd.DataFrame(columns=NUMERIC_STATS, dtype=np.float64)
+            )
+        return self._numeric_summary
+
+    @numeric_summary.setter
+    def numeric_summary(self, summary):
+        """Use a previously computed summary (e.g. from the report cache)"""
+        self._numeric_summary = summary
+
+    def column_stats(self, col):
+        """Numeric summary of one column as a dict"""
+        return self.numeric_summary.loc[col].to_dict()
+
+    def category_rates(self, col):
+        """Positive-class rate for each category of `col` (missing values excluded)"""
+        if col not in self._category_rates:
+            self._category_rates[col] = self.is_positive.groupby(
+                self.df[col], observed=True, sort=True
+            ).mean()
+        return self._category_rates[col]
+
+    def period_rates(self, date_col, freq='M'):
+        """Positive-class rate for each period (default: month) of a date column"""
+        key = (date_col, freq)
+        if key not in self._period_rates:
+            periods = pd.to_datetime(self.df[date_col]).dt.to_period(freq)
+            self._period_rates[key] = self.is_positive.groupby(periods.rename(None)).mean()
+        return self._period_rates[key]
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Report Worker Pool for PredictML
+Resident processes that generate reports from the file-backed job queue, so
+matplotlib, seaborn, pandas and python-docx are imported once instead of per
+report
+
+Usage:
+    python report_worker.py serve [--workers N] [--timeout SECONDS] [--queue-dir DIR]
+    python report_worker.py enqueue <file_path> <report_id> [options_json] [--queue-dir DIR]
+
+serve imports the report generator once and forks N workers from it. Each
+worker claims the oldest queued job, runs the same code path as
+generate_report.py and records the result in the queue. The supervisor kills
+and replaces a worker whose job exceeds the timeout (the job is marked failed)
+or that exits unexpectedly (the job is retried once). Only one supervisor runs
+per queue directory; a second one exits immediately.
+
+Jobs are normally written by /api/predictml/generate-report when
+PREDICTML_REPORT_QUEUE=1; their state is reported by
+/api/predictml/status/[reportId]. See job_queue.py for the queue layout.
+"""
+
+import os
+import sys
+import json
+import time
+import fcntl
+import signal
+import argparse
+import multiprocessing as mp
+from pathlib import Path
+
+# Add the scripts directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from job_queue import JobQueue, parse_time
+
+DEFAULT_QUEUE_DIR = os.environ.get(
+    'PREDICTML_REPORT_QUEUE_DIR',
+    str(Path(__file__).resolve().parent.parent / 'uploads' / 'report-queue')
+)
+DEFAULT_WORKERS = int(os.environ.get('PREDICTML_REPORT_WORKERS', os.cpu_count() or 1))
+DEFAULT_TIMEOUT_S = float(os.environ.get('PREDICTML_REPORT_TIMEOUT_S', 600))
+
+# Seconds between queue polls when idle, and between supervisor checks
+POLL_INTERVAL_S = 0.5
+
+# A job whose worker died is run again at most this many times in total
+MAX_ATTEMPTS = 2
+
+
+def _worker_loop(queue_dir, supervisor_pid):
+    """Claim and generate reports until asked to stop (SIGUSR1) or orphaned"""
+    from generate_report import run_report
+
+    # No shared locks with the supervisor: a worker killed mid-job must not
+    # leave anything locked, so stopping is a plain flag set by a signal
+    stopping = False
+
+    def request_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGUSR1, request_stop)
+
+    queue = JobQueue(queue_dir)
+    while not stopping and os.getppid() == supervisor_pid:
+        job = queue.claim(os.getpid())
+        if job is None:
+            time.sleep(POLL_INTERVAL_S)
+            continue
+
+        # Reports already run in parallel across workers; render each one's charts inline
+        options = dict(job.get('options') or {})
+        options.setdefault('chart_workers', 1)
+        try:
+            result = run_report(job['file_path'], job['id'], options)
+        except Exception as e:
+            result = {'success': False, 'error': str(e), 'report_id': job['id']}
+
+        if result['success']:
+            queue.finish(job, result=result)
+        else:
+            queue.finish(job, result=result, error=result.get('error', 'Report generation failed'))
+
+
+class ReportWorkerPool:
+    """
+    Supervisor for `workers` report worker processes
+
+    Args:
+        queue_dir: Queue root directory
+        workers: Number of reports generated concurrently
+        timeout: Seconds a job may run before its worker is killed
+    """
+
+    def __init__(self, queue_dir=DEFAULT_QUEUE_DIR, workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT_S):
+        self.queue = JobQueue(queue_dir)
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        # Fork from a process that already imported the report libraries
+        self.ctx = mp.get_context('fork')
+        self.stopping = False
+        self.processes = {}
+
+    def _start_worker(self):
+        process = self.ctx.Process(target=_worker_loop, args=(str(self.queue.root), os.getpid()))
+        process.start()
+        self.processes[process.pid] = process
+
+    def _running_jobs(self):
+        return {job.get('worker_pid'): job for job in self.queue.jobs('running')}
+
+    def recover(self):
+        """Requeue jobs left running by a previous supervisor"""
+        for job in self.queue.jobs('running'):
+            self._retry_or_fail(job, 'Report worker stopped before the report finished')
+
+    def _retry_or_fail(self, job, error):
+        if job.get('attempts', 0) < MAX_ATTEMPTS:
+            self.queue.requeue(job)
+        else:
+            self.queue.finish(job, error=error)
+
+    def check(self):
+        """Replace dead workers and kill workers whose job ran past the timeout"""
+        running = self._running_jobs()
+        now = time.time()
+        for pid, process in list(self.processes.items()):
+            job = running.get(pid)
+            if not process.is_alive():
+                process.join()
+                del self.processes[pid]
+                if job is not None:
+                    self._retry_or_fail(job, f'Report worker exited with code {process.exitcode}')
+                self._start_worker()
+            elif job is not None and now - parse_time(job['started_at']).timestamp() > self.timeout:
+                process.kill()
+                process.join()
+                del self.processes[pid]
+                # The worker may have finished the job just before it was killed
+                if self.queue.read('running', job['id']) is not None:
+                    self.queue.finish(job, error=f'Report generation timed out after {self.timeout:g}s')
+                self._start_worker()
+
+    def run(self):
+        """Start the workers and supervise them until SIGINT/SIGTERM"""
+        # Load matplotlib, seaborn, pandas and python-docx once, before forking
+        import generate_report  # noqa: F401
+
+        self.recover()
+        for _ in range(self.workers):
+            self._start_worker()
+
+        def request_stop(signum, frame):
+            self.stopping = True
+        signal.signal(signal.SIGINT, request_stop)
+        signal.signal(signal.SIGTERM, request_stop)
+
+        print(json.dumps({
+            'type': 'ready',
+            'pid': os.getpid(),
+            'workers': self.workers,
+            'queue_dir': str(self.queue.root)
+        }), file=sys.stderr, flush=True)
+
+        while not self.stopping:
+            self.check()
+            time.sleep(POLL_INTERVAL_S)
+
+        # Let workers finish their current report, then stop
+        for process in self.processes.values():
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGUSR1)
+        for process in self.processes.values():
+            process.join(self.timeout)
+            if process.is_alive():
+                process.kill()
+                process.join()
+
+
+def _acquire_supervisor_lock(queue_dir):
+    """Hold an exclusive lock on the queue directory, or return None if another supervisor has it"""
+    lock = open(Path(queue_dir) / 'worker.lock', 'a+')
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock.close()
+        return None
+    lock.seek(0)
+    lock.truncate()
+    lock.write(str(os.getpid()))
+    lock.flush()
+    return lock
+
+
+def serve(queue_dir=DEFAULT_QUEUE_DIR, workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT_S):
+    pool = ReportWorkerPool(queue_dir, workers=workers, timeout=timeout)
+    lock = _acquire_supervisor_lock(queue_dir)
+    if lock is None:
+        print(json.dumps({'type': 'already_running', 'queue_dir': str(queue_dir)}), file=sys.stderr)
+        return
+    try:
+        pool.run()
+    finally:
+        lock.close()
+
+
+def enqueue(file_path, report_id, options, queue_dir=DEFAULT_QUEUE_DIR):
+    """Submit a report job and return its queue entry"""
+    queue = JobQueue(queue_dir)
+    return queue.enqueue(report_id, {
+        'type': 'report',
+        'file_path': str(file_path),
+        'options': options
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resident PredictML report workers')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='Run the report worker pool')
+    serve_parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                              help='Number of reports generated concurrently')
+    serve_parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT_S,
+                              help='Seconds a report may take before its worker is killed')
+    serve_parser.add_argument('--queue-dir', default=DEFAULT_QUEUE_DIR)
+
+    enqueue_parser = subparsers.add_parser('enqueue', help='Queue a report job')
+    enqueue_parser.add_argument('file_path')
+    enqueue_parser.add_argument('report_id')
+    enqueue_parser.add_argument('options_json', nargs='?', default='{}')
+    enqueue_parser.add_argument('--queue-dir', default=DEFAULT_QUEUE_DIR)
+
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        serve(args.queue_dir, workers=args.workers, timeout=args.timeout)
+        return
+
+    try:
+        options = json.loads(args.options_json)
+    except json.JSONDecodeError:
+        print(json.dumps({'success': False, 'error': 'Invalid JSON in options argument'}))
+        sys.exit(1)
+    job = enqueue(args.file_path, args.report_id, options, queue_dir=args.queue_dir)
+    print(json.dumps({'success': True, 'report_id': job['id'], 'status': job['status'],
+                      'submitted_at': job['submitted_at']}))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Training Data Profiles for PredictML
+Compact summaries of the data a model was trained on, stored in the model
+manifest, and drift checks of new data against them
+
+Numeric columns are summarized by the share of rows in each decile of the
+training data (plus missing values), other columns by the share of their most
+frequent values. Drift is measured per column with the population stability
+index (PSI) over those bins: below 0.1 is usually read as no change, above
+0.25 as a significant shift.
+
+The target, row identifiers and date/time columns are not profiled: every new
+upload brings new IDs and later dates, which would always read as drift.
+"""
+
+import numpy as np
+import pandas as pd
+
+PROFILE_VERSION = 2
+
+# Quantile bins of numeric columns
+NUMERIC_BINS = 10
+
+# Most frequent values kept for categorical columns; the rest are pooled
+TOP_CATEGORIES = 20
+
+# Integer or text columns with at least this share of distinct values are row identifiers
+ID_UNIQUE_RATIO = 0.95
+
+# Text values checked when deciding whether a column holds dates
+DATE_SAMPLE_VALUES = 20
+
+# PSI above which a column is considered drifted
+DRIFT_PSI_THRESHOLD = 0.25
+
+# Floor for empty bins so PSI stays finite
+_MIN_SHARE = 1e-4
+
+MISSING = '__missing__'
+
+
+def _numeric_shares(values, edges):
+    values = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    present = values[~np.isnan(values)]
+    # Open-ended outer bins so new data outside the training range is counted
+    counts = np.histogram(present, bins=np.concatenate([[-np.inf], edges[1:-1], [np.inf]]))[0]
+    total = max(len(values), 1)
+    return (counts / total).tolist() + [(len(values) - len(present)) / total]
+
+
+def _category_shares(values, categories):
+    values = values.astype('object').where(values.notna(), MISSING).astype(str)
+    shares = values.value_counts(normalize=True)
+    known = [float(shares.get(category, 0.0)) for category in categories]
+    return known + [max(0.0, 1.0 - sum(known))]
+
+
+def skip_reason(values):
+    """'identifier' or 'datetime' for columns left out of profiles, else None"""
+    if pd.api.types.is_datetime64_any_dtype(values) or pd.api.types.is_timedelta64_dtype(values):
+        return 'datetime'
+    present = values.dropna()
+    if present.empty:
+        return None
+    text = pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)
+    if text:
+        sample = present.head(DATE_SAMPLE_VALUES).astype(str)
+        if pd.to_datetime(sample, errors='coerce', format='mixed').notna().all():
+            return 'datetime'
+    if (text or pd.api.types.is_integer_dtype(values)) and present.nunique() >= ID_UNIQUE_RATIO * len(present):
+        return 'identifier'
+    return None
+
+
+def _profile_column(values):
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        present = pd.to_numeric(values, errors='coerce').dropna()
+        if len(present):
+            edges = np.unique(np.quantile(present.to_numpy(dtype=np.float64), np.linspace(0, 1, NUMERIC_BINS + 1)))
+            if len(edges) > 2:
+                return {'kind': 'numeric', 'edges': edges.tolist(), 'shares': _numeric_shares(values, edges)}
+    labels = values.astype('object').where(values.notna(), MISSING).astype(str)
+    categories = labels.value_counts().index[:TOP_CATEGORIES].tolist()
+    return {'kind': 'categorical', 'categories': categories, 'shares': _category_shares(values, categories)}
+
+
+def build_training_profile(df, target_column):
+    """
+    Profile of a training DataFrame for the model manifest
+
+    Returns:
+        dict with the row count, one entry per profiled feature column, the
+        skipped columns (column -> reason) and the profile format version
+    """
+    columns, skipped = {}, {}
+    for col in df.columns:
+        if col == target_column:
+            continue
+        reason = skip_reason(df[col])
+        if reason:
+            skipped[str(col)] = reason
+        else:
+            columns[str(col)] = _profile_column(df[col])
+    return {
+        'profile_version': PROFILE_VERSION,
+        'rows': len(df),
+        'target_column': target_column,
+        'columns': columns,
+        'skipped_columns': skipped
+    }
+
+
+def population_stability_index(expected, actual):
+    """PSI between two lists of bin shares"""
+    expected = np.maximum(np.asarray(expected, dtype=np.float64), _MIN_SHARE)
+    actual = np.maximum(np.asarray(actual, dtype=np.float64), _MIN_SHARE)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def check_drift(profile, df, threshold=DRIFT_PSI_THRESHOLD):
+    """
+    Compare new data with a training profile
+
+    Returns:
+        dict: 'drifted' (bool), 'reason' (str or None), 'psi' (column -> PSI,
+        highest first) and 'drifted_columns'
+    """
+    if not profile or profile.get('profile_version') != PROFILE_VERSION:
+        return {'drifted': True, 'reason': 'No compatible training profile', 'psi': {}, 'drifted_columns': []}
+
+    columns = profile['columns']
+    by_name = {str(col): col for col in df.columns}
+    ignored = set(profile.get('skipped_columns', {})) | {str(profile.get('target_column'))}
+    missing = sorted(set(columns) - set(by_name))
+    added = sorted(
+        col for col in set(by_name) - set(columns) - ignored
+        if skip_reason(df[by_name[col]]) is None
+    )
+    if missing or added:
+        changes = [f"missing {', '.join(missing)}" if missing else '', f"new {', '.join(added)}" if added else '']
+        return {'drifted': True, 'reason': f"Columns changed ({'; '.join(c for c in changes if c)})",
+                'psi': {}, 'drifted_columns': []}
+
+    psi = {}
+    for col, column_profile in columns.items():
+        values = df[by_name[col]]
+        if column_profile['kind'] == 'numeric':
+            actual = _numeric_shares(values, np.asarray(column_profile['edges']))
+        else:
+            actual = _category_shares(values, column_profile['categories'])
+        psi[col] = round(population_stability_index(column_profile['shares'], actual), 4)
+
+    psi = dict(sorted(psi.items(), key=lambda item: -item[1]))
+    drifted_columns = [col for col, value in psi.items() if value > threshold]
+    return {
+        'drifted': bool(drifted_columns),
+        'reason': f"Distribution shift in {', '.join(drifted_columns)}" if drifted_columns else None,
+        'psi': psi,
+        'drifted_columns': drifted_columns
+    }
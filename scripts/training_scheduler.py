@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Training Scheduler for PredictML
+Runs queued automl_trainer.py jobs with a concurrency limit and per-job CPU
+core and memory reservations, so several large uploads cannot oversubscribe
+the machine
+
+Usage:
+    python training_scheduler.py serve [--max-jobs N] [--memory-mb MB] [--queue-dir DIR]
+    python training_scheduler.py enqueue <job_id> <data_path> <target_column> [options_json]
+                                 [--problem-type TYPE] [--output-dir DIR] [--queue-dir DIR]
+
+Each job's reservation is estimated from the dataset shape (rows x columns,
+read without loading the file): one core per CELLS_PER_CORE cells and a
+memory estimate of the loaded data times MEMORY_FACTOR plus the baseline of a
+PyCaret process. A job is started when fewer than max-jobs are running and
+its cores and memory are free. Waiting jobs are considered smallest first;
+a job that has waited longer than STARVATION_S goes ahead of smaller ones.
+
+Every trainer process is pinned to its reserved cores with
+os.sched_setaffinity and its n_jobs is limited to them. Progress lines of a
+running trainer are copied into its queue entry, and the admission order of
+waiting jobs is written to schedule.json after every pass so
+/api/predictml/training-status/[jobId] can report queue positions.
+
+Jobs are normally written by /api/predictml/auto-train when
+PREDICTML_TRAINING_QUEUE=1. See job_queue.py for the queue layout.
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import fcntl
+import signal
+import argparse
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add the scripts directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from job_queue import JobQueue, parse_time
+from data_loader import estimate_shape
+
+TRAINER_PATH = Path(__file__).parent / 'automl_trainer.py'
+
+DEFAULT_QUEUE_DIR = os.environ.get(
+    'PREDICTML_TRAINING_QUEUE_DIR',
+    str(Path(__file__).resolve().parent.parent / 'uploads' / 'training-queue')
+)
+DEFAULT_MAX_JOBS = int(os.environ.get('PREDICTML_TRAINING_MAX_JOBS', 2))
+
+# Memory available to training jobs (default: 80% of physical memory)
+DEFAULT_MEMORY_MB = os.environ.get('PREDICTML_TRAINING_MEMORY_MB')
+
+# Reservation estimates
+CELLS_PER_CORE = 5_000_000
+BASE_MEMORY_MB = 1024  # PyCaret, scikit-learn and the boosting libraries
+MEMORY_FACTOR = 10     # Copies made by setup(), cross-validation and the estimators
+
+# Seconds between scheduling passes
+POLL_INTERVAL_S = 1.0
+
+# Jobs waiting longer than this are started before smaller jobs
+STARVATION_S = 1800
+
+# A job whose scheduler stopped is run again at most this many times in total
+MAX_ATTEMPTS = 2
+
+
+def total_memory_mb():
+    if DEFAULT_MEMORY_MB:
+        return float(DEFAULT_MEMORY_MB)
+    return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / (1024 * 1024) * 0.8
+
+
+def estimate_reservation(job, total_cores, memory_mb):
+    """
+    CPU cores and memory to reserve for a training job
+
+    Returns:
+        dict: rows, columns, cells, cores and memory_mb (capped at the
+        machine's capacity so every job can run on its own)
+    """
+    try:
+        rows, columns = estimate_shape(job['data_path'])
+    except Exception:
+        # Unreadable files fail fast in the trainer; reserve the minimum
+        rows, columns = 0, 0
+
+    # In setup-sample mode only the sample goes through setup() and the model search
+    sample_rows = (job.get('options') or {}).get('setup_sample_rows')
+    fitted_rows = min(rows, sample_rows) if sample_rows else rows
+    cells = rows * columns
+    data_mb = cells * 8 / (1024 * 1024)
+    fitted_mb = fitted_rows * columns * 8 / (1024 * 1024)
+    return {
+        'rows': rows,
+        'columns': columns,
+        'cells': cells,
+        'cores': max(1, min(total_cores, math.ceil(cells / CELLS_PER_CORE))),
+        'memory_mb': round(min(memory_mb, BASE_MEMORY_MB + fitted_mb * MEMORY_FACTOR + data_mb * 2), 1)
+    }
+
+
+def _last_progress(log_path):
+    """Last progress line written by a trainer to its log, or None"""
+    try:
+        with open(log_path, 'rb') as f:
+            f.seek(max(0, f.seek(0, os.SEEK_END) - 8192))
+            lines = f.read().decode('utf-8', errors='replace').splitlines()
+    except OSError:
+        return None
+    for line in reversed(lines):
+        try:
+            data = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(data, dict) and data.get('type') == 'progress':
+            return data
+    return None
+
+
+class TrainingScheduler:
+    """
+    Admits queued training jobs within the machine's core and memory budget
+
+    Args:
+        queue_dir: Queue root directory
+        max_jobs: Maximum number of trainers running at once
+        memory_mb: Memory shared by running trainers
+    """
+
+    def __init__(self, queue_dir=DEFAULT_QUEUE_DIR, max_jobs=DEFAULT_MAX_JOBS, memory_mb=None):
+        self.queue = JobQueue(queue_dir)
+        self.logs_dir = self.queue.root / 'logs'
+        self.logs_dir.mkdir(exist_ok=True)
+        self.max_jobs = max(1, max_jobs)
+        self.cores = sorted(os.sched_getaffinity(0))
+        self.memory_mb = memory_mb or total_memory_mb()
+        self.stopping = False
+        # job id -> (Popen, job, reservation)
+        self.running = {}
+        self.reservations = {}
+
+    def reservation(self, job):
+        if job['id'] not in self.reservations:
+            self.reservations[job['id']] = estimate_reservation(job, len(self.cores), self.memory_mb)
+        return self.reservations[job['id']]
+
+    def starving(self, job):
+        waited = (datetime.now(timezone.utc) - parse_time(job['submitted_at'])).total_seconds()
+        return waited > STARVATION_S
+
+    def priority(self, job):
+        """Sort key of waiting jobs: starving jobs by age, then the rest smallest first"""
+        if self.starving(job):
+            return (0, 0, job['submitted_at'])
+        return (1, self.reservation(job)['cells'], job['submitted_at'])
+
+    def free_cores(self):
+        used = {core for _, _, reservation in self.running.values() for core in reservation['core_ids']}
+        return [core for core in self.cores if core not in used]
+
+    def free_memory_mb(self):
+        return self.memory_mb - sum(reservation['memory_mb'] for _, _, reservation in self.running.values())
+
+    def fits(self, job):
+        reservation = self.reservation(job)
+        return (len(self.running) < self.max_jobs
+                and len(self.free_cores()) >= reservation['cores']
+                and self.free_memory_mb() >= reservation['memory_mb'])
+
+    def recover(self):
+        """Requeue jobs left running by a previous scheduler, stopping their trainers"""
+        for job in self.queue.jobs('running'):
+            self._stop_orphan(job.get('trainer_pid'))
+            if job.get('attempts', 0) < MAX_ATTEMPTS:
+                self.queue.requeue(job)
+            else:
+                self.queue.finish(job, error='Training scheduler stopped before the job finished')
+
+    def _stop_orphan(self, pid):
+        if not pid:
+            return
+        try:
+            with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                if TRAINER_PATH.name.encode() not in f.read():
+                    return  # The PID was reused by another program
+            os.kill(pid, signal.SIGTERM)
+        except (OSError, ProcessLookupError):
+            pass
+
+    def start(self, job):
+        """Reserve cores and memory for a claimed job and start its trainer"""
+        reservation = dict(self.reservation(job))
+        reservation['core_ids'] = self.free_cores()[:reservation['cores']]
+
+        options = dict(job.get('options') or {})
+        n_jobs = options.get('n_jobs')
+        # joblib reads -1 as every core and -2 as all but one, so any value below 1 is capped too
+        if not isinstance(n_jobs, int) or not 1 <= n_jobs <= reservation['cores']:
+            options['n_jobs'] = reservation['cores']
+
+        threads = str(reservation['cores'])
+        env = dict(os.environ, OMP_NUM_THREADS=threads, OPENBLAS_NUM_THREADS=threads, MKL_NUM_THREADS=threads)
+        core_ids = set(reservation['core_ids'])
+        try:
+            with open(self.logs_dir / f"{job['id']}.log", 'w') as log, \
+                    open(self.logs_dir / f"{job['id']}.out", 'w') as output:
+                process = subprocess.Popen(
+                    [sys.executable, str(TRAINER_PATH), job['data_path'], job['target_column'],
+                     job.get('problem_type') or 'auto', job.get('output_dir') or './models', json.dumps(options)],
+                    stdout=output, stderr=log, env=env,
+                    # Pin the trainer (and the joblib workers it starts) to its cores
+                    preexec_fn=lambda: os.sched_setaffinity(0, core_ids)
+                )
+        except (OSError, ValueError, subprocess.SubprocessError) as e:
+            # Fail the job rather than leave it in running/ with nothing to collect it
+            self.reservations.pop(job['id'], None)
+            self.queue.finish(job, error=f'Could not start the trainer: {e}')
+            return
+
+        job = self.queue.update(job, trainer_pid=process.pid, reservation=reservation)
+        self.running[job['id']] = (process, job, reservation)
+
+    def check(self):
+        """Collect finished trainers, record progress and start jobs that fit"""
+        for job_id, (process, job, reservation) in list(self.running.items()):
+            if process.poll() is None:
+                progress = _last_progress(self.logs_dir / f'{job_id}.log')
+                if progress and progress.get('message') != job.get('message'):
+                    job = self.queue.update(job, progress=progress.get('progress'), message=progress.get('message'))
+                    self.running[job_id] = (process, job, reservation)
+                continue
+            del self.running[job_id]
+            self.reservations.pop(job_id, None)
+            self._finish(job, process.returncode)
+
+        while not self.stopping:
+            # Smaller jobs may overtake a waiting job that does not fit yet, unless it is starving:
+            # then nothing else starts until its cores and memory are free
+            waiting = sorted(self.queue.jobs('queued'), key=self.priority)
+            if waiting and self.starving(waiting[0]):
+                oldest = waiting[0]['id']
+                accept = lambda job: job['id'] == oldest and self.fits(job)
+            else:
+                accept = self.fits
+            job = self.queue.claim(os.getpid(), order=self.priority, accept=accept)
+            if job is None:
+                break
+            self.start(job)
+
+        self.write_schedule()
+
+    def _finish(self, job, returncode):
+        try:
+            result = json.loads((self.logs_dir / f"{job['id']}.out").read_text())
+        except (OSError, ValueError):
+            result = None
+        if returncode == 0 and result and result.get('success'):
+            self.queue.finish(job, result=result)
+        else:
+            error = (result or {}).get('error') or f'Trainer exited with code {returncode}'
+            self.queue.finish(job, result=result, error=error)
+
+    def write_schedule(self):
+        """Write the admission order of waiting jobs and the running reservations to schedule.json"""
+        waiting = sorted(self.queue.jobs('queued'), key=self.priority)
+        schedule = {
+            'updated_at': datetime.now(timezone.utc).isoformat(),
+            'queued': [
+                {'id': job['id'], 'position': index, **self.reservation(job)}
+                for index, job in enumerate(waiting, start=1)
+            ],
+            'running': [
+                {'id': job_id, 'pid': process.pid, **reservation}
+                for job_id, (process, _, reservation) in self.running.items()
+            ],
+            'capacity': {'max_jobs': self.max_jobs, 'cores': len(self.cores), 'memory_mb': round(self.memory_mb, 1)}
+        }
+        path = self.queue.root / 'schedule.json'
+        temp = self.queue.root / f'.schedule.json.{os.getpid()}.tmp'
+        temp.write_text(json.dumps(schedule, indent=2))
+        os.replace(temp, path)
+
+    def run(self):
+        """Schedule jobs until SIGINT/SIGTERM, then stop the trainers and requeue their jobs"""
+        self.recover()
+
+        def request_stop(signum, frame):
+            self.stopping = True
+        signal.signal(signal.SIGINT, request_stop)
+        signal.signal(signal.SIGTERM, request_stop)
+
+        print(json.dumps({
+            'type': 'ready',
+            'pid': os.getpid(),
+            'max_jobs': self.max_jobs,
+            'cores': len(self.cores),
+            'memory_mb': round(self.memory_mb, 1),
+            'queue_dir': str(self.queue.root)
+        }), file=sys.stderr, flush=True)
+
+        while not self.stopping:
+            self.check()
+            time.sleep(POLL_INTERVAL_S)
+
+        # Training runs for a long time; stop the trainers and run their jobs again on restart
+        for process, _, _ in self.running.values():
+            process.terminate()
+        for job_id, (process, job, _) in self.running.items():
+            process.wait()
+            self.queue.requeue(job)
+
+
+def _acquire_scheduler_lock(queue_dir):
+    """Hold an exclusive lock on the queue directory, or return None if another scheduler has it"""
+    lock = open(Path(queue_dir) / 'scheduler.lock', 'a+')
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock.close()
+        return None
+    lock.seek(0)
+    lock.truncate()
+    lock.write(str(os.getpid()))
+    lock.flush()
+    return lock
+
+
+def serve(queue_dir=DEFAULT_QUEUE_DIR, max_jobs=DEFAULT_MAX_JOBS, memory_mb=None):
+    scheduler = TrainingScheduler(queue_dir, max_jobs=max_jobs, memory_mb=memory_mb)
+    lock = _acquire_scheduler_lock(queue_dir)
+    if lock is None:
+        print(json.dumps({'type': 'already_running', 'queue_dir': str(queue_dir)}), file=sys.stderr)
+        return
+    try:
+        scheduler.run()
+    finally:
+        lock.close()
+
+
+def enqueue(job_id, data_path, target_column, options, problem_type='auto', output_dir='./models',
+            queue_dir=DEFAULT_QUEUE_DIR):
+    """Submit a training job and return its queue entry"""
+    queue = JobQueue(queue_dir)
+    return queue.enqueue(job_id, {
+        'type': 'training',
+        'data_path': str(data_path),
+        'target_column': target_column,
+        'problem_type': problem_type,
+        'output_dir': str(output_dir),
+        'options': options
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PredictML training job scheduler')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='Run the training scheduler')
+    serve_parser.add_argument('--max-jobs', type=int, default=DEFAULT_MAX_JOBS,
+                              help='Maximum number of training jobs running at once')
+    serve_parser.add_argument('--memory-mb', type=float, default=None,
+                              help='Memory shared by running jobs (default: 80%% of physical memory)')
+    serve_parser.add_argument('--queue-dir', default=DEFAULT_QUEUE_DIR)
+
+    enqueue_parser = subparsers.add_parser('enqueue', help='Queue a training job')
+    enqueue_parser.add_argument('job_id')
+    enqueue_parser.add_argument('data_path')
+    enqueue_parser.add_argument('target_column')
+    enqueue_parser.add_argument('options_json', nargs='?', default='{}')
+    enqueue_parser.add_argument('--problem-type', default='auto')
+    enqueue_parser.add_argument('--output-dir', default='./models')
+    enqueue_parser.add_argument('--queue-dir', default=DEFAULT_QUEUE_DIR)
+
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        serve(args.queue_dir, max_jobs=args.max_jobs, memory_mb=args.memory_mb)
+        return
+
+    try:
+        options = json.loads(args.options_json)
+    except json.JSONDecodeError:
+        print(json.dumps({'success': False, 'error': 'Invalid JSON in options argument'}))
+        sys.exit(1)
+    job = enqueue(args.job_id, args.data_path, args.target_column, options,
+                  problem_type=args.problem_type, output_dir=args.output_dir, queue_dir=args.queue_dir)
+    print(json.dumps({'success': True, 'job_id': job['id'], 'status': job['status'],
+                      'submitted_at': job['submitted_at']}))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,280 @@
+import sys
+import time
+import types
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+import automl_trainer
+
+
+class RecordingLogisticRegression(LogisticRegression):
+    """Remembers how many rows it was last fitted on"""
+
+    def fit(self, X, y, sample_weight=None):
+        self.fit_rows_ = len(X)
+        return super().fit(X, y, sample_weight=sample_weight)
+
+
+class LabelEncodingStep:
+    def __init__(self, encoder):
+        self.transformer = encoder
+
+
+class StubPipeline:
+    """Stands in for the PyCaret 3 preprocessing pipeline: scaling plus target label encoding"""
+
+    def __init__(self, X, y):
+        self.scaler = StandardScaler().fit(X)
+        self.encoder = LabelEncoder().fit(y)
+        self.named_steps = {'label_encoding': LabelEncodingStep(self.encoder)}
+        self.estimator = None
+
+    def transform(self, X, y=None):
+        X = pd.DataFrame(self.scaler.transform(X), columns=X.columns, index=X.index)
+        if y is None:
+            return X
+        return X, pd.Series(self.encoder.transform(y), index=y.index, name=y.name)
+
+
+def _stub_pycaret(monkeypatch, version):
+    """Minimal pycaret package with a classification module; records setup() and compare_models() calls"""
+    package = types.ModuleType('pycaret')
+    package.__version__ = version
+    module = types.ModuleType('pycaret.classification')
+    config = {}
+
+    def setup(data, target, **kwargs):
+        X, y = data.drop(columns=[target]), data[target]
+        config['pipeline'] = StubPipeline(X, y)
+        config['setup_rows'] = len(data)
+        config['setup_kwargs'] = kwargs
+        config['X_train_transformed'], config['y_train_transformed'] = config['pipeline'].transform(X, y)
+        return object()
+
+    def compare_models(**kwargs):
+        config['compare_kwargs'] = kwargs
+        return RecordingLogisticRegression().fit(config['X_train_transformed'], config['y_train_transformed'])
+
+    def save_model(model, model_name, verbose=True):
+        pipeline = config['pipeline']
+        pipeline.estimator = model
+        joblib.dump(pipeline, f'{model_name}.pkl')
+        return pipeline, f'{model_name}.pkl'
+
+    module.setup = setup
+    module.get_config = config.__getitem__
+    module.compare_models = compare_models
+    module.pull = lambda: pd.DataFrame({'Accuracy': [0.9], 'AUC': [0.95], 'F1': [0.9]})
+    module.save_model = save_model
+    package.classification = module
+    monkeypatch.setitem(sys.modules, 'pycaret', package)
+    monkeypatch.setitem(sys.modules, 'pycaret.classification', module)
+    return module, config
+
+
+def _churn(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    income = rng.normal(50000, 10000, rows)
+    return pd.DataFrame({
+        'income': income,
+        'tenure': rng.integers(0, 20, rows),
+        'churn': np.where(income + rng.normal(0, 5000, rows) > 50000, 'stay', 'leave')
+    })
+
+
+def test_setup_sample_refits_on_all_rows(monkeypatch, tmp_path):
+    _, config = _stub_pycaret(monkeypatch, '3.3.0')
+    data_path = tmp_path / 'upload_ds1.csv'
+    _churn(5000).to_csv(data_path, index=False)
+
+    result = automl_trainer.train_automl_model(
+        str(data_path), 'churn', 'classification', str(tmp_path / 'models'), {'setup_sample_rows': 1000})
+
+    assert result['success'], result.get('error')
+    assert config['setup_rows'] == result['setup_rows'] == 1000
+    assert result['training_samples'] == 5000
+    assert result['refit_rows'] == 5000
+    assert result['metrics']['metrics_source'] == 'setup_sample'
+    assert set(result['timings_s']) == {'load', 'setup', 'search', 'refit', 'total'}
+
+    saved = joblib.load(tmp_path / 'models' / 'ds1_model.pkl')
+    assert saved.estimator.fit_rows_ == 5000
+    # Encoded with the labels learned on the sample
+    assert list(saved.estimator.classes_) == [0, 1]
+    assert list(saved.encoder.classes_) == ['leave', 'stay']
+
+
+def test_setup_sample_keeps_the_resampled_model_when_fixing_imbalance(monkeypatch, tmp_path):
+    _, config = _stub_pycaret(monkeypatch, '3.3.0')
+    df = _churn(5000)
+    # 5% minority class: setup() is asked to fix the imbalance
+    df['churn'] = np.where(np.arange(len(df)) % 20 == 0, 'leave', 'stay')
+    data_path = tmp_path / 'upload_ds1.csv'
+    df.to_csv(data_path, index=False)
+
+    result = automl_trainer.train_automl_model(
+        str(data_path), 'churn', 'classification', str(tmp_path / 'models'), {'setup_sample_rows': 1000})
+
+    assert result['success'], result.get('error')
+    assert result['refit_rows'] is None
+    assert result['metrics']['metrics_source'] == 'setup_sample'
+    assert 'refit' not in result['timings_s']
+    saved = joblib.load(tmp_path / 'models' / 'ds1_model.pkl')
+    assert saved.estimator.fit_rows_ == config['setup_rows'] == 1000
+
+
+def test_pycaret3_transform_errors_are_not_hidden(monkeypatch):
+    module, config = _stub_pycaret(monkeypatch, '3.3.0')
+    module.setup(_churn(200), 'churn')
+
+    with pytest.raises(ValueError, match='tenure'):
+        automl_trainer.transform_full_data(module, _churn(300).drop(columns=['tenure']), 'churn')
+
+
+class StubPrepPipe:
+    """PyCaret 2 prep_pipe: the dtypes step holds the target labels encoded by setup()"""
+
+    def __init__(self, replacement):
+        self.named_steps = {'dtypes': types.SimpleNamespace(replacement=replacement)}
+
+    def transform(self, X):
+        return X
+
+
+def _pycaret2(monkeypatch, replacement):
+    module, config = _stub_pycaret(monkeypatch, '2.3.10')
+    config['prep_pipe'] = StubPrepPipe(replacement)
+    return module
+
+
+def test_pycaret2_reuses_setup_label_encoding(monkeypatch):
+    # setup() saw 'stay' first; a new LabelEncoder would have sorted the labels instead
+    module = _pycaret2(monkeypatch, {'stay': 0, 'leave': 1})
+    df = _churn(500)
+
+    X, y = automl_trainer.transform_full_data(module, df, 'churn')
+
+    assert list(X.columns) == ['income', 'tenure']
+    assert (y == df['churn'].map({'stay': 0, 'leave': 1})).all()
+
+
+def test_pycaret2_rejects_classes_missing_from_the_sample(monkeypatch):
+    module = _pycaret2(monkeypatch, {'stay': 0})
+
+    with pytest.raises(ValueError, match='leave'):
+        automl_trainer.transform_full_data(module, _churn(500), 'churn')
+
+
+def test_training_options_are_validated():
+    assert automl_trainer.parse_training_options(None) == automl_trainer.DEFAULT_TRAINING_OPTIONS
+    assert automl_trainer.parse_training_options({'folds': 5, 'include': None})['folds'] == 5
+
+
+@pytest.mark.parametrize('options, message', [
+    ({'time_budget_minutes': 0}, 'time_budget_minutes'),
+    ({'include': 'rf'}, 'include must be a list'),
+    ({'include': ['rf'], 'exclude': ['lr']}, 'either include or exclude'),
+    ({'folds': 1}, 'folds'),
+    ({'n_jobs': 0}, 'n_jobs'),
+    ({'max_models': 3}, 'Unknown training options: max_models')
+])
+def test_invalid_training_options_are_rejected(options, message):
+    with pytest.raises(ValueError, match=message):
+        automl_trainer.parse_training_options(options)
+
+
+def test_search_budget_is_what_is_left_of_the_deadline():
+    options = automl_trainer.parse_training_options({'exclude': ['svm']})
+
+    kwargs = automl_trainer.search_arguments(options, deadline=time.perf_counter() + 120)
+    late = automl_trainer.search_arguments(options, deadline=time.perf_counter() - 5)
+
+    assert kwargs['exclude'] == ['svm']
+    assert kwargs['budget_time'] == pytest.approx(2, abs=0.01)
+    # An exhausted budget still lets the first estimator run
+    assert late['budget_time'] == 1 / 60
+    assert 'budget_time' not in automl_trainer.search_arguments(options)
+
+
+def test_training_options_reach_pycaret(monkeypatch, tmp_path):
+    _, config = _stub_pycaret(monkeypatch, '3.3.0')
+    data_path = tmp_path / 'upload_ds1.csv'
+    _churn(500).to_csv(data_path, index=False)
+
+    result = automl_trainer.train_automl_model(
+        str(data_path), 'churn', 'classification', str(tmp_path / 'models'),
+        {'time_budget_minutes': 5, 'include': ['lr', 'rf'], 'folds': 4, 'n_jobs': 2})
+
+    assert result['success'], result.get('error')
+    assert config['setup_kwargs']['fold'] == 4 and config['setup_kwargs']['n_jobs'] == 2
+    assert config['compare_kwargs']['include'] == ['lr', 'rf']
+    assert 0 < config['compare_kwargs']['budget_time'] <= 5
+
+
+def test_stratified_sample_keeps_class_shares():
+    df = pd.DataFrame({'x': range(10000), 'label': ['rare'] * 30 + ['common'] * 9970})
+
+    sample = automl_trainer.stratified_sample(df, 'label', 1000, 'classification', min_per_stratum=5)
+
+    assert len(sample) == pytest.approx(1000, abs=5)
+    assert (sample['label'] == 'rare').sum() == 5
+    assert automl_trainer.stratified_sample(df, 'label', 20000, 'classification') is df
+
+
+def test_stratified_sample_covers_every_regression_decile():
+    df = pd.DataFrame({'price': np.random.default_rng(0).lognormal(10, 1, 5000)})
+
+    sample = automl_trainer.stratified_sample(df, 'price', 500, 'regression')
+
+    deciles = pd.qcut(df['price'], 10, labels=False)
+    assert deciles[sample.index].value_counts().tolist() == [50] * 10
+
+
+# Estimator IDs best first, as the stub compare_models ranks them
+RANKING = ['lightgbm', 'rf', 'et', 'gbc', 'lr', 'ridge', 'knn', 'nb', 'dt']
+
+
+def _halving_pycaret(monkeypatch):
+    module, config = _stub_pycaret(monkeypatch, '3.3.0')
+    rounds = []
+    setup = module.setup
+
+    def record_setup(data, target, **kwargs):
+        rounds.append({'rows': len(data), 'fold': kwargs['fold']})
+        return setup(data, target, **kwargs)
+
+    def pull():
+        compared = config['compare_kwargs'].get('include') or RANKING
+        rounds[-1]['compared'] = list(compared)
+        return pd.DataFrame({'Accuracy': 0.9}, index=[model for model in RANKING if model in compared])
+
+    module.setup = record_setup
+    module.pull = pull
+    return module, rounds
+
+
+def test_successive_halving_promotes_the_best_third(monkeypatch):
+    module, rounds = _halving_pycaret(monkeypatch)
+    options = automl_trainer.parse_training_options({'halving_min_rows': 100})
+
+    survivors = automl_trainer.successive_halving(module, _churn(1000), 'churn', 'classification', options)
+
+    assert survivors == ['lightgbm']
+    assert [entry['compared'] for entry in rounds] == [RANKING, ['lightgbm', 'rf', 'et']]
+    assert [entry['rows'] for entry in rounds] == [pytest.approx(100, abs=2), pytest.approx(300, abs=2)]
+    assert all(entry['fold'] == options['halving_folds'] for entry in rounds)
+
+
+def test_successive_halving_stops_at_the_deadline(monkeypatch):
+    module, rounds = _halving_pycaret(monkeypatch)
+    options = automl_trainer.parse_training_options({'halving_min_rows': 100, 'include': ['lr', 'rf']})
+
+    survivors = automl_trainer.successive_halving(module, _churn(1000), 'churn', 'classification', options,
+                                                  deadline=time.perf_counter() - 1)
+
+    assert survivors == ['lr', 'rf'] and rounds == []
@@ -0,0 +1,37 @@
+import json
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+from benchmark_model_memory import read_memory_kb, run_benchmark
+
+
+def test_memory_is_read_from_proc():
+    usage = read_memory_kb()
+
+    assert usage['rss_kb'] > 0
+    if sys.platform.startswith('linux'):
+        assert 0 < usage['pss_kb'] and 0 < usage['private_kb'] <= usage['rss_kb']
+
+
+def test_benchmark_reports_every_worker(tmp_path):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({'age': rng.integers(18, 80, 100), 'income': rng.normal(50000, 10000, 100)})
+    model = LogisticRegression().fit(X, X['income'] > 50000)
+    joblib.dump(model, tmp_path / 'ds1_model.joblib', compress=0)
+    (tmp_path / 'ds1_model.json').write_text(json.dumps({
+        'problem_type': 'classification',
+        'features': [{'name': 'age'}, {'name': 'income'}],
+        'lite_model': {'file': 'ds1_model.joblib', 'classes': None}
+    }))
+    X.head(5).to_csv(tmp_path / 'sample.csv', index=False)
+
+    summary = run_benchmark(str(tmp_path / 'ds1_model.pkl'), 2, 'r', str(tmp_path / 'sample.csv'))
+
+    assert summary['mmap_mode'] == 'r' and summary['workers'] == 2
+    assert set(summary['per_worker_mb']) == {'rss', 'pss', 'private'}
+    rss = summary['per_worker_mb']['rss']
+    assert rss['model_cost'] == round(rss['after_load'] - rss['before_load'], 2)
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_loader import estimate_shape
+
+
+def _frame(rows):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        # Fixed-width IDs so every part of the file has the same line lengths
+        'id': np.arange(rows) + 10**6,
+        'amount': rng.random(rows).round(4),
+        'city': rng.choice(['Oslo', 'San Francisco', 'Rio de Janeiro'], rows)
+    })
+
+
+def test_small_csv_is_counted_exactly(tmp_path):
+    path = tmp_path / 'data.csv'
+    _frame(1234).to_csv(path, index=False)
+    assert estimate_shape(str(path)) == (1234, 3)
+
+    # A last line without a newline still counts
+    path.write_text(path.read_text().rstrip('\n'))
+    assert estimate_shape(str(path)) == (1234, 3)
+
+
+def test_large_csv_is_extrapolated(tmp_path):
+    path = tmp_path / 'data.csv'
+    _frame(100000).to_csv(path, index=False)
+
+    rows, columns = estimate_shape(str(path), probe_bytes=64 * 1024)
+
+    assert columns == 3
+    assert rows == pytest.approx(100000, rel=0.05)
+
+
+def test_parquet_shape_comes_from_metadata(tmp_path):
+    path = tmp_path / 'data.parquet'
+    _frame(5000).to_parquet(path, index=False)
+    assert estimate_shape(str(path)) == (5000, 3)
+
+
+def test_excel_shape(tmp_path):
+    path = tmp_path / 'data.xlsx'
+    _frame(300).to_excel(path, index=False)
+    assert estimate_shape(str(path)) == (300, 3)
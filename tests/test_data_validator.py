@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from data_validator import SketchProfile, validate_data_from_file
+
+
+def _write(path, rows, duplicates=0):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'id': np.arange(rows),
+        'value': rng.random(rows),
+        'churn': rng.choice(['yes', 'no'], rows)
+    })
+    pd.concat([df, df.iloc[:duplicates]]).to_csv(path, index=False)
+
+
+def test_sketch_profile_counts_duplicates_exactly(tmp_path):
+    path = tmp_path / 'data.csv'
+    _write(path, 30000, duplicates=25)
+    profile = SketchProfile(str(path), 'churn', sample_rows=1000, chunksize=7000)
+
+    assert profile.n_rows == 30025
+    assert profile.duplicate_rows == 25
+    assert len(profile.sample) == 1000
+    assert profile.value_counts('churn').sum() == 30025
+
+
+def test_approximate_validation_reports_no_phantom_duplicates(tmp_path):
+    path = tmp_path / 'data.csv'
+    _write(path, 50000)
+    result = validate_data_from_file(str(path), 'churn', approximate=True, sample_rows=2000)
+
+    assert result['success']
+    validation = result['validation_results']
+    assert validation['overall_quality']['duplicate_rows'] == 0
+    assert not [r for r in validation['recommendations'] if r['category'] == 'duplicates']
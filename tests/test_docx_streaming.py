@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+from docx import Document
+
+from docx_streaming import add_table_placeholder, iter_table_xml, save_with_streamed_tables
+
+
+def _chunks(rows, size, consumed=None):
+    for start in range(0, rows, size):
+        if consumed is not None:
+            consumed.append(start)
+        yield pd.DataFrame({'id': range(start, min(start + size, rows)), 'name': 'row'})
+
+
+def test_table_xml_is_generated_one_chunk_at_a_time():
+    consumed = []
+    pieces = iter_table_xml(['id', 'name'], _chunks(25, 10, consumed))
+
+    assert next(pieces).startswith('<w:tbl>')
+    assert '<w:tblHeader/>' in next(pieces)
+    first_rows = next(pieces)
+
+    assert consumed == [0]
+    assert first_rows.count('<w:tr>') == 10
+    assert list(pieces)[-1] == '</w:tbl>' and consumed == [0, 10, 20]
+
+
+def test_cell_text_is_escaped():
+    chunk = pd.DataFrame({'note': ['<b>&</b>', 'bell\x07']})
+
+    xml = ''.join(iter_table_xml(['note'], [chunk]))
+
+    assert '&lt;b&gt;&amp;&lt;/b&gt;' in xml
+    assert '\x07' not in xml and '>bell<' in xml
+
+
+def test_streamed_tables_replace_their_placeholders(tmp_path):
+    doc = Document()
+    doc.add_paragraph('Before')
+    first = add_table_placeholder(doc)
+    doc.add_paragraph('Between')
+    second = add_table_placeholder(doc)
+    doc.add_paragraph('After')
+
+    save_with_streamed_tables(doc, tmp_path / 'report.docx', {
+        first: (['id', 'name'], _chunks(25, 10)),
+        second: (['id', 'name'], _chunks(3, 10))
+    })
+
+    saved = Document(str(tmp_path / 'report.docx'))
+    assert [len(table.rows) for table in saved.tables] == [26, 4]
+    assert saved.tables[0].cell(25, 0).text == '24'
+    texts = [paragraph.text for paragraph in saved.paragraphs if paragraph.text]
+    assert texts == ['Before', 'Between', 'After']
+    assert list(tmp_path.iterdir()) == [tmp_path / 'report.docx']
+
+
+def test_missing_placeholder_leaves_no_output(tmp_path):
+    doc = Document()
+    doc.add_paragraph('No placeholder here')
+
+    with pytest.raises(ValueError, match='not found'):
+        save_with_streamed_tables(doc, tmp_path / 'report.docx', {'STREAMED-TABLE-x': (['id'], _chunks(1, 1))})
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,28 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from generate_report import run_report
+
+
+def test_status_records_the_latest_output_format(tmp_path):
+    rng = np.random.default_rng(0)
+    data_path = tmp_path / 'upload.csv'
+    pd.DataFrame({
+        'age': rng.integers(18, 70, 200),
+        'department': rng.choice(['sales', 'hr', 'it'], 200),
+        'attrition': rng.choice(['Yes', 'No'], 200)
+    }).to_csv(data_path, index=False)
+
+    for output_format in ('json', 'html'):
+        result = run_report(str(data_path), 'r1', {
+            'target_column': 'attrition', 'output_format': output_format, 'chart_workers': 1, 'use_cache': False
+        })
+        assert result['success'], result.get('error')
+
+    reports = tmp_path / 'reports'
+    assert (reports / 'r1_report.json').exists() and (reports / 'r1_report.html').exists()
+    status = json.loads((reports / 'r1_status.json').read_text())
+    assert status['output_format'] == 'html'
+    assert status['file'] == 'r1_report.html'
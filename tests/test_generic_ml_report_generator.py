@@ -0,0 +1,112 @@
+import struct
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import generic_ml_report_generator
+from generic_ml_report_generator import RENDER_PROFILES, GenericMLReportGenerator, render_chart
+
+
+@pytest.fixture
+def report_data():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'age': rng.integers(18, 70, 200),
+        'salary': rng.normal(50000, 10000, 200),
+        'department': rng.choice(['sales', 'hr', 'it'], 200),
+        'attrition': rng.choice(['Yes', 'No'], 200)
+    })
+
+
+def _chart_jobs(df, **kwargs):
+    generator = GenericMLReportGenerator(df, 'attrition', **kwargs)
+    generator._compute_risk_scores()
+    return generator, generator.prepare_charts()
+
+
+def test_chart_pool_renders_the_same_charts_as_inline(report_data):
+    inline, jobs = _chart_jobs(report_data, chart_workers=1)
+    pooled = GenericMLReportGenerator(report_data, 'attrition', chart_workers=2)
+
+    assert [job['key'] for job in jobs] == [
+        'target_distribution', 'cat_department', 'num_age', 'num_salary', 'correlation', 'risk_scores'
+    ]
+    rendered_inline = inline.render_charts(jobs)
+    rendered_pooled = pooled.render_charts(jobs)
+
+    assert list(rendered_pooled) == list(rendered_inline)
+    assert all(rendered_pooled.values())
+
+
+def test_docx_report_embeds_every_rendered_chart(report_data, tmp_path):
+    from docx import Document
+
+    generator = GenericMLReportGenerator(report_data, 'attrition', chart_workers=2)
+    generator.create_report(str(tmp_path / 'report.docx'))
+
+    assert len(Document(str(tmp_path / 'report.docx')).inline_shapes) == len(generator.charts) == 6
+
+
+def test_charts_are_rendered_to_memory(report_data):
+    _, jobs = _chart_jobs(report_data, chart_workers=1)
+
+    key, image = render_chart(jobs[0])
+
+    assert key == 'target_distribution'
+    assert image.startswith(b'\x89PNG\r\n\x1a\n')
+
+
+def test_concurrent_reports_keep_their_own_charts(report_data):
+    other_data = report_data.assign(attrition=np.where(report_data['age'] > 60, 'Yes', 'No'))
+    first, first_jobs = _chart_jobs(report_data, chart_workers=1)
+    second, second_jobs = _chart_jobs(other_data, chart_workers=1)
+
+    first_charts = first.render_charts(first_jobs[:1])
+    second_charts = second.render_charts(second_jobs[:1])
+
+    assert first_charts['target_distribution'] != second_charts['target_distribution']
+
+
+def _png_width(image):
+    return struct.unpack('>I', image[16:20])[0]
+
+
+def test_render_profiles_set_format_and_resolution(report_data):
+    _, jobs = _chart_jobs(report_data, chart_workers=1)
+
+    _, draft = render_chart(jobs[0], RENDER_PROFILES['draft'])
+    _, standard = render_chart(jobs[0], RENDER_PROFILES['standard'])
+    _, printed = render_chart(jobs[0], RENDER_PROFILES['print'])
+
+    assert draft.startswith(b'\xff\xd8')  # JPEG
+    assert _png_width(printed) == pytest.approx(2 * _png_width(standard), rel=0.05)
+
+
+def test_draft_profile_drops_heatmap_annotations(report_data):
+    _, draft_jobs = _chart_jobs(report_data, chart_workers=1, render_profile='draft')
+    _, standard_jobs = _chart_jobs(report_data, chart_workers=1)
+
+    def correlation(jobs):
+        return next(job for job in jobs if job['key'] == 'correlation')
+
+    assert correlation(draft_jobs)['data']['annot'] is False
+    assert correlation(standard_jobs)['data']['annot'] is True
+
+
+def test_unknown_render_profile_is_rejected(report_data):
+    with pytest.raises(ValueError, match="Unknown render profile 'poster'"):
+        GenericMLReportGenerator(report_data, 'attrition', render_profile='poster')
+
+
+def test_record_listing_covers_every_record(report_data, tmp_path, monkeypatch):
+    from docx import Document
+
+    monkeypatch.setattr(generic_ml_report_generator, 'RECORD_LISTING_CHUNK_ROWS', 50)
+    generator = GenericMLReportGenerator(report_data, 'attrition', chart_workers=1, include_record_listing=True)
+    generator.create_report(str(tmp_path / 'report.docx'))
+
+    listing = Document(str(tmp_path / 'report.docx')).tables[-1]
+    assert len(listing.rows) == len(report_data) + 1
+    scores = [float(row.cells[2].text) for row in listing.rows[1:]]
+    assert scores == sorted(scores, reverse=True)
@@ -0,0 +1,105 @@
+import multiprocessing as mp
+import os
+
+from job_queue import JobQueue
+
+
+def _enqueue(queue, job_ids):
+    """Enqueue jobs with strictly increasing submission times"""
+    for index, job_id in enumerate(job_ids):
+        queue.enqueue(job_id, {'type': 'report'})
+        os.utime(queue.path('queued', job_id), ns=(10**9 * (index + 1),) * 2)
+
+
+def test_claim_takes_the_oldest_job(tmp_path):
+    queue = JobQueue(tmp_path)
+    _enqueue(queue, ['b', 'a', 'c'])
+
+    job = queue.claim(worker_pid=123)
+
+    assert job['id'] == 'b'
+    assert job['status'] == 'running'
+    assert job['worker_pid'] == 123
+    assert job['attempts'] == 1
+    assert queue.find('b') == ('running', job)
+    assert queue.position('a') == 1 and queue.position('c') == 2
+
+
+def test_claim_on_empty_queue(tmp_path):
+    assert JobQueue(tmp_path).claim(worker_pid=1) is None
+
+
+def test_finish_and_requeue(tmp_path):
+    queue = JobQueue(tmp_path)
+    _enqueue(queue, ['a', 'b'])
+
+    done = queue.finish(queue.claim(1), result={'ok': True})
+    assert queue.find('a')[0] == 'done' and done['result'] == {'ok': True}
+
+    lost = queue.claim(2)
+    queue.requeue(lost)
+    state, job = queue.find('b')
+    assert state == 'queued' and 'worker_pid' not in job
+
+    # A retried job counts its attempts
+    assert queue.claim(3)['attempts'] == 2
+    failed = queue.finish(queue.read('running', 'b'), error='boom')
+    assert queue.find('b') == ('failed', failed)
+
+
+def test_resubmission_replaces_previous_outcome(tmp_path):
+    queue = JobQueue(tmp_path)
+    queue.enqueue('a', {})
+    queue.finish(queue.claim(1), error='boom')
+
+    queue.enqueue('a', {})
+
+    assert queue.find('a')[0] == 'queued'
+    assert not queue.path('failed', 'a').exists()
+
+
+def _claim_all(root, results):
+    queue = JobQueue(root)
+    claimed = []
+    while (job := queue.claim(os.getpid())) is not None:
+        claimed.append(job['id'])
+    results.put(claimed)
+
+
+def test_concurrent_workers_claim_each_job_once(tmp_path):
+    queue = JobQueue(tmp_path)
+    job_ids = [f'job{index:03d}' for index in range(200)]
+    for job_id in job_ids:
+        queue.enqueue(job_id, {})
+
+    results = mp.Queue()
+    workers = [mp.Process(target=_claim_all, args=(str(tmp_path), results)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    claimed = [job_id for _ in workers for job_id in results.get(timeout=60)]
+    for worker in workers:
+        worker.join()
+
+    assert sorted(claimed) == job_ids
+    assert len(queue.jobs('running')) == 200
+
+
+def test_claim_with_order_and_accept(tmp_path):
+    queue = JobQueue(tmp_path)
+    for job_id, size in [('big', 30), ('small', 10), ('medium', 20)]:
+        queue.enqueue(job_id, {'size': size})
+
+    by_size = lambda job: job['size']
+    assert queue.claim(1, order=by_size)['id'] == 'small'
+    # Jobs the predicate rejects stay queued
+    assert queue.claim(1, order=by_size, accept=lambda job: job['size'] > 20)['id'] == 'big'
+    assert queue.claim(1, accept=lambda job: False) is None
+    assert [job['id'] for job in queue.jobs('queued')] == ['medium']
+
+
+def test_update_rewrites_running_job(tmp_path):
+    queue = JobQueue(tmp_path)
+    queue.enqueue('a', {})
+    job = queue.update(queue.claim(1), progress=40)
+
+    assert queue.read('running', 'a')['progress'] == 40 == job['progress']
@@ -0,0 +1,282 @@
+import json
+import queue
+import subprocess
+import sys
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline, make_pipeline
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+import model_inference
+from automl_trainer import export_lite_pipeline, write_model_manifest
+from model_inference import IncompatibleModelError, ModelCache, PredictionBatcher
+
+SCRIPT = Path(__file__).resolve().parent.parent / 'scripts' / 'model_inference.py'
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    """A trained model exported as a PyCaret-free pipeline with its manifest"""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({'age': rng.integers(18, 80, 200), 'income': rng.normal(50000, 10000, 200)})
+    y = (X['income'] > 50000).astype(int)
+    pipeline = make_pipeline(StandardScaler(), LogisticRegression()).fit(X, y)
+
+    joblib.dump(pipeline, tmp_path / 'ds1_model.pkl')
+    joblib.dump(pipeline, tmp_path / 'ds1_model.joblib')
+    (tmp_path / 'ds1_model.json').write_text(json.dumps({
+        'manifest_version': 1,
+        'problem_type': 'classification',
+        'features': [{'name': 'age'}, {'name': 'income'}],
+        'lite_model': {'file': 'ds1_model.joblib', 'classes': ['low', 'high']},
+        'versions': {}
+    }))
+    return str(tmp_path / 'ds1_model.pkl')
+
+
+def _prediction(request_id, model_path):
+    return {'id': request_id, 'model_path': model_path, 'df': pd.DataFrame([{'age': 30, 'income': 70000}]), 'rows': 1}
+
+
+def test_stats_is_answered_after_earlier_predictions(model_path):
+    batcher = PredictionBatcher(ModelCache(), window_ms=50)
+    requests = queue.Queue()
+    for item in (_prediction(1, model_path), _prediction(2, model_path),
+                 {'id': 3, 'rows': 0, 'command': 'stats'}, _prediction(4, model_path)):
+        requests.put(item)
+
+    # The stats command closes its batch
+    batch = batcher.collect(requests)
+    assert [item['id'] for item in batch] == [1, 2, 3]
+
+    first, second, stats = batcher.score(batch)
+    assert first['results']['predictions'] == ['high']
+    assert stats['cache']['entries'] == 1
+    assert stats['cache']['misses'] == 1
+
+
+def test_requests_for_one_model_are_scored_together(model_path, monkeypatch):
+    scored = []
+    score_dataframe = model_inference.score_dataframe
+    monkeypatch.setattr(model_inference, 'score_dataframe',
+                        lambda model, problem_type, df: scored.append(len(df)) or score_dataframe(model, problem_type, df))
+    batch = [
+        {'id': 1, 'model_path': model_path, 'rows': 1, 'df': pd.DataFrame([{'age': 30, 'income': 80000}])},
+        {'id': 2, 'model_path': model_path, 'rows': 2,
+         'df': pd.DataFrame([{'age': 40, 'income': 20000}, {'age': 50, 'income': 90000}])}
+    ]
+
+    first, second = PredictionBatcher(ModelCache()).score(batch)
+
+    assert scored == [3]
+    assert first['id'] == 1 and first['results']['predictions'] == ['high']
+    assert second['id'] == 2 and second['results']['predictions'] == ['low', 'high']
+
+
+def test_bad_request_does_not_fail_its_batch(model_path):
+    batch = [
+        {'id': 1, 'model_path': model_path, 'rows': 1, 'df': pd.DataFrame([{'age': 30, 'income': 80000}])},
+        {'id': 2, 'model_path': model_path, 'rows': 1, 'df': pd.DataFrame([{'age': 'unknown', 'income': 'n/a'}])}
+    ]
+
+    good, bad = PredictionBatcher(ModelCache()).score(batch)
+
+    assert good['success'] and good['results']['predictions'] == ['high']
+    assert not bad['success']
+
+
+def test_batch_closes_at_max_rows(model_path):
+    requests = queue.Queue()
+    for request_id in range(5):
+        requests.put(_prediction(request_id, model_path))
+
+    batcher = PredictionBatcher(ModelCache(), window_ms=200, max_rows=3)
+
+    assert [item['id'] for item in batcher.collect(requests)] == [0, 1, 2]
+    assert [item['id'] for item in batcher.collect(requests)] == [3, 4]
+
+
+def _inputs(path, rows):
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({'age': rng.integers(18, 80, rows), 'income': rng.normal(50000, 10000, rows)})
+    df.to_csv(path, index=False)
+    return df
+
+
+def test_score_file_streams_chunks_in_order(model_path, tmp_path):
+    inputs = _inputs(tmp_path / 'inputs.csv', 25)
+
+    summary = model_inference.score_file(model_path, str(tmp_path / 'inputs.csv'), str(tmp_path / 'scored.csv'),
+                                         chunksize=10)
+
+    assert summary['success'], summary.get('error')
+    assert summary['rows_scored'] == 25 and summary['chunks'] == 3
+    scored = pd.read_csv(tmp_path / 'scored.csv')
+    pd.testing.assert_frame_equal(scored[['age', 'income']], inputs)
+    assert scored['prediction_label'].tolist() == np.where(inputs['income'] > 50000, 'high', 'low').tolist()
+
+
+def test_score_file_pool_matches_single_process(model_path, tmp_path):
+    _inputs(tmp_path / 'inputs.csv', 25)
+
+    single = model_inference.score_file(model_path, str(tmp_path / 'inputs.csv'), str(tmp_path / 'single.parquet'),
+                                        chunksize=4)
+    pooled = model_inference.score_file(model_path, str(tmp_path / 'inputs.csv'), str(tmp_path / 'pooled.parquet'),
+                                        chunksize=4, workers=2)
+
+    assert pooled['success'], pooled.get('error')
+    assert pooled['chunks'] == single['chunks'] == 7
+    pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / 'pooled.parquet'),
+                                  pd.read_parquet(tmp_path / 'single.parquet'))
+
+
+def _rewrite_manifest(model_path, **changes):
+    manifest_path = Path(model_path.replace('.pkl', '.json'))
+    manifest = json.loads(manifest_path.read_text())
+    manifest.update(changes)
+    manifest_path.write_text(json.dumps(manifest))
+
+
+def test_manifest_from_a_matching_environment_is_loaded_once(model_path, monkeypatch):
+    import sklearn
+    _rewrite_manifest(model_path, versions={'scikit-learn': sklearn.__version__})
+    # The manifest names the problem type, so PyCaret is never probed
+    monkeypatch.setitem(sys.modules, 'pycaret', None)
+
+    model, problem_type = model_inference.load_model(model_path)
+
+    assert problem_type == 'classification'
+    assert isinstance(model, model_inference.LitePipelineModel)
+
+
+@pytest.mark.parametrize('changes, message', [
+    ({'manifest_version': 2}, 'newer than supported'),
+    ({'problem_type': 'clustering'}, 'Unknown problem type'),
+    ({'versions': {'scikit-learn': '0.1.0'}}, 'trained with scikit-learn 0.1.0'),
+    ({'versions': {'pycaret': '2.3.10'}}, 'pycaret')
+])
+def test_incompatible_manifest_is_refused(model_path, changes, message):
+    _rewrite_manifest(model_path, **changes)
+
+    with pytest.raises(IncompatibleModelError, match=message):
+        model_inference.load_model(model_path)
+
+
+def test_serve_reports_stats_in_request_order(model_path):
+    lines = [
+        {'id': 'a', 'model_path': model_path, 'input_data': {'age': 30, 'income': 70000}},
+        {'id': 'b', 'model_path': model_path, 'input_data': [{'age': 50, 'income': 30000}]},
+        {'id': 'c', 'command': 'stats'}
+    ]
+    completed = subprocess.run(
+        [sys.executable, str(SCRIPT), '--serve'],
+        input=''.join(json.dumps(line) + '\n' for line in lines),
+        capture_output=True, text=True, timeout=60
+    )
+
+    responses = {response['id']: response for response in map(json.loads, completed.stdout.splitlines())}
+    assert responses['a']['success'] and responses['b']['success']
+    assert responses['c']['cache']['entries'] == 1
+
+
+class DtypesStep(BaseEstimator, TransformerMixin):
+    """PyCaret 2 dtypes step: passes features through and holds the target mapping"""
+
+    def __init__(self, replacement=None):
+        self.replacement = replacement
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        return X
+
+
+class LabelEncodingStep(BaseEstimator, TransformerMixin):
+    """PyCaret 3 label_encoding step: wraps the LabelEncoder fitted on the target"""
+
+    def __init__(self, transformer=None):
+        self.transformer = transformer
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        return X
+
+
+class DecodingPipeline(Pipeline):
+    """PyCaret 3 pipeline: predict() maps the estimator's codes back to labels"""
+
+    def predict(self, X, **params):
+        return self.named_steps['label_encoding'].transformer.inverse_transform(super().predict(X, **params))
+
+
+def _churn_frame(rows=300):
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({'age': rng.integers(18, 80, rows), 'income': rng.normal(50000, 10000, rows)})
+    df['churn'] = np.where(df['income'] > 50000, 'stay', 'leave')
+    return df
+
+
+def _export(tmp_path, pipeline, df):
+    model_path = str(tmp_path / 'ds1_model')
+    joblib.dump(pipeline, f'{model_path}.pkl')
+    lite_model = export_lite_pipeline(pipeline, model_path, 'classification')
+    write_model_manifest(model_path, df, 'churn', 'classification', 'LogisticRegression', lite_model)
+    return f'{model_path}.pkl', lite_model
+
+
+def test_exported_pipeline_arrays_are_memory_mapped(tmp_path):
+    df = _churn_frame()
+    pipeline = make_pipeline(StandardScaler(), LogisticRegression()).fit(df[['age', 'income']], df['churn'])
+    model_path, _ = _export(tmp_path, pipeline, df)
+    manifest = model_inference.read_model_manifest(model_path)
+
+    mapped = model_inference.load_lite_model(model_path, manifest, mmap_mode='r')
+    private = model_inference.load_lite_model(model_path, manifest, mmap_mode=None)
+
+    assert isinstance(mapped.pipeline[-1].coef_, np.memmap)
+    assert not isinstance(private.pipeline[-1].coef_, np.memmap)
+    pd.testing.assert_frame_equal(mapped.predict_frame(df.head(20)), private.predict_frame(df.head(20)))
+
+
+def test_pycaret2_pipeline_predictions_are_decoded(tmp_path):
+    df = _churn_frame()
+    # setup() saw 'stay' first, so the codes are not in sorted label order
+    replacement = {'stay': 0, 'leave': 1}
+    pipeline = Pipeline([
+        ('dtypes', DtypesStep(replacement)),
+        ('scaler', StandardScaler()),
+        ('trained_model', LogisticRegression())
+    ]).fit(df[['age', 'income']], df['churn'].map(replacement))
+
+    model_path, lite_model = _export(tmp_path, pipeline, df)
+    model, _ = model_inference.load_model(model_path)
+    predictions = model.predict_frame(pd.DataFrame([{'age': 30, 'income': 80000}, {'age': 40, 'income': 20000}]))
+
+    assert lite_model['classes'] == ['stay', 'leave']
+    assert predictions['prediction_label'].tolist() == ['stay', 'leave']
+
+
+def test_pycaret3_pipeline_decoding_its_own_labels(tmp_path):
+    df = _churn_frame()
+    encoder = LabelEncoder().fit(df['churn'])
+    pipeline = DecodingPipeline([
+        ('label_encoding', LabelEncodingStep(encoder)),
+        ('scaler', StandardScaler()),
+        ('trained_model', LogisticRegression())
+    ]).fit(df[['age', 'income']], encoder.transform(df['churn']))
+
+    model_path, lite_model = _export(tmp_path, pipeline, df)
+    model, _ = model_inference.load_model(model_path)
+    predictions = model.predict_frame(pd.DataFrame([{'age': 30, 'income': 80000}, {'age': 40, 'income': 20000}]))
+
+    assert lite_model['classes'] == ['leave', 'stay']
+    assert predictions['prediction_label'].tolist() == ['stay', 'leave']
@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from generic_ml_report_generator import GenericMLReportGenerator
+from report_cache import ReportCache, report_fingerprint
+
+
+def test_get_returns_stored_bytes(tmp_path):
+    cache = ReportCache(tmp_path)
+    key = report_fingerprint('abc', 'churn', 'yes', 'standard')
+    cache.put(key, 'chart-a', b'png')
+
+    assert cache.get(key, 'chart-a') == b'png'
+    assert cache.get(key, 'chart-b') is None
+    assert cache.stats() == {'hits': 1, 'misses': 1}
+
+
+def test_fingerprint_covers_data_and_profile():
+    base = report_fingerprint('abc', 'churn', 'yes', 'standard')
+    assert base == report_fingerprint('abc', 'churn', 'yes', 'standard')
+    assert base != report_fingerprint('abd', 'churn', 'yes', 'standard')
+    assert base != report_fingerprint('abc', 'churn', 'yes', 'print')
+
+
+def test_fingerprint_keeps_the_positive_class_type():
+    def key(positive_class):
+        return report_fingerprint('abc', 'churn', positive_class, 'standard')
+
+    assert key(1) != key('1')
+    assert key(True) != key('True')
+    assert key(True) != key(1)
+    assert key(np.int64(1)) == key(1)
+
+
+def test_evicts_least_recently_used_entries(tmp_path):
+    cache = ReportCache(tmp_path, max_mb=2500 / (1024 * 1024))
+    for index, name in enumerate(['old', 'used', 'new']):
+        cache.put(f'key-{name}', 'chart', b'x' * 1000)
+        # Distinct modification times regardless of filesystem resolution
+        os.utime(tmp_path / f'key-{name}' / 'chart', (1000 + index, 1000 + index))
+    os.utime(tmp_path / 'key-used' / 'chart', (2000, 2000))
+    cache.put('key-newest', 'chart', b'x' * 1000)
+
+    assert cache.size_bytes() <= 2500
+    assert not (tmp_path / 'key-old').exists()
+    assert not (tmp_path / 'key-new').exists()
+    assert cache.get('key-used', 'chart') is not None
+    assert cache.get('key-newest', 'chart') is not None
+
+
+@pytest.fixture
+def report_data():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        '1e5': rng.random(300) * np.pi,
+        '007': rng.integers(0, 5, 300).astype(float),
+        'churn': rng.choice(['yes', 'no'], 300)
+    })
+
+
+def test_cached_numeric_summary_matches_uncached(tmp_path, report_data):
+    cache = ReportCache(tmp_path / 'cache')
+    first = GenericMLReportGenerator(report_data, 'churn', chart_workers=1, cache=cache, data_hash='h1')
+    expected = first.stats.numeric_summary.copy()
+    first._store_cached_tables()
+
+    second = GenericMLReportGenerator(report_data, 'churn', chart_workers=1, cache=cache, data_hash='h1')
+    second._load_cached_tables()
+
+    pd.testing.assert_frame_equal(second.stats.numeric_summary, expected)
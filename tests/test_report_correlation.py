@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from report_correlation import (
+    blocked_correlation, cluster_order, summarize_correlations, target_correlations, top_correlated_pairs
+)
+
+
+def _data(rows=500, columns=12, missing=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=(rows, 3))
+    values = base[:, rng.integers(0, 3, columns)] + rng.normal(scale=0.7, size=(rows, columns))
+    values[:, -1] = 7.0  # Constant column: correlation undefined
+    if missing:
+        values[rng.random(values.shape) < missing] = np.nan
+    return pd.DataFrame(values, columns=[f'c{index}' for index in range(columns)])
+
+
+def test_blocked_correlation_matches_pandas_on_complete_data():
+    df = _data()
+    expected = df.corr().to_numpy()
+
+    np.testing.assert_allclose(blocked_correlation(df.to_numpy(), block=5), expected, atol=1e-12, equal_nan=True)
+
+
+def test_blocked_correlation_matches_pandas_with_missing_values():
+    df = _data(missing=0.2)
+    expected = df.corr().to_numpy()
+
+    np.testing.assert_allclose(blocked_correlation(df.to_numpy(), block=4), expected, atol=1e-12, equal_nan=True)
+
+
+def test_top_pairs_are_the_strongest_off_diagonal_pairs():
+    df = _data(missing=0.1)
+    corr = df.corr()
+    strongest = corr.abs().where(np.triu(np.ones(corr.shape, dtype=bool), k=1)).stack().nlargest(5)
+
+    pairs = top_correlated_pairs(df.to_numpy(), list(df.columns), top_k=5, block=4)
+
+    assert [(a, b) for a, b, _ in pairs] == list(strongest.index)
+    np.testing.assert_allclose([r for _, _, r in pairs], [corr.loc[a, b] for a, b in strongest.index])
+
+
+def test_target_correlations_match_pandas():
+    df = _data(missing=0.1)
+    target = (df['c0'].fillna(0) > 0).astype(float)
+
+    result = target_correlations(df.to_numpy(), target.to_numpy(), block=5)
+
+    np.testing.assert_allclose(result, df.corrwith(target).to_numpy(), atol=1e-12, equal_nan=True)
+
+
+def test_cluster_order_is_a_permutation():
+    corr = _data().iloc[:, :-1].corr().to_numpy()
+    assert sorted(cluster_order(corr)) == list(range(len(corr)))
+
+
+def test_summary_samples_rows_and_limits_the_heatmap():
+    df = _data(rows=3000, columns=40)
+    is_positive = df['c1'] > 0
+    columns = list(df.columns)
+
+    summary = summarize_correlations(df, columns, is_positive, sample_rows=1000, top_k=10, heatmap_columns=8)
+
+    assert summary['sampled'] and summary['rows_used'] == 1000
+    assert summary['total_columns'] == 40
+    assert summary['matrix'].shape == (8, 8)
+    assert len(summary['top_pairs']) == 10
+    assert summary['target_correlations'].index[0] == 'c1'
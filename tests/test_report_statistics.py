@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import report_statistics
+from report_statistics import NUMERIC_STATS, ReportStatistics
+
+
+@pytest.fixture
+def report_data():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'department': rng.choice(['sales', 'hr', 'it', None], 500),
+        'hired': pd.date_range('2024-01-01', periods=500, freq='D'),
+        'attrition': rng.choice(['Yes', 'No'], 500, p=[0.3, 0.7])
+    })
+    df['band'] = pd.Categorical(rng.choice(['low', 'high'], 500), categories=['low', 'mid', 'high'])
+    return df
+
+
+def test_category_rates_match_per_group_rates(report_data):
+    stats = ReportStatistics(report_data, 'attrition', 'Yes')
+
+    rates = stats.category_rates('department')
+
+    expected = report_data.dropna(subset=['department']).groupby('department')['attrition'].apply(
+        lambda values: (values == 'Yes').mean())
+    pd.testing.assert_series_equal(rates, expected, check_names=False)
+    assert stats.positive_rate == (report_data['attrition'] == 'Yes').mean()
+
+
+def test_unused_categories_have_no_rate(report_data):
+    rates = ReportStatistics(report_data, 'attrition', 'Yes').category_rates('band')
+
+    assert sorted(rates.index) == ['high', 'low']
+
+
+def test_rates_are_memoized(report_data):
+    stats = ReportStatistics(report_data, 'attrition', 'Yes')
+
+    assert stats.category_rates('department') is stats.category_rates('department')
+    assert stats.period_rates('hired') is stats.period_rates('hired')
+
+
+def test_period_rates_are_monthly(report_data):
+    rates = ReportStatistics(report_data, 'attrition', 'Yes').period_rates('hired')
+
+    january = report_data[report_data['hired'].dt.month.eq(1) & report_data['hired'].dt.year.eq(2024)]
+    assert str(rates.index[0]) == '2024-01'
+    assert rates.iloc[0] == pytest.approx((january['attrition'] == 'Yes').mean())
+    assert len(rates) == report_data['hired'].dt.to_period('M').nunique()
+
+
+def _numeric_data():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        'age': rng.integers(18, 70, 300),
+        'salary': rng.normal(50000, 10000, 300),
+        'rating': pd.array(rng.integers(1, 6, 300), dtype='Int64'),
+        'empty': np.full(300, np.nan),
+        'attrition': rng.choice(['Yes', 'No'], 300)
+    })
+    df.loc[::7, 'salary'] = np.nan
+    df.loc[::5, 'rating'] = pd.NA
+    return df
+
+
+def test_numeric_summary_matches_describe(monkeypatch):
+    # Several blocks of columns
+    monkeypatch.setattr(report_statistics, 'NUMERIC_BLOCK_COLUMNS', 2)
+    df = _numeric_data()
+    columns = ['age', 'salary', 'rating']
+
+    summary = ReportStatistics(df, 'attrition', 'Yes', columns + ['empty']).numeric_summary
+
+    assert list(summary.columns) == NUMERIC_STATS
+    assert list(summary.index) == columns + ['empty']
+    described = df[columns].astype(float).describe().T
+    for stat, name in [('count', 'count'), ('mean', 'mean'), ('std', 'std'), ('min', 'min'), ('max', 'max'),
+                       ('median', '50%')]:
+        np.testing.assert_allclose(summary.loc[columns, stat], described[name])
+    assert summary.at['salary', 'missing'] == df['salary'].isna().sum()
+    assert summary.at['empty', 'missing'] == 300 and np.isnan(summary.at['empty', 'mean'])
+
+
+def test_numeric_summary_is_computed_once():
+    stats = ReportStatistics(_numeric_data(), 'attrition', 'Yes', ['age', 'salary'])
+
+    assert stats.numeric_summary is stats.numeric_summary
+    assert stats.column_stats('age')['max'] == stats.df['age'].max()
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from sketches import HyperLogLog, ReservoirSampler, hash_values
+
+
+def test_hash_values_ignore_integer_or_float_parsing():
+    assert (hash_values(pd.Series([1, 2, 3])) == hash_values(pd.Series([1.0, 2.0, 3.0]))).all()
+
+
+def test_hyperloglog_estimate_within_bounds():
+    sketch = HyperLogLog()
+    for start in range(0, 200000, 50000):
+        sketch.add(pd.Series(np.arange(start, start + 50000)))
+    # Adding the same values again does not change the estimate
+    sketch.add(pd.Series(np.arange(0, 50000)))
+
+    low, high = sketch.bounds()
+    assert low <= 200000 <= high
+    assert abs(sketch.estimate() - 200000) / 200000 < 3 * sketch.relative_error
+
+
+def test_hyperloglog_small_counts_are_close():
+    sketch = HyperLogLog()
+    sketch.add(pd.Series(['a', 'b', 'c', 'a', None]))
+    assert round(sketch.estimate()) == 3
+
+
+def test_reservoir_sampler_keeps_size_and_rows():
+    sampler = ReservoirSampler(1000, seed=1)
+    for start in range(0, 10000, 2500):
+        sampler.add(pd.DataFrame({'id': np.arange(start, start + 2500)}))
+
+    sample = sampler.sample
+    assert len(sample) == 1000
+    assert sampler.rows_seen == 10000
+    assert sample['id'].is_unique
+    assert sample['id'].between(0, 9999).all()
+    # Drawn from the whole stream, not only the first chunk
+    assert sample['id'].max() >= 7500
+
+
+def test_reservoir_sampler_smaller_stream_is_kept_whole():
+    sampler = ReservoirSampler(100)
+    sampler.add(pd.DataFrame({'id': range(40)}))
+    assert sorted(sampler.sample['id']) == list(range(40))
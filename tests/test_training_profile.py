@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+import automl_trainer
+from training_profile import build_training_profile, check_drift, skip_reason
+
+
+def _upload(start_id, start_date, rows=2000, seed=0, income_shift=0.0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'customer_id': np.arange(start_id, start_id + rows),
+        'signup_date': pd.date_range(start_date, periods=rows, freq='h').strftime('%Y-%m-%d %H:%M'),
+        'income': rng.normal(50000 + income_shift, 10000, rows),
+        'plan': rng.choice(['basic', 'plus', 'pro'], rows),
+        'churn': rng.choice([0, 1], rows)
+    })
+
+
+def test_identifiers_dates_and_target_are_not_profiled():
+    profile = build_training_profile(_upload(0, '2024-01-01'), 'churn')
+
+    assert set(profile['columns']) == {'income', 'plan'}
+    assert profile['skipped_columns'] == {'customer_id': 'identifier', 'signup_date': 'datetime'}
+
+
+def test_continuous_features_are_not_identifiers():
+    assert skip_reason(pd.Series(np.random.default_rng(0).random(1000))) is None
+    assert skip_reason(pd.Series(['a', 'b'] * 500)) is None
+
+
+def test_reupload_with_new_ids_and_dates_is_not_drift():
+    profile = build_training_profile(_upload(0, '2024-01-01'), 'churn')
+    drift = check_drift(profile, _upload(10000, '2025-06-01', seed=1))
+
+    assert not drift['drifted'], drift['reason']
+    assert set(drift['psi']) == {'income', 'plan'}
+
+
+def test_shifted_feature_is_drift():
+    profile = build_training_profile(_upload(0, '2024-01-01'), 'churn')
+    drift = check_drift(profile, _upload(10000, '2025-06-01', seed=1, income_shift=20000))
+
+    assert drift['drifted']
+    assert drift['drifted_columns'] == ['income']
+
+
+def test_changed_feature_columns_are_drift():
+    profile = build_training_profile(_upload(0, '2024-01-01'), 'churn')
+    drift = check_drift(profile, _upload(10000, '2025-06-01').drop(columns=['plan']))
+
+    assert drift['drifted']
+    assert 'missing plan' in drift['reason']
+
+
+def test_reupload_with_new_ids_warm_starts(monkeypatch):
+    train = _upload(0, '2024-01-01')
+    estimator = object()
+    manifest = {
+        'problem_type': 'classification',
+        'target_column': 'churn',
+        'model_name': 'LogisticRegression',
+        'trained_at': '2024-06-01T00:00:00',
+        'training_profile': build_training_profile(train, 'churn')
+    }
+
+    class Pipeline:
+        steps = [('trained_model', estimator)]
+
+    monkeypatch.setattr(automl_trainer, 'load_previous_model', lambda model_path, pycaret: (Pipeline(), manifest))
+    previous, info = automl_trainer.warm_start_estimator(
+        'models/dataset_model', _upload(10000, '2025-06-01', seed=1), 'churn', 'classification', pycaret=None)
+
+    assert previous is estimator
+    assert info['mode'] == 'warm_start'
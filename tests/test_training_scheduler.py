@@ -0,0 +1,146 @@
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import training_scheduler
+from training_scheduler import BASE_MEMORY_MB, CELLS_PER_CORE, TrainingScheduler, enqueue, estimate_reservation
+
+# Reports the affinity and n_jobs it was started with, like automl_trainer.py reports its result
+STUB_TRAINER = '''
+import json, os, sys
+options = json.loads(sys.argv[5])
+print(json.dumps({"type": "progress", "progress": 50, "message": "training"}), file=sys.stderr, flush=True)
+print(json.dumps({"success": True, "affinity": sorted(os.sched_getaffinity(0)), "n_jobs": options["n_jobs"],
+                  "threads": os.environ["OMP_NUM_THREADS"]}))
+'''
+
+
+def _csv(path, rows, columns=4):
+    pd.DataFrame(np.zeros((rows, columns)), columns=[f'c{index}' for index in range(columns)]).to_csv(path, index=False)
+    return str(path)
+
+
+def test_reservation_grows_with_the_data(tmp_path, monkeypatch):
+    small = estimate_reservation({'data_path': _csv(tmp_path / 'small.csv', 100)}, total_cores=8, memory_mb=64000)
+    large = {'data_path': _csv(tmp_path / 'large.csv', 100)}
+
+    assert small['rows'] == 100 and small['cells'] == 400
+    assert small['cores'] == 1
+    assert BASE_MEMORY_MB <= small['memory_mb'] < BASE_MEMORY_MB + 1
+
+    # Pretend the file is far larger than it is
+    monkeypatch.setattr(training_scheduler, 'estimate_shape', lambda path: (3 * CELLS_PER_CORE // 10, 10))
+    reservation = estimate_reservation(large, total_cores=8, memory_mb=64000)
+    capped = estimate_reservation(large, total_cores=2, memory_mb=2000)
+    sampled = estimate_reservation(dict(large, options={'setup_sample_rows': 100000}), total_cores=8, memory_mb=64000)
+
+    assert reservation['cores'] == 3
+    assert reservation['memory_mb'] > small['memory_mb']
+    assert capped['cores'] == 2 and capped['memory_mb'] == 2000
+    assert sampled['memory_mb'] < reservation['memory_mb']
+
+
+def test_unreadable_file_reserves_the_minimum(tmp_path):
+    reservation = estimate_reservation({'data_path': str(tmp_path / 'missing.csv')}, total_cores=4, memory_mb=8000)
+    assert reservation['cores'] == 1 and reservation['memory_mb'] == BASE_MEMORY_MB
+
+
+@pytest.fixture
+def scheduler(tmp_path, monkeypatch):
+    trainer = tmp_path / 'stub_trainer.py'
+    trainer.write_text(STUB_TRAINER)
+    monkeypatch.setattr(training_scheduler, 'TRAINER_PATH', trainer)
+    return TrainingScheduler(tmp_path / 'queue', max_jobs=1, memory_mb=64000)
+
+
+def _run_all(scheduler, timeout=60):
+    """Schedule until the queue is drained; returns finished jobs in start order"""
+    deadline = time.monotonic() + timeout
+    while scheduler.running or scheduler.queue.jobs('queued'):
+        assert time.monotonic() < deadline
+        scheduler.check()
+        time.sleep(0.05)
+    return sorted(scheduler.queue.jobs('done'), key=lambda job: job['started_at'])
+
+
+def _submit(scheduler, tmp_path, job_id, rows):
+    return enqueue(job_id, _csv(tmp_path / f'{job_id}.csv', rows), 'c0', {}, queue_dir=scheduler.queue.root)
+
+
+def test_smaller_jobs_are_admitted_first(scheduler, tmp_path):
+    for job_id, rows in [('large', 3000), ('small', 10), ('medium', 500)]:
+        _submit(scheduler, tmp_path, job_id, rows)
+
+    done = _run_all(scheduler)
+
+    assert [job['id'] for job in done] == ['small', 'medium', 'large']
+
+
+def test_starving_job_goes_first(scheduler, tmp_path):
+    _submit(scheduler, tmp_path, 'small', 10)
+    _submit(scheduler, tmp_path, 'old', 3000)
+    path = scheduler.queue.path('queued', 'old')
+    job = json.loads(path.read_text())
+    job['submitted_at'] = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+    path.write_text(json.dumps(job))
+
+    done = _run_all(scheduler)
+
+    assert [job['id'] for job in done] == ['old', 'small']
+
+
+def test_jobs_wait_for_memory(scheduler, tmp_path):
+    scheduler.max_jobs = 2
+    scheduler.memory_mb = BASE_MEMORY_MB * 1.5
+    _submit(scheduler, tmp_path, 'a', 10)
+    _submit(scheduler, tmp_path, 'b', 20)
+
+    scheduler.check()
+
+    assert list(scheduler.running) == ['a']
+    schedule = json.loads((scheduler.queue.root / 'schedule.json').read_text())
+    assert [(entry['id'], entry['position']) for entry in schedule['queued']] == [('b', 1)]
+    assert [entry['id'] for entry in schedule['running']] == ['a']
+    _run_all(scheduler)
+
+
+def test_trainer_is_pinned_to_its_reserved_cores(scheduler, tmp_path):
+    _submit(scheduler, tmp_path, 'a', 10)
+
+    job, = _run_all(scheduler)
+
+    reservation = job['reservation']
+    assert set(reservation['core_ids']) <= set(os.sched_getaffinity(0))
+    assert job['result']['affinity'] == reservation['core_ids']
+    assert job['result']['n_jobs'] == reservation['cores']
+    assert job['result']['threads'] == str(reservation['cores'])
+
+
+def test_negative_n_jobs_is_capped_to_the_reservation(scheduler, tmp_path):
+    enqueue('a', _csv(tmp_path / 'a.csv', 10), 'c0', {'n_jobs': -2}, queue_dir=scheduler.queue.root)
+
+    job, = _run_all(scheduler)
+
+    assert job['result']['n_jobs'] == job['reservation']['cores']
+
+
+def test_failed_launch_fails_the_job_and_scheduling_continues(scheduler, tmp_path, monkeypatch):
+    def popen(*args, **kwargs):
+        raise OSError('exec format error')
+
+    monkeypatch.setattr(training_scheduler.subprocess, 'Popen', popen)
+    _submit(scheduler, tmp_path, 'a', 10)
+    _submit(scheduler, tmp_path, 'b', 20)
+
+    scheduler.check()
+
+    failed = {job['id']: job for job in scheduler.queue.jobs('failed')}
+    assert set(failed) == {'a', 'b'}
+    assert 'exec format error' in failed['a']['error']
+    assert not scheduler.running and not scheduler.reservations
+    assert scheduler.queue.jobs('running') == []